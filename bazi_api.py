@@ -0,0 +1,183 @@
+# ==========================================
+# AliVerse 無頭 JSON API (ASGI，與 Streamlit 介面分離)
+# ==========================================
+"""
+提供 LINE bot 與合作夥伴頁面使用的無狀態排盤端點，與網頁共用 bazi_engine / bazi_render。
+
+    GET  /health
+    GET  /chart?year=1988&month=9&day=15&hour_slot=6&gender=男   (或以 hour=0~23 代替 hour_slot)
+    POST /chart   JSON 物件 (單筆) 或陣列 (批次，上限 MAX_BATCH 筆)
+
+本機啟動：
+    python bazi_api.py --port 8000      (需安裝 uvicorn)
+    uvicorn bazi_api:app --workers 4
+"""
+import argparse
+import datetime
+import functools
+import json
+import urllib.parse
+
+from bazi_engine import CHART_CACHE_SIZE, PILLAR_TITLES, compute_chart, hour_to_slot
+from bazi_render import get_aliverse_car_matrix
+
+MAX_BATCH = 1000
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class RequestError(ValueError):
+    """ 請求參數錯誤 (回應 400) """
+
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def chart_summary(year, month, day, hour_slot, gender="男"):
+    """
+    網頁上「原廠規格」與「改裝方案」的核心數據 (不含動畫與 HTML)。
+    """
+    chart = compute_chart(year, month, day, hour_slot, gender)
+    matrix = get_aliverse_car_matrix(chart.day_gan, chart.joyful_gods[0])
+    return {
+        "input": {"year": chart.year, "month": chart.month, "day": chart.day, "hour_slot": chart.hour_slot, "gender": chart.gender},
+        "pillars": {title.split(" ")[0]: gan + zhi for title, (gan, zhi) in zip(PILLAR_TITLES, chart.pillars)},
+        "lunar": f"{chart.lunar_year}年 {chart.lunar_month_cn}月 {chart.lunar_day_cn}",
+        "zodiac": chart.zodiac,
+        "day_master": chart.day_gan + chart.day_master_wx,
+        "score": chart.score,
+        "strength_type": chart.strength_type,
+        "base_type": chart.base_type,
+        "joyful_gods": list(chart.joyful_gods),
+        "taboo_gods": list(chart.taboo_gods),
+        "car_model": chart.real_car_model,
+        "car_quote": chart.car_quote,
+        "hexagram": matrix["hex_name"],
+        "tuning_purpose": matrix["tuning_purpose"],
+        "advice_2026": chart.advice_2026,
+    }
+
+def parse_chart_params(params):
+    """ 將查詢參數或 JSON 物件轉為 chart_summary() 的引數；日期須為西元 1 ~ 9999 年的有效日期 """
+    if not isinstance(params, dict):
+        raise RequestError("each item must be an object")
+    try:
+        year, month, day = int(params["year"]), int(params["month"]), int(params["day"])
+        if "hour_slot" in params:
+            hour, hour_slot = None, int(params["hour_slot"])
+        elif "hour" in params:
+            hour = int(params["hour"])
+        else:
+            raise RequestError("missing field: hour_slot or hour")
+    except RequestError:
+        raise
+    except KeyError as e:
+        raise RequestError(f"missing field: {e.args[0]}")
+    except (TypeError, ValueError):
+        raise RequestError("year/month/day/hour must be integers")
+    try:
+        datetime.date(year, month, day)
+        if hour is not None:
+            hour_slot = hour_to_slot(hour)
+    except OverflowError:
+        raise RequestError("year/month/day/hour out of range")
+    except ValueError as e:
+        raise RequestError(str(e))
+    gender = params.get("gender", "男")
+    if gender not in ("男", "女"):
+        raise RequestError("gender must be 男 or 女")
+    return year, month, day, hour_slot, gender
+
+def summarize(params):
+    try:
+        return chart_summary(*parse_chart_params(params))
+    except RequestError:
+        raise
+    except (ValueError, OverflowError) as e:
+        raise RequestError(str(e))
+
+def handle_chart(method, query, body):
+    """
+    處理 /chart；回傳 (status, payload)。批次請求中單筆錯誤以 {"error": ...} 佔位，不影響其他筆。
+    """
+    if method == "GET":
+        params = {k: v[-1] for k, v in urllib.parse.parse_qs(query).items()}
+        return 200, summarize(params)
+    try:
+        data = json.loads(body or b"null")
+    except ValueError:
+        raise RequestError("invalid JSON body")
+    if isinstance(data, list):
+        if len(data) > MAX_BATCH:
+            raise RequestError(f"batch too large (max {MAX_BATCH})")
+        results = []
+        for item in data:
+            try:
+                results.append(summarize(item))
+            except RequestError as e:
+                results.append({"error": str(e)})
+        return 200, results
+    return 200, summarize(data)
+
+
+def _encode(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+async def _read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise RequestError("request body too large")
+        if not message.get("more_body", False):
+            return body
+
+async def _send_json(send, status, payload):
+    data = _encode(payload)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json; charset=utf-8"), (b"content-length", str(len(data)).encode())],
+    })
+    await send({"type": "http.response.body", "body": data})
+
+async def app(scope, receive, send):
+    """ ASGI 進入點 """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    path, method = scope["path"], scope["method"]
+    try:
+        if path == "/health":
+            await _send_json(send, 200, {"status": "ok"})
+        elif path == "/chart":
+            if method not in ("GET", "POST"):
+                await _send_json(send, 405, {"error": "method not allowed"})
+                return
+            body = await _read_body(receive) if method == "POST" else b""
+            status, payload = handle_chart(method, scope.get("query_string", b"").decode("latin-1"), body)
+            await _send_json(send, status, payload)
+        else:
+            await _send_json(send, 404, {"error": "not found"})
+    except RequestError as e:
+        await _send_json(send, 400, {"error": str(e)})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AliVerse 無頭 JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+# ==========================================
+# AliVerse 批次分析 (活動名單預先產生報告)
+# ==========================================
+"""
+讀取名單 (CSV 或 Parquet)，每人計算網頁上的全部結果，一人一列寫出，可另外輸出每人的 .txt 報告。
+
+    python -m bazi_app batch in.csv out.parquet [--reports DIR] [--workers N] [--chunk-size N]
+    python bazi_batch.py batch in.parquet out.csv
+    python -m bazi_app export in.csv reports.zip [--format pdf|png|txt]
+    python -m bazi_app match roster.csv queries.csv out.csv [--top 10]
+
+輸入欄位：name, gender (男/女，預設男), 出生日期 date (YYYY-MM-DD) 或 year/month/day,
+時辰 hour (0~23) 或 hour_slot (時辰選項 0~12)。單列錯誤寫入 error 欄，不中斷整批。
+
+名單以 chunk 為單位串流讀寫，同時在行程池中處理的 chunk 數有上限，記憶體用量與名單長度無關。
+報告中的時空卜卦以批次開始時間與姓名 (或 --div-input) 起卦，同一批次結果可重現。
+match 為查詢名單中的每個人，在 roster 名單裡排出相容性最高的前 N 位 (見 bazi_match)；
+查詢者本人 (姓名與出生資料相同) 也在 roster 中時不列入自己的排名。
+"""
+import argparse
+import collections
+import csv
+import datetime
+import itertools
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bazi_api import RequestError, chart_summary, parse_chart_params
+from bazi_engine import compute_chart, divine_reading
+from bazi_render import build_full_report_text, get_aliverse_car_matrix
+
+DEFAULT_CHUNK_SIZE = 2000
+
+OUTPUT_COLUMNS = (
+    "row", "name", "gender", "year", "month", "day", "hour_slot",
+    "year_pillar", "month_pillar", "day_pillar", "hour_pillar",
+    "lunar", "zodiac", "day_master", "score", "strength_type", "base_type",
+    "joyful_gods", "taboo_gods", "car_model", "car_quote", "hexagram", "tuning_purpose",
+    "advice_2026", "report_file", "error",
+)
+INT_COLUMNS = ("row", "year", "month", "day", "hour_slot", "score")
+
+
+def parse_row(row):
+    """ 名單一列 → compute_chart() 的引數；空白欄位視為未填 """
+    params = {k.strip(): v.strip() if isinstance(v, str) else v for k, v in row.items() if k and v not in (None, "")}
+    if "date" in params and "year" not in params:
+        date = params.pop("date")
+        try:
+            date = date if isinstance(date, datetime.date) else datetime.date.fromisoformat(str(date)[:10])
+        except ValueError:
+            raise RequestError(f"invalid date: {date}")
+        params.update(year=date.year, month=date.month, day=date.day)
+    return parse_chart_params(params)
+
+def report_filename(row_num, name, ext="txt"):
+    """ 報告檔名：列號 + 姓名 (移除檔名不允許的字元) """
+    safe = re.sub(r'[\\/:*?"<>|\s]+', "_", name).strip("_")[:40]
+    return f"{row_num:07d}_{safe or 'guest'}.{ext}"
+
+def build_report(name, chart, div_time=None, div_input=None):
+    """ 單人完整報告；return: (報告文字, bazi_export 的 payload) """
+    from bazi_export import report_payload
+    matrix_data = get_aliverse_car_matrix(chart.day_gan, chart.joyful_gods[0])
+    display_name = name or "貴賓"
+    user_input_val = div_input or display_name
+    time_ganzhi, reading = divine_reading(user_input_val, div_time)
+    main = reading.main
+    gua = (main.name, main.luck, main.judgment, main.advice)
+    text = build_full_report_text(display_name, chart, matrix_data, time_ganzhi, user_input_val, gua, reading)
+    return text, report_payload(display_name, chart, matrix_data, time_ganzhi, user_input_val, gua, text)
+
+def analyze_row(row_num, row, reports_dir=None, div_time=None, div_input=None):
+    """ 單人分析，回傳 OUTPUT_COLUMNS 對應的 dict """
+    name = str(row.get("name") or "").strip()
+    out = dict.fromkeys(OUTPUT_COLUMNS)
+    out.update(row=row_num, name=name)
+    try:
+        year, month, day, hour_slot, gender = parse_row(row)
+        summary = chart_summary(year, month, day, hour_slot, gender)
+    except ValueError as e:
+        out["error"] = str(e)
+        return out
+
+    pillars = list(summary["pillars"].values())
+    out.update(
+        gender=gender, year=year, month=month, day=day, hour_slot=hour_slot,
+        year_pillar=pillars[0], month_pillar=pillars[1], day_pillar=pillars[2], hour_pillar=pillars[3],
+        lunar=summary["lunar"], zodiac=summary["zodiac"], day_master=summary["day_master"],
+        score=summary["score"], strength_type=summary["strength_type"], base_type=summary["base_type"],
+        joyful_gods="、".join(summary["joyful_gods"]), taboo_gods="、".join(summary["taboo_gods"]),
+        car_model=summary["car_model"], car_quote=summary["car_quote"], hexagram=summary["hexagram"],
+        tuning_purpose=summary["tuning_purpose"], advice_2026=summary["advice_2026"],
+    )
+    if reports_dir:
+        text, _ = build_report(name, compute_chart(year, month, day, hour_slot, gender), div_time, div_input)
+        filename = report_filename(row_num, name)
+        with open(os.path.join(reports_dir, filename), "w", encoding="utf-8") as f:
+            f.write(text)
+        out["report_file"] = filename
+    return out
+
+def analyze_chunk(start, rows, reports_dir=None, div_time=None, div_input=None):
+    """ 行程池的工作單位：一個 chunk 的所有列 """
+    return [analyze_row(start + i, row, reports_dir, div_time, div_input) for i, row in enumerate(rows)]
+
+
+# ==========================================
+# 串流讀寫 (依副檔名選擇 CSV / Parquet)
+# ==========================================
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("Parquet 讀寫需要 pyarrow：pip install pyarrow")
+    return pyarrow
+
+def iter_chunks(path, chunk_size):
+    """ 逐 chunk 讀出名單，每個 chunk 為 dict 的 list """
+    if _is_parquet(path):
+        pa = _require_pyarrow()
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                return
+            yield rows
+
+class CsvSink:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=OUTPUT_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+class ParquetSink:
+    def __init__(self, path):
+        pa = _require_pyarrow()
+        self.pa = pa
+        self.schema = pa.schema([
+            (col, pa.int32() if col in INT_COLUMNS else pa.string()) for col in OUTPUT_COLUMNS
+        ])
+        self.writer = pa.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def run_batch(input_path, output_path, reports_dir=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              div_input=None, progress=True):
+    """
+    執行批次分析；回傳 (總列數, 錯誤列數, 秒數)。
+    同時送進行程池的 chunk 最多 workers × 2 個，輸出依輸入順序寫入。
+    """
+    workers = workers or os.cpu_count() or 1
+    if reports_dir:
+        os.makedirs(reports_dir, exist_ok=True)
+    div_time = datetime.datetime.now().replace(microsecond=0)
+    sink = ParquetSink(output_path) if _is_parquet(output_path) else CsvSink(output_path)
+    total = errors = 0
+    start = time.perf_counter()
+
+    def drain(future):
+        nonlocal total, errors
+        rows = future.result()
+        sink.write(rows)
+        total += len(rows)
+        errors += sum(1 for r in rows if r["error"])
+        if progress:
+            elapsed = time.perf_counter() - start
+            print(f"\r{total} rows ({total / elapsed:,.0f} rows/s, {errors} errors)", end="", file=sys.stderr, flush=True)
+
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            pending = collections.deque()
+            row_num = 1
+            for rows in iter_chunks(input_path, chunk_size):
+                pending.append(pool.submit(analyze_chunk, row_num, rows, reports_dir, div_time, div_input))
+                row_num += len(rows)
+                if len(pending) >= workers * 2:
+                    drain(pending.popleft())
+            while pending:
+                drain(pending.popleft())
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - start
+    if progress:
+        print(file=sys.stderr)
+    return total, errors, elapsed
+
+
+# ==========================================
+# 名單配對 (N × M 相容性排名)
+# ==========================================
+MATCH_COLUMNS = ("query_row", "query_name", "rank", "match_row", "match_name", "score", "rating")
+
+def load_charts(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """ 讀取名單並排盤；return: (charts, names, row_nums, errors)，無法解析的列記入 errors """
+    charts, names, row_nums, errors = [], [], [], []
+    row_num = 1
+    for rows in iter_chunks(path, chunk_size):
+        for row in rows:
+            name = str(row.get("name") or "").strip()
+            try:
+                charts.append(compute_chart(*parse_row(row)))
+            except ValueError as e:
+                errors.append((row_num, name, str(e)))
+            else:
+                names.append(name)
+                row_nums.append(row_num)
+            row_num += 1
+    return charts, names, row_nums, errors
+
+def _person_key(name, chart):
+    """ 判斷查詢者是否就是名單成員：姓名與出生資料皆相同 """
+    return name, chart.year, chart.month, chart.day, chart.hour_slot, chart.gender
+
+def run_match(roster_path, query_path, output_path, top_k=10):
+    """
+    執行名單配對；回傳 (查詢人數, 名單人數, 錯誤列數, 秒數)。
+    查詢名單與候選名單重疊 (或為同一份) 時，查詢者本人不會出現在自己的排名中。
+    """
+    from bazi_match import RosterIndex, rate
+    start = time.perf_counter()
+    roster, roster_names, roster_rows, roster_errors = load_charts(roster_path)
+    queries, query_names, query_rows, query_errors = load_charts(query_path)
+    index = RosterIndex(roster, roster_names)
+    roster_index = {}
+    for idx, (name, chart) in enumerate(zip(roster_names, roster)):
+        roster_index.setdefault(_person_key(name, chart), idx)
+    exclude = [roster_index.get(_person_key(name, chart)) for name, chart in zip(query_names, queries)]
+    results = index.rank(queries, top_k, exclude)
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=MATCH_COLUMNS)
+        writer.writeheader()
+        for q_row, q_name, matches in zip(query_rows, query_names, results):
+            writer.writerows(
+                {"query_row": q_row, "query_name": q_name, "rank": rank, "match_row": roster_rows[idx],
+                 "match_name": name, "score": score, "rating": rate(score)}
+                for rank, (idx, name, score) in enumerate(matches, 1)
+            )
+    return len(queries), len(roster), len(roster_errors) + len(query_errors), time.perf_counter() - start
+
+
+# ==========================================
+# 批次匯出 (PNG / PDF / TXT 串流寫入 ZIP)
+# ==========================================
+EXPORT_CHUNK_SIZE = 50  # 圖檔較大，chunk 取小，行程池中同時存在的成品有上限
+
+def export_chunk(start, rows, kind, div_time=None, div_input=None):
+    """ 行程池的工作單位：一個 chunk 的成品；return: (list of (檔名, bytes), 錯誤列數) """
+    from bazi_export import render
+    files, errors = [], 0
+    for i, row in enumerate(rows):
+        name = str(row.get("name") or "").strip()
+        try:
+            chart = compute_chart(*parse_row(row))
+        except ValueError:
+            errors += 1
+            continue
+        _, payload = build_report(name, chart, div_time, div_input)
+        files.append((report_filename(start + i, name, kind), render(kind, payload)))
+    return files, errors
+
+def run_export(input_path, output_path, kind="pdf", workers=None, chunk_size=EXPORT_CHUNK_SIZE, div_input=None, progress=True):
+    """
+    名單中每人一份成品，依輸入順序串流寫入 ZIP；回傳 (檔案數, 錯誤列數, 秒數)。
+    同時送進行程池的 chunk 最多 workers × 2 個，寫出後即釋放。
+    """
+    from bazi_export import iter_zip
+    workers = workers or os.cpu_count() or 1
+    div_time = datetime.datetime.now().replace(microsecond=0)
+    total = errors = 0
+    start = time.perf_counter()
+
+    def finished_files(pool):
+        nonlocal total, errors
+        pending = collections.deque()
+        row_num = 1
+
+        def drain(future):
+            nonlocal total, errors
+            files, n_errors = future.result()
+            errors += n_errors
+            for item in files:
+                total += 1
+                yield item
+            if progress:
+                print(f"\r{total} files ({total / (time.perf_counter() - start):,.1f} files/s, {errors} errors)",
+                      end="", file=sys.stderr, flush=True)
+
+        for rows in iter_chunks(input_path, chunk_size):
+            pending.append(pool.submit(export_chunk, row_num, rows, kind, div_time, div_input))
+            row_num += len(rows)
+            if len(pending) >= workers * 2:
+                yield from drain(pending.popleft())
+        while pending:
+            yield from drain(pending.popleft())
+
+    tmp_path = output_path + ".tmp"
+    with ProcessPoolExecutor(workers) as pool, open(tmp_path, "wb") as f:
+        for chunk in iter_zip(finished_files(pool)):
+            f.write(chunk)
+    os.replace(tmp_path, output_path)
+    if progress:
+        print(file=sys.stderr)
+    return total, errors, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bazi_app", description="AliVerse 批次分析")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_batch = sub.add_parser("batch", help="分析名單 (CSV / Parquet)")
+    p_batch.add_argument("input", help="輸入名單 .csv / .parquet")
+    p_batch.add_argument("output", help="輸出結果 .csv / .parquet")
+    p_batch.add_argument("--reports", metavar="DIR", help="另外輸出每人的 .txt 完整報告")
+    p_batch.add_argument("--workers", type=int, default=None, help="行程數 (預設 CPU 數)")
+    p_batch.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    p_batch.add_argument("--div-input", help="報告卜卦用的意念字 (預設為姓名)")
+    p_batch.add_argument("--quiet", action="store_true", help="不顯示進度")
+    p_export = sub.add_parser("export", help="批次匯出每人的 PNG / PDF / TXT 報告為 ZIP")
+    p_export.add_argument("input", help="輸入名單 .csv / .parquet")
+    p_export.add_argument("output", help="輸出 .zip")
+    p_export.add_argument("--format", choices=("png", "pdf", "txt"), default="pdf")
+    p_export.add_argument("--workers", type=int, default=None, help="行程數 (預設 CPU 數)")
+    p_export.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    p_export.add_argument("--div-input", help="報告卜卦用的意念字 (預設為姓名)")
+    p_export.add_argument("--quiet", action="store_true", help="不顯示進度")
+    p_match = sub.add_parser("match", help="名單配對：為每位查詢者排出相容性最高的名單成員")
+    p_match.add_argument("roster", help="候選名單 .csv / .parquet")
+    p_match.add_argument("queries", help="查詢名單 .csv / .parquet")
+    p_match.add_argument("output", help="輸出排名 .csv")
+    p_match.add_argument("--top", type=int, default=10, help="每人列出前 N 名 (預設 10)")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        total, errors, elapsed = run_export(
+            args.input, args.output, args.format, args.workers, args.chunk_size, args.div_input, not args.quiet
+        )
+        print(f"{total} files, {errors} errors, {elapsed:.1f}s -> {args.output}")
+        return 1 if errors and not total else 0
+    if args.command == "match":
+        n_queries, n_roster, errors, elapsed = run_match(args.roster, args.queries, args.output, args.top)
+        print(f"{n_queries} x {n_roster} matched, {errors} errors, {elapsed:.1f}s -> {args.output}")
+        return 0
+
+    total, errors, elapsed = run_batch(
+        args.input, args.output, args.reports, args.workers, args.chunk_size, args.div_input, not args.quiet
+    )
+    rate = total / elapsed if elapsed else 0.0
+    print(f"{total} rows, {errors} errors, {elapsed:.1f}s ({rate:,.0f} rows/s) -> {args.output}")
+    return 1 if total and errors == total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+# ==========================================
+# AliVerse 效能基準測試
+# ==========================================
+"""
+三部分：
+    1. 微基準：排盤換算、評分、著色、十神、車相矩陣、Altair 圖表、報告文字組裝
+    2. 端對端：以 Streamlit AppTest 的公開介面跑完整頁面 (啟動引擎 → 解鎖 → 卜卦)，動畫一律略過。
+       AppTest 的每次互動都是整頁重跑，解鎖與卜卦量到的是上限 (瀏覽器只重跑所在片段)
+    3. 冷啟動：在全新的子行程中跑首頁 / 解鎖後頁面，記錄耗時、RSS 峰值與是否載入 pandas / altair
+
+結果存成 JSON，可與前一版比較：
+    python bazi_bench.py --output bench_results.json
+    python bazi_bench.py --compare bench_results.json --no-e2e
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+import numpy as np
+
+import bazi_calendar
+import bazi_engine
+import bazi_forecast
+import bazi_match
+import bazi_permalink
+import bazi_render
+from bazi_engine import (
+    HOUR_SLOT_HOURS, StrengthScheme, compute_chart, compute_chart_exact, convert_lunar, get_ten_god, hour_variants, score_strength, score_strength_array, ten_gods
+)
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bazi_app.py")
+SAMPLE_BIRTH = (1988, 9, 15, 6)  # 年, 月, 日, 時辰選項
+REGRESSION_THRESHOLD = 1.10
+# 與預設評分方案並列比較的替代方案 (月令不特別加權)
+FLAT_SCHEME = StrengthScheme("flat", weights=(10, 15, 10, 15, 15, 10, 15), thresholds=((85, True), (45, False), (15, True)))
+
+
+def time_call(fn, repeat=5):
+    """ 以 timeit 自動決定迴圈次數，回傳每次呼叫的微秒數 (最小值與中位數) """
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    runs = [t / loops * 1e6 for t in timer.repeat(repeat=repeat, number=loops)]
+    return {"min_us": round(min(runs), 3), "median_us": round(statistics.median(runs), 3), "loops": loops}
+
+def micro_benchmarks(only=None):
+    """
+    回傳 {名稱: 無參數函式}，only 為名稱前綴 (None = 全部)。
+    大型測資 (百萬筆盤面代碼、15 萬個十神、萬人名冊、樣式索引) 與 altair 只在選到用它的項目時才建立 / 載入。
+    """
+    def selected(*names):
+        return any(not only or any(name.startswith(p) for p in only) for name in names)
+
+    year, month, day, slot = SAMPLE_BIRTH
+    hour = HOUR_SLOT_HOURS[slot]
+    chart = compute_chart(year, month, day, slot)
+    other = compute_chart(1990, 3, 21, 2, "女")
+    link = bazi_permalink.Permalink(datetime.date(year, month, day), hour, 0)
+    token = bazi_permalink.encode(link)
+    eight = tuple(c for pillar in chart.pillars for c in pillar)
+    matrix = bazi_render.get_aliverse_car_matrix(chart.day_gan, chart.joyful_gods[0])
+    raw_matrix = bazi_render.build_aliverse_car_matrix(chart.day_gan, chart.joyful_gods[0])
+    plain_text = chart.soul_message + chart.god_reason + matrix["tuning_purpose"]
+    pairs = [(chart.day_gan, s) for s in bazi_engine.STEMS] + [(chart.day_gan, "癸")] * 5
+    gua = ("乾為天", "大吉", "元亨利貞。", "強勢突破，但需注意姿態。")
+    div_time = datetime.datetime(2026, 2, 17, 12, 30)
+    table = bazi_engine.get_chart_table()
+
+    benches = {
+        "chart.lunar_convert": lambda: convert_lunar(year, month, day, hour),
+        "chart.calendar_convert": lambda: bazi_calendar.convert(year, month, day, hour),
+        "chart.compute_uncached": lambda: compute_chart.__wrapped__(year, month, day, slot),
+        "chart.compute_cached": lambda: compute_chart(year, month, day, slot),
+        "chart.hour_variants_uncached": lambda: hour_variants.__wrapped__(year, month, day),
+        "permalink.encode": lambda: bazi_permalink.encode(link),
+        "permalink.load_cached": lambda: bazi_permalink.load(token),
+        "chart.exact_uncached": lambda: compute_chart_exact.__wrapped__(year, month, day, hour, 0, longitude=121.56),
+        "score.strength": lambda: score_strength(*eight),
+        "highlight.uncached": lambda: bazi_render.highlight_keywords.__wrapped__(plain_text),
+        "highlight.cached": lambda: bazi_render.highlight_keywords(plain_text),
+        "ten_god.single_x15": lambda: [get_ten_god(d, s) for d, s in pairs],
+        "car_matrix.build": lambda: bazi_render.build_aliverse_car_matrix(chart.day_gan, chart.joyful_gods[0]),
+        "car_matrix.render_html": lambda: bazi_render.render_car_matrix_html(raw_matrix),
+        "car_matrix.lookup": lambda: bazi_render.get_aliverse_car_matrix(chart.day_gan, chart.joyful_gods[0]),
+        "forecast.15y": lambda: bazi_forecast.forecast(chart, 2026, 2040),
+        "match.pair": lambda: bazi_match.compatibility.__wrapped__(chart, other),
+        "divine.time_uncached": lambda: bazi_engine.divination_time.__wrapped__(2026, 2, 17, 12),
+        "divine.reading": lambda: bazi_engine.divine_reading("8", div_time),
+        "report.final_advice": lambda: bazi_render.build_final_advice_html(chart, matrix, gua[0]),
+        "report.full_text": lambda: bazi_render.build_full_report_text("Ali", chart, matrix, "丙午年 正月 初一 午時", "8", gua),
+    }
+    if selected("charts."):
+        import bazi_charts  # 載入 altair / pandas 約需半秒
+        benches["charts.altair_build"] = lambda: bazi_charts.build_wuxing_charts(chart.pillars)
+        benches["charts.altair_spec"] = lambda: [c.to_dict() for c in bazi_charts.build_wuxing_charts(chart.pillars)]
+    rng = np.random.default_rng(0)
+    if selected("score.array_1m"):
+        chart_codes = rng.integers(0, [10, 12] * 4, size=(1_000_000, 8)).astype(np.int8)
+        benches["score.array_1m"] = lambda: score_strength_array(chart_codes)
+        benches["score.array_1m_flat"] = lambda: score_strength_array(chart_codes, FLAT_SCHEME)
+    if selected("ten_god.batch_150k"):
+        day_stems = rng.integers(0, 10, size=(10000, 1))
+        stems = rng.integers(0, 10, size=(10000, 15))
+        benches["ten_god.batch_150k"] = lambda: ten_gods(day_stems, stems)
+    if selected("match.rank_100x10k"):
+        roster_dates = [
+            (int(y), int(m), int(d), int(h))
+            for y, m, d, h in zip(rng.integers(1950, 2011, 10000), rng.integers(1, 13, 10000), rng.integers(1, 29, 10000), rng.integers(0, 12, 10000))
+        ]
+        roster = bazi_match.RosterIndex([compute_chart(*p) for p in roster_dates])
+        queries = [compute_chart(*p) for p in roster_dates[:100]]
+        benches["match.rank_100x10k"] = lambda: roster.rank(queries, 10)
+    if table is not None:
+        benches["chart.table_lookup"] = lambda: table.lookup(year, month, day, slot)
+        if selected("index.query_and", "index.query_or"):
+            import bazi_index
+            pattern_index = bazi_index.get_pattern_index()
+            benches["index.query_and"] = lambda: pattern_index.query({"day_gan": "壬", "base_type": "🛡️ 重裝坦克"})
+            benches["index.query_or"] = lambda: pattern_index.query([{"hexagram": "火水卦", "score": (80, 100)}, {"car_model": "Bugatti Chiron", "time_zhi": "子"}])
+    return {name: fn for name, fn in benches.items() if selected(name)}
+
+def run_micro(only=None):
+    results = {}
+    for name, fn in micro_benchmarks(only).items():
+        results[name] = time_call(fn)
+        print(f"  {name:<28} {results[name]['median_us']:>12.2f} us", file=sys.stderr)
+    return results
+
+
+def _payload_meter():
+    """ 攔截 ForwardMsgQueue，統計每次重跑送往瀏覽器的位元組數 """
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+
+    sizes = []
+    original = ForwardMsgQueue.enqueue
+
+    def enqueue(self, msg):
+        sizes.append(msg.ByteSize())
+        return original(self, msg)
+
+    ForwardMsgQueue.enqueue = enqueue
+    return sizes
+
+def _expect(at, step_name, rendered):
+    """ 每一步確認預期的元素有畫出來，避免計時到錯誤的畫面 """
+    if at.exception:
+        raise RuntimeError(f"app raised during benchmark step {step_name}: {[e.value for e in at.exception]}")
+    if not rendered():
+        raise RuntimeError(f"benchmark step {step_name} did not render its expected element")
+
+def _e2e_session(sizes):
+    """ 跑一次完整流程，回傳 {步驟: (秒數, 位元組)} """
+    from streamlit.testing.v1 import AppTest
+
+    year, month, day, slot = SAMPLE_BIRTH
+    steps = {}
+
+    def step(name, action):
+        sizes.clear()
+        start = time.perf_counter()
+        action()
+        steps[name] = (time.perf_counter() - start, sum(sizes))
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    step("load", at.run)
+    step("rerun_idle", at.run)
+
+    def submit():
+        at.text_input[0].input("Ali")
+        at.date_input[0].set_value(datetime.date(year, month, day))
+        at.time_input[0].set_value(datetime.time(HOUR_SLOT_HOURS[slot], 0))
+        at.button[0].click()
+        at.run()
+    step("submit", submit)
+
+    def unlock():
+        next(t for t in at.text_input if "解鎖" in t.label).input("ALI888")
+        next(b for b in at.button if "解碼" in b.label).click()
+        at.run()
+    step("unlock", unlock)
+    _expect(at, "unlock", lambda: any("十神解析" in h.value for h in at.subheader))
+
+    def divination():
+        next(t for t in at.text_input if "直覺" in t.label).input("8")
+        next(b for b in at.button if "卜卦" in b.label).click()
+        at.run()
+    step("divination", divination)
+    _expect(at, "divination", lambda: any("divination-box" in m.value for m in at.markdown))
+    step("rerun_result", at.run)
+
+    if at.exception:
+        raise RuntimeError(f"app raised during benchmark: {[e.value for e in at.exception]}")
+    return steps
+
+def run_e2e(runs=5):
+    os.environ["ALIVERSE_SKIP_ANIMATIONS"] = "1"
+    sizes = _payload_meter()
+    logging.getLogger("streamlit.deprecation_util").disabled = True  # 略過棄用提示雜訊
+    _e2e_session(sizes)  # 暖機：匯入模組、建立快取
+    samples = [_e2e_session(sizes) for _ in range(runs)]
+    results = {}
+    for name in samples[0]:
+        times = [s[name][0] * 1e3 for s in samples]
+        results[name] = {
+            "min_ms": round(min(times), 3),
+            "median_ms": round(statistics.median(times), 3),
+            "bytes": samples[-1][name][1],
+        }
+        print(f"  {name:<28} {results[name]['median_ms']:>10.2f} ms {results[name]['bytes']:>10} B", file=sys.stderr)
+    return results
+
+
+# 子行程內執行：跑到指定步驟後輸出 JSON。
+# RSS 峰值優先讀 /proc/self/status 的 VmHWM：ru_maxrss 會沿用 fork 前父行程的峰值，量不準。
+STARTUP_SNIPPET = """
+import datetime, json, logging, resource, sys, time
+
+def peak_rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Linux 為 KB
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+logging.getLogger("streamlit.deprecation_util").disabled = True
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+if {stage!r} == "unlocked":
+    year, month, day, hour = {birth!r}
+    at.date_input[0].set_value(datetime.date(year, month, day))
+    at.time_input[0].set_value(datetime.time(hour, 0))
+    at.button[0].click()
+    at.run()
+    next(t for t in at.text_input if "解鎖" in t.label).input("ALI888")
+    next(b for b in at.button if "解碼" in b.label).click()
+    at.run()
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "maxrss_kb": peak_rss_kb(),
+    "modules": {{m: m in sys.modules for m in ("pandas", "altair", "lunar_python", "numpy")}},
+}}))
+"""
+STARTUP_STAGES = ("landing", "unlocked")
+
+def run_startup(runs=3):
+    """ 每次以全新的直譯器跑到首頁 / 解鎖後，量測冷啟動耗時與 RSS 峰值 """
+    env = dict(os.environ, ALIVERSE_SKIP_ANIMATIONS="1")
+    results = {}
+    for stage in STARTUP_STAGES:
+        code = STARTUP_SNIPPET.format(app=APP_PATH, stage=stage, birth=(*SAMPLE_BIRTH[:3], HOUR_SLOT_HOURS[SAMPLE_BIRTH[3]]))
+        samples = []
+        for _ in range(runs):
+            proc = subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, env=env,
+                cwd=os.path.dirname(APP_PATH), check=True
+            )
+            samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        results[stage] = {
+            "median_ms": round(statistics.median(s["seconds"] for s in samples) * 1e3, 3),
+            "rss_mb": round(statistics.median(s["maxrss_kb"] for s in samples) / 1024, 1),
+            "modules": samples[-1]["modules"],
+        }
+        loaded = ", ".join(m for m, v in results[stage]["modules"].items() if v)
+        print(f"  {stage:<28} {results[stage]['median_ms']:>10.2f} ms {results[stage]['rss_mb']:>8.1f} MB  [{loaded}]", file=sys.stderr)
+    return results
+
+
+def compare(current, previous):
+    """ 列出各項中位數變化，超過 REGRESSION_THRESHOLD 標示為退步；回傳退步項目數 """
+    regressions = 0
+    for section, key in (("micro", "median_us"), ("e2e", "median_ms"), ("startup", "median_ms"), ("startup", "rss_mb")):
+        for name, now in current.get(section, {}).items():
+            before = previous.get(section, {}).get(name)
+            if not before or not before.get(key):
+                continue
+            ratio = now[key] / before[key]
+            flag = "  REGRESSION" if ratio > REGRESSION_THRESHOLD else ""
+            regressions += bool(flag)
+            print(f"{section}.{name:<28} {key:<10} {before[key]:>12.2f} -> {now[key]:>12.2f}  x{ratio:.2f}{flag}")
+    return regressions
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(APP_PATH), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AliVerse 效能基準測試")
+    parser.add_argument("--output", help="結果 JSON 輸出路徑")
+    parser.add_argument("--compare", help="與先前的結果 JSON 比較")
+    parser.add_argument("--only", nargs="*", help="只跑指定前綴的微基準 (如 chart highlight)")
+    parser.add_argument("--no-e2e", action="store_true", help="略過 AppTest 端對端測試")
+    parser.add_argument("--e2e-runs", type=int, default=5)
+    parser.add_argument("--no-startup", action="store_true", help="略過冷啟動 (子行程) 量測")
+    parser.add_argument("--startup-runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "chart_table": bazi_engine.get_chart_table() is not None,
+        },
+    }
+    # 查表結果不對時量到的速度沒有意義：先比對車相矩陣的固定預期輸出
+    problems = bazi_render.check_car_matrix_table()
+    if problems:
+        print("car matrix table check failed:", *problems, sep="\n  ", file=sys.stderr)
+        return 1
+    print("micro benchmarks:", file=sys.stderr)
+    results["micro"] = run_micro(args.only)
+    if not args.no_e2e:
+        print("end-to-end (AppTest):", file=sys.stderr)
+        results["e2e"] = run_e2e(args.e2e_runs)
+    if not args.no_startup:
+        print("cold start (subprocess):", file=sys.stderr)
+        results["startup"] = run_startup(args.startup_runs)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            return 1 if compare(results, json.load(f)) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# ==========================================
+# AliVerse 出生時間校正 (夏令時間、真太陽時、交界提醒)
+# ==========================================
+"""
+輸入的出生時間是當地「鐘錶時間」，排盤前依出生地換算成三個時間：
+
+    北京時間 (UTC+8)：與節氣表的交節時刻比對，決定年柱、月柱
+    當地標準時間：扣除歷史夏令時間 (例如台灣 1945 ~ 1979 的日光節約時間)，決定日柱、時柱
+    真太陽時 (選填經度)：UTC + 經度 × 4 分鐘 + 均時差，取代當地標準時間
+
+各地區的歷史時區與夏令時間由 `python bazi_birthtime.py generate` 自 IANA tzdata (zoneinfo) 產生至
+bazi_timezone_data.py，執行期不依賴系統 tzdata。
+
+    python bazi_birthtime.py generate
+    python bazi_birthtime.py verify          (每 30 分鐘比對 zoneinfo，1900 ~ 2026)
+"""
+import argparse
+import bisect
+import datetime
+import math
+import os
+import sys
+from dataclasses import dataclass
+
+import bazi_calendar
+from bazi_timezone_data import TIMEZONES
+
+# 出生地 (顯示名稱, IANA 時區, 代表城市經度)
+REGIONS = (
+    ("台灣", "Asia/Taipei", 121.56),
+    ("中國大陸", "Asia/Shanghai", 116.40),
+    ("香港", "Asia/Hong_Kong", 114.17),
+    ("澳門", "Asia/Macau", 113.54),
+    ("新加坡", "Asia/Singapore", 103.82),
+    ("馬來西亞", "Asia/Kuala_Lumpur", 101.69),
+)
+REGION_NAMES = tuple(name for name, _, _ in REGIONS)
+REGION_ZONES = {name: zone for name, zone, _ in REGIONS}
+REGION_LONGITUDES = {name: lon for name, _, lon in REGIONS}
+DEFAULT_REGION = "台灣"
+
+EPOCH = datetime.datetime(1900, 1, 1)
+BEIJING_OFFSET = 8 * 3600
+# 出生時間距離柱的交界 (節氣交節、時辰交界、子夜換日) 在此分鐘數內時提醒
+BOUNDARY_WARN_MINUTES = 15
+# 一日內的交界 (當日分鐘數, 受影響的柱, 說明)：時辰在奇數整點交接，子夜 00:00 換日
+HOUR_BOUNDARIES = ((0, "日柱", "換日"),) + tuple((h * 60, "時柱", "時辰交界") for h in range(1, 24, 2)) + ((24 * 60, "日柱", "換日"),)
+
+
+class TimeZone:
+    """ 由 bazi_timezone_data 的轉換表建立；offset 與 dst 皆為秒 """
+
+    def __init__(self, initial, transitions):
+        self.initial = initial
+        self.times = tuple(t for t, _, _ in transitions)
+        self.states = tuple((offset, dst) for _, offset, dst in transitions)
+
+    def at_utc(self, utc_seconds):
+        """ UTC 時刻 (自 1900-01-01 起的秒數) 的 (UTC 偏移, 夏令) """
+        i = bisect.bisect_right(self.times, utc_seconds) - 1
+        return self.states[i] if i >= 0 else self.initial
+
+    def at_wall(self, wall_seconds):
+        """
+        當地鐘錶時間的 (UTC 偏移, 夏令)。
+        撥回時重複的一小時取較早的時刻 (夏令)；撥快時不存在的時間沿用撥快前的偏移。
+        """
+        candidates = {self.at_utc(wall_seconds - 14 * 3600), self.at_utc(wall_seconds + 14 * 3600)}
+        candidates.add(self.at_utc(wall_seconds - max(o for o, _ in candidates)))
+        valid = [state for state in candidates if self.at_utc(wall_seconds - state[0]) == state]
+        if valid:
+            return max(valid)
+        return self.at_utc(wall_seconds - max(o for o, _ in candidates) - 1)
+
+ZONES = {zone: TimeZone(initial, transitions) for zone, (initial, transitions) in TIMEZONES.items()}
+
+
+def equation_of_time(utc):
+    """ 均時差 (分鐘，真太陽時 - 平太陽時)；Spencer (1971) 近似，誤差約 ±0.5 分鐘 """
+    gamma = 2 * math.pi / 365 * (utc.timetuple().tm_yday - 1 + (utc.hour - 12) / 24)
+    return 229.18 * (
+        0.000075 + 0.001868 * math.cos(gamma) - 0.032077 * math.sin(gamma)
+        - 0.014615 * math.cos(2 * gamma) - 0.040849 * math.sin(2 * gamma)
+    )
+
+
+@dataclass(frozen=True)
+class BirthMoment:
+    civil: datetime.datetime     # 輸入的鐘錶時間
+    beijing: datetime.datetime   # 北京時間 (比對節氣)
+    local: datetime.datetime     # 排日柱、時柱的時間 (當地標準時間或真太陽時)
+    region: str
+    dst_minutes: int             # 出生當時的夏令時間 (分鐘)
+    longitude: float = None      # None = 未做真太陽時校正
+
+    @property
+    def term_offset(self):
+        """ 北京時間 - 排盤時間 (分鐘)，供 bazi_calendar 比對交節時刻 """
+        return round((self.beijing - self.local).total_seconds() / 60)
+
+    def describe(self):
+        """ 校正說明 (一行)；鐘錶時間即排盤時間時回傳空字串 """
+        parts = []
+        if self.dst_minutes:
+            parts.append(f"扣除夏令時間 {self.dst_minutes} 分鐘")
+        if self.longitude is not None:
+            parts.append(f"東經 {self.longitude:.2f}° 真太陽時")
+        if not parts:
+            return ""
+        return f"{self.civil:%H:%M} → {self.local:%H:%M} ({'、'.join(parts)})"
+
+
+def resolve(year, month, day, hour, minute, region=DEFAULT_REGION, longitude=None):
+    """
+    出生地鐘錶時間 → BirthMoment。地區不在 REGIONS 時拋出 ValueError。
+    """
+    if region not in REGION_ZONES:
+        raise ValueError(f"unknown region: {region}")
+    civil = datetime.datetime(year, month, day, hour, minute)
+    offset, dst = ZONES[REGION_ZONES[region]].at_wall(int((civil - EPOCH).total_seconds()))
+    utc = civil - datetime.timedelta(seconds=offset)
+    beijing = utc + datetime.timedelta(seconds=BEIJING_OFFSET)
+    if longitude is None:
+        local = civil - datetime.timedelta(seconds=dst)
+    else:
+        longitude = float(longitude)
+        if not -180 <= longitude <= 180:
+            raise ValueError(f"longitude out of range: {longitude}")
+        minutes = longitude * 4 + equation_of_time(utc)
+        local = utc + datetime.timedelta(minutes=round(minutes))
+    return BirthMoment(civil=civil, beijing=beijing, local=local, region=region, dst_minutes=dst // 60, longitude=longitude)
+
+
+def boundary_warnings(moment, minutes=BOUNDARY_WARN_MINUTES):
+    """ 出生時間太靠近柱的交界時的提醒文字 (tuple) """
+    warnings = []
+    b = moment.beijing
+    name, instant, delta = bazi_calendar.nearest_jie(b.year, b.month, b.day, b.hour, b.minute)
+    if abs(delta) <= minutes:
+        pillars = "年柱與月柱" if name == "立春" else "月柱"
+        side = "後" if delta >= 0 else "前"
+        warnings.append(
+            f"出生時間在{name}交節 (北京時間 {instant:%Y/%m/%d %H:%M}) {side} {abs(delta)} 分鐘，"
+            f"{pillars}可能因出生時間誤差而不同。"
+        )
+    local_minutes = moment.local.hour * 60 + moment.local.minute
+    for boundary, pillar, label in HOUR_BOUNDARIES:
+        delta = local_minutes - boundary
+        if abs(delta) <= minutes:
+            side = "後" if delta >= 0 else "前"
+            warnings.append(f"出生時間在 {boundary // 60 % 24:02d}:00 {label}{side} {abs(delta)} 分鐘，{pillar}可能因出生時間誤差而不同。")
+    return tuple(warnings)
+
+
+# ==========================================
+# 產生與驗證 (需要系統 tzdata)
+# ==========================================
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bazi_timezone_data.py")
+
+def _zone_state(zone, utc):
+    local = utc.replace(tzinfo=datetime.timezone.utc).astimezone(zone)
+    return int(local.utcoffset().total_seconds()), int(local.dst().total_seconds())
+
+def generate(first_year=1900, last_year=2050, path=DATA_PATH, step_hours=6):
+    """ 以 zoneinfo 掃描各地區的時區轉換 (逐步掃描後二分到秒)，寫入 bazi_timezone_data.py """
+    import zoneinfo
+
+    lines = [
+        "# ==========================================",
+        "# AliVerse 出生地歷史時區資料 (由 `python bazi_birthtime.py generate` 自 IANA tzdata 產生，請勿手動修改)",
+        "# ==========================================",
+        "# 時區：((1900 年初的 UTC 偏移秒數, 夏令秒數), ((轉換 UTC 時刻 (自 1900-01-01 起的秒數), UTC 偏移秒數, 夏令秒數), ...))",
+        "TIMEZONES = {",
+    ]
+    end = datetime.datetime(last_year + 1, 1, 1)
+    step = datetime.timedelta(hours=step_hours)
+    for _, name, _ in REGIONS:
+        zone = zoneinfo.ZoneInfo(name)
+        t = datetime.datetime(first_year, 1, 1)
+        state = initial = _zone_state(zone, t)
+        transitions = []
+        while t < end:
+            nxt = t + step
+            new = _zone_state(zone, nxt)
+            if new != state:
+                lo, hi = t, nxt
+                while hi - lo > datetime.timedelta(seconds=1):
+                    mid = lo + (hi - lo) / 2
+                    mid = mid.replace(microsecond=0)
+                    if _zone_state(zone, mid) == state:
+                        lo = mid
+                    else:
+                        hi = mid
+                transitions.append((int((hi - EPOCH).total_seconds()), *new))
+                state = new
+            t = nxt
+        lines.append(f"    {name!r}: ({initial}, (")
+        lines.extend(f"        {entry},  # {EPOCH + datetime.timedelta(seconds=entry[0]):%Y-%m-%d %H:%M:%S} UTC" for entry in transitions)
+        lines.append("    )),")
+    lines.append("}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def verify(first_year=1900, last_year=2026):
+    """ 每 30 分鐘比對 zoneinfo 的鐘錶時間換算；回傳不一致的 (地區, 鐘錶時間) 清單 """
+    import zoneinfo
+
+    mismatches = []
+    for _, name, _ in REGIONS:
+        zone, ours = zoneinfo.ZoneInfo(name), ZONES[name]
+        t = datetime.datetime(first_year, 1, 1)
+        while t.year <= last_year:
+            expected = t.replace(tzinfo=zone)
+            state = (int(expected.utcoffset().total_seconds()), int(expected.dst().total_seconds()))
+            if ours.at_wall(int((t - EPOCH).total_seconds())) != state:
+                mismatches.append((name, t))
+            t += datetime.timedelta(minutes=30)
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AliVerse 出生時間校正")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("generate", help="自 tzdata 產生出生地歷史時區資料")
+    p_verify = sub.add_parser("verify", help="比對 zoneinfo")
+    p_verify.add_argument("--first", type=int, default=1900)
+    p_verify.add_argument("--last", type=int, default=2026)
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        generate()
+        print(f"{len(REGIONS)} regions -> {DATA_PATH}", file=sys.stderr)
+        return 0
+    mismatches = verify(args.first, args.last)
+    print(f"{args.first}-{args.last}: {len(mismatches)} mismatches")
+    for key in mismatches[:20]:
+        print("  ", key)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# ==========================================
+# AliVerse 干支曆法核心 (整數運算 + 節氣表)
+# ==========================================
+"""
+四柱只需要整數運算與一張節氣表，不必為每次排盤建立 lunar_python 的 Lunar 物件：
+
+    日柱 = (儒略日數 - 11) % 60
+    時柱 = 時支 (時 + 1) // 2，時干以五鼠遁由日干起 (23 時晚子用次日日干，日柱仍算當天)
+    年柱 = 立春交節時刻之後的西元年；月柱 = 最近一個「節」的序號 (每節干支序 + 1)
+    農曆日期 = 以各農曆年的大小月與閏月編碼逐月展開，二分搜尋月首
+
+交節時刻與農曆月表由 `python bazi_calendar.py generate` 以 lunar_python 產生至 bazi_calendar_data.py，
+並以 `python bazi_calendar.py verify` 對 1900 ~ 2026 的每一個日期與時辰逐一比對 lunar_python。
+
+    python bazi_calendar.py generate [--first 1899] [--last 2050]
+    python bazi_calendar.py verify [--first 1900] [--last 2026] [--workers N]
+    python bazi_calendar.py bench
+"""
+import argparse
+import bisect
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+from bazi_calendar_data import FIRST_JIE_YEAR, FIRST_LUNAR_NEW_YEAR, FIRST_LUNAR_YEAR, JIE_SECONDS, LUNAR_YEAR_INFO
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+
+# 每年 12 個「節」(與 lunar_python 的名稱一致)；月支依序為丑、寅 ... 子
+JIE_NAMES = ("小寒", "立春", "惊蛰", "清明", "立夏", "芒种", "小暑", "立秋", "白露", "寒露", "立冬", "大雪")
+
+# 農曆字表 (與 lunar_python 輸出字串一致)
+LUNAR_MONTH_CN = ("", "正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "冬", "腊")
+LUNAR_DAY_CN = (
+    "", "初一", "初二", "初三", "初四", "初五", "初六", "初七", "初八", "初九", "初十",
+    "十一", "十二", "十三", "十四", "十五", "十六", "十七", "十八", "十九", "二十",
+    "廿一", "廿二", "廿三", "廿四", "廿五", "廿六", "廿七", "廿八", "廿九", "三十"
+)
+ZODIAC = ("鼠", "牛", "虎", "兔", "龙", "蛇", "马", "羊", "猴", "鸡", "狗", "猪")
+
+# 公曆序數 (date.toordinal) 轉儒略日數
+JDN_OFFSET = 1721425
+DAY_SECONDS = 86400
+# 1900 年立春所在的寅月為戊寅 (干支序 14)，此後每過一個節干支序加一
+MONTH_GZ_1900 = 14 - 1
+
+
+def _build_jie():
+    """ 節氣表展開為自 FIRST_JIE_YEAR 元旦起算的秒數 (遞增) """
+    base = datetime.date(FIRST_JIE_YEAR, 1, 1).toordinal()
+    out = []
+    for i, row in enumerate(JIE_SECONDS):
+        year_start = (datetime.date(FIRST_JIE_YEAR + i, 1, 1).toordinal() - base) * DAY_SECONDS
+        out.extend(year_start + s for s in row)
+    return base, tuple(out)
+
+def _build_lunar_months():
+    """
+    農曆月表展開為 (月首公曆序數, 農曆年, 月份 (閏月為負)) 三個平行 tuple。
+    LUNAR_YEAR_INFO 每年一個整數：bit 0~3 閏月月份 (0 = 無閏月)、bit 4 閏月為大月、
+    bit 5 ~ 16 正月 ~ 腊月為大月 (30 日)
+    """
+    starts, years, months = [], [], []
+    first = FIRST_LUNAR_NEW_YEAR.toordinal()
+    for i, info in enumerate(LUNAR_YEAR_INFO):
+        leap = info & 0xF
+        for m in range(1, 13):
+            for month, big in ((m, info >> (4 + m) & 1),) + (((-m, info >> 4 & 1),) if m == leap else ()):
+                starts.append(first)
+                years.append(FIRST_LUNAR_YEAR + i)
+                months.append(month)
+                first += 30 if big else 29
+    starts.append(first)  # 表尾 (下一個正月初一)
+    return tuple(starts), tuple(years), tuple(months)
+
+JIE_BASE, JIE_TIMES = _build_jie()
+LICHUN_TIMES = JIE_TIMES[1::12]
+# 批次版本 (pillar_index_arrays) 用的同一份表
+JIE_ARRAY = np.array(JIE_TIMES, dtype=np.int64)
+LICHUN_ARRAY = np.array(LICHUN_TIMES, dtype=np.int64)
+LUNAR_MONTH_STARTS, LUNAR_MONTH_YEARS, LUNAR_MONTH_NUMBERS = _build_lunar_months()
+
+# 可換算的西元年範圍 (含)：1 月初需要前一年的大雪，農曆月表自 FIRST_LUNAR_YEAR 正月起
+FIRST_YEAR = FIRST_JIE_YEAR + 1
+LAST_YEAR = FIRST_JIE_YEAR + len(JIE_SECONDS) - 1
+
+
+def in_range(year, month, day):
+    return FIRST_YEAR <= year <= LAST_YEAR
+
+def ganzhi(index):
+    """ 六十甲子序號 (甲子 = 0) → 干支兩字 """
+    return STEMS[index % 10] + BRANCHES[index % 12]
+
+def _seconds(year, month, day, hour, minute):
+    """ 北京時間 → 自 FIRST_JIE_YEAR 元旦起算的秒數 (與 JIE_TIMES 同基準) """
+    return (datetime.date(year, month, day).toordinal() - JIE_BASE) * DAY_SECONDS + hour * 3600 + minute * 60
+
+def pillar_indexes(year, month, day, hour, minute=0, term_offset=0):
+    """
+    四柱的六十甲子序號 (年, 月, 日, 時)。年份超出節氣表範圍時拋出 ValueError。
+    term_offset: 北京時間 - 輸入時間 (分鐘)；輸入為當地時間或真太陽時，年柱、月柱仍以北京時間比對交節時刻
+    """
+    if not FIRST_YEAR <= year <= LAST_YEAR:
+        raise ValueError(f"year out of calendar range: {year}")
+    ordinal = datetime.date(year, month, day).toordinal()
+    t = _seconds(year, month, day, hour, minute) + term_offset * 60
+    k = bisect.bisect_right(JIE_TIMES, t) - 1
+    year_gz = (FIRST_JIE_YEAR - 1 + bisect.bisect_right(LICHUN_TIMES, t) - 4) % 60
+    month_gz = (k - 12 * (1900 - FIRST_JIE_YEAR) + MONTH_GZ_1900) % 60
+    day_gz = (ordinal + JDN_OFFSET - 11) % 60
+    zhi = (hour + 1) // 2 % 12
+    # 晚子時 (23 時) 時干以次日日干起五鼠遁
+    gan = ((day_gz + (hour == 23)) % 5 * 2 + zhi) % 10
+    time_gz = (6 * gan - 5 * zhi) % 60
+    return year_gz, month_gz, day_gz, time_gz
+
+def pillar_index_arrays(year, month, day, hours):
+    """
+    同一天多個時刻的四柱序號，一次以 searchsorted 比對交節時刻 (結果與逐一呼叫 pillar_indexes() 相同)。
+    hours: 0~23 的整數序列 (整點)
+    return: (年柱陣列, 月柱陣列, 日柱序號, 時柱陣列)；交節日的年柱、月柱會隨時刻改變
+    """
+    if not FIRST_YEAR <= year <= LAST_YEAR:
+        raise ValueError(f"year out of calendar range: {year}")
+    hours = np.asarray(hours, dtype=np.int64)
+    day_gz = (datetime.date(year, month, day).toordinal() + JDN_OFFSET - 11) % 60
+    t = _seconds(year, month, day, 0, 0) + hours * 3600
+    k = np.searchsorted(JIE_ARRAY, t, side="right") - 1
+    year_gz = (FIRST_JIE_YEAR - 1 + np.searchsorted(LICHUN_ARRAY, t, side="right") - 4) % 60
+    month_gz = (k - 12 * (1900 - FIRST_JIE_YEAR) + MONTH_GZ_1900) % 60
+    zhi = (hours + 1) // 2 % 12
+    gan = ((day_gz + (hours == 23)) % 5 * 2 + zhi) % 10
+    time_gz = (6 * gan - 5 * zhi) % 60
+    return year_gz, month_gz, day_gz, time_gz
+
+def pillars(year, month, day, hour, minute=0, term_offset=0):
+    """ 八字 8 字 tuple (年干, 年支, 月干, 月支, 日干, 日支, 時干, 時支) """
+    return tuple(c for index in pillar_indexes(year, month, day, hour, minute, term_offset) for c in ganzhi(index))
+
+def nearest_jie(year, month, day, hour, minute=0):
+    """
+    最接近的交節時刻 (北京時間)。
+    return: (節名, 交節 datetime, 輸入時間 - 交節時刻 (分鐘，正值 = 交節之後))
+    """
+    t = _seconds(year, month, day, hour, minute)
+    k = bisect.bisect_left(JIE_TIMES, t)
+    k = min((i for i in (k - 1, k) if 0 <= i < len(JIE_TIMES)), key=lambda i: abs(JIE_TIMES[i] - t))
+    instant = datetime.datetime.fromordinal(JIE_BASE) + datetime.timedelta(seconds=JIE_TIMES[k])
+    return JIE_NAMES[k % 12], instant, round((t - JIE_TIMES[k]) / 60)
+
+def lunar_date(year, month, day):
+    """
+    農曆日期。return: (農曆年, 月份 (閏月為負), 日)；年份超出範圍時拋出 ValueError。
+    """
+    if not FIRST_YEAR <= year <= LAST_YEAR:
+        raise ValueError(f"year out of calendar range: {year}")
+    ordinal = datetime.date(year, month, day).toordinal()
+    i = bisect.bisect_right(LUNAR_MONTH_STARTS, ordinal) - 1
+    return LUNAR_MONTH_YEARS[i], LUNAR_MONTH_NUMBERS[i], ordinal - LUNAR_MONTH_STARTS[i] + 1
+
+def lunar_month_cn(lunar_month):
+    return ("闰" if lunar_month < 0 else "") + LUNAR_MONTH_CN[abs(lunar_month)]
+
+def convert(year, month, day, hour, minute=0, term_offset=0):
+    """
+    四柱與農曆資訊，格式與 bazi_engine.convert_lunar() 相同；超出範圍時回傳 None。
+    return: (八字 8 字 tuple, lunar_year, lunar_month_cn, lunar_day_cn, zodiac)
+    """
+    if not in_range(year, month, day):
+        return None
+    lunar_year, lunar_month, lunar_day = lunar_date(year, month, day)
+    return (
+        pillars(year, month, day, hour, minute, term_offset), ganzhi(lunar_year - 4), lunar_month_cn(lunar_month),
+        LUNAR_DAY_CN[lunar_day], ZODIAC[(lunar_year - 4) % 12],
+    )
+
+
+# ==========================================
+# 產生與驗證 (需要 lunar_python)
+# ==========================================
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bazi_calendar_data.py")
+
+def generate(first_year=1899, last_year=2050, path=DATA_PATH):
+    """ 以 lunar_python 產生節氣表與農曆年大小月編碼，寫入 bazi_calendar_data.py """
+    from lunar_python import LunarYear, Solar
+
+    jie_rows = []
+    for year in range(first_year, last_year + 1):
+        table = Solar.fromYmd(year, 6, 1).getLunar().getJieQiTable()
+        year_start = datetime.datetime(year, 1, 1)
+        row = []
+        for name in JIE_NAMES:
+            s = table[name]
+            if s.getYear() != year:
+                raise ValueError(f"{name} of {year} falls in {s.getYear()}")
+            instant = datetime.datetime(s.getYear(), s.getMonth(), s.getDay(), s.getHour(), s.getMinute(), s.getSecond())
+            row.append(int((instant - year_start).total_seconds()))
+        jie_rows.append(tuple(row))
+
+    infos, first_new_year = [], None
+    for year in range(first_year, last_year + 1):
+        info = 0
+        for m in LunarYear.fromYear(year).getMonths():
+            if m.getYear() != year:
+                continue
+            if first_new_year is None:
+                jd = Solar.fromJulianDay(m.getFirstJulianDay())
+                first_new_year = datetime.date(jd.getYear(), jd.getMonth(), jd.getDay())
+            big = m.getDayCount() == 30
+            if m.getMonth() < 0:
+                info |= -m.getMonth() | big << 4
+            else:
+                info |= big << (4 + m.getMonth())
+        infos.append(info)
+
+    lines = [
+        "# ==========================================",
+        "# AliVerse 干支曆法資料 (由 `python bazi_calendar.py generate` 以 lunar_python 產生，請勿手動修改)",
+        "# ==========================================",
+        f"FIRST_JIE_YEAR = {first_year}",
+        "# 每年 12 個節 (小寒、立春 ... 大雪) 的交節時刻，距該年 1 月 1 日 00:00:00 的秒數 (北京時間)",
+        "JIE_SECONDS = (",
+        *(f"    ({', '.join(map(str, row))}),  # {first_year + i}" for i, row in enumerate(jie_rows)),
+        ")",
+        "",
+        f"FIRST_LUNAR_YEAR = {first_year}",
+        f"FIRST_LUNAR_NEW_YEAR = datetime.date({first_new_year.year}, {first_new_year.month}, {first_new_year.day})",
+        "# 每個農曆年一個整數：bit 0~3 閏月月份、bit 4 閏月為大月、bit 5 ~ 16 正月 ~ 腊月為大月",
+        "LUNAR_YEAR_INFO = (",
+        *(f"    {', '.join(f'0x{v:05x}' for v in infos[i:i + 10])},  # {first_year + i}" for i in range(0, len(infos), 10)),
+        ")",
+    ]
+    lines.insert(3, "import datetime\n")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def verify_year(year):
+    """ 逐日逐時辰比對 lunar_python (多行程驗證的工作單位)；回傳不一致的 (年, 月, 日, 時) 清單 """
+    from bazi_engine import HOUR_SLOT_HOURS, convert_lunar
+
+    mismatches = []
+    date = datetime.date(year, 1, 1)
+    while date.year == year:
+        for hour in sorted(set(HOUR_SLOT_HOURS) | {1, 23}):
+            key = (date.year, date.month, date.day, hour)
+            if convert(*key) != convert_lunar(*key):
+                mismatches.append(key)
+        date += datetime.timedelta(days=1)
+    return mismatches
+
+def verify(first_year=1900, last_year=2026, workers=None):
+    from multiprocessing import Pool
+
+    mismatches = []
+    with Pool(workers) as pool:
+        for result in pool.imap(verify_year, range(first_year, last_year + 1)):
+            mismatches.extend(result)
+    return mismatches
+
+def bench(n=20000):
+    """ 與 lunar_python 路徑比較單次換算耗時 (微秒) """
+    from bazi_engine import convert_lunar
+
+    samples = [(1900 + i * 7 % 127, 1 + i % 12, 1 + i % 28, i * 5 % 24) for i in range(n)]
+    results = {}
+    for name, fn in (("bazi_calendar.convert", convert), ("lunar_python", convert_lunar)):
+        count = n if name == "bazi_calendar.convert" else n // 20
+        start = time.perf_counter()
+        for key in samples[:count]:
+            fn(*key)
+        results[name] = (time.perf_counter() - start) / count * 1e6
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AliVerse 干支曆法核心")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_gen = sub.add_parser("generate", help="以 lunar_python 產生節氣與農曆月表")
+    p_gen.add_argument("--first", type=int, default=1899)
+    p_gen.add_argument("--last", type=int, default=2050)
+    p_verify = sub.add_parser("verify", help="逐日逐時辰比對 lunar_python")
+    p_verify.add_argument("--first", type=int, default=1900)
+    p_verify.add_argument("--last", type=int, default=2026)
+    p_verify.add_argument("--workers", type=int, default=None)
+    sub.add_parser("bench", help="與 lunar_python 比較換算耗時")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        generate(args.first, args.last)
+        print(f"{args.last - args.first + 1} years -> {DATA_PATH}", file=sys.stderr)
+        return 0
+    if args.command == "bench":
+        for name, us in bench().items():
+            print(f"{name:24s}{us:10.2f} us")
+        return 0
+    start = time.time()
+    mismatches = verify(args.first, args.last, args.workers)
+    print(f"{args.first}-{args.last}: {len(mismatches)} mismatches ({time.time() - start:.0f}s)")
+    for key in mismatches[:20]:
+        print("  ", key)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# ==========================================
+# AliVerse 干支曆法資料 (由 `python bazi_calendar.py generate` 以 lunar_python 產生，請勿手動修改)
+# ==========================================
+import datetime
+
+FIRST_JIE_YEAR = 1899
+# 每年 12 個節 (小寒、立春 ... 大雪) 的交節時刻，距該年 1 月 1 日 00:00:00 的秒數 (北京時間)
+JIE_SECONDS = (
+    (418647, 2966816, 5539091, 8150929, 10807828, 13503158, 16219287, 18932373, 21619438, 24265182, 26866009, 29430273),  # 1899
+    (439437, 2987491, 5559712, 8171561, 10828512, 13523935, 16240208, 18953434, 21640598, 24286389, 26887184, 29451350),  # 1900
+    (460403, 3008392, 5580653, 8192661, 10849824, 13545387, 16261654, 18974766, 21661815, 24307588, 26908469, 29472757),  # 1901
+    (481893, 3029890, 5602052, 8213846, 10870728, 13565987, 16281979, 18994936, 21681985, 24327910, 26929066, 29493661),  # 1902
+    (503023, 3051077, 5623132, 8234753, 10891522, 13586827, 16302996, 19016150, 21703341, 24349304, 26950403, 29514919),  # 1903
+    (524222, 3072247, 5644299, 8255931, 10912714, 13608058, 16324301, 19037511, 21724678, 24370534, 26971498, 29535920),  # 1904
+    (458826, 3006949, 5579136, 8190868, 10847644, 13542813, 16258799, 18971817, 21658906, 24304776, 26905786, 29470247),  # 1905
+    (479607, 3027834, 5600166, 8212036, 10868909, 13564134, 16280116, 18993094, 21680172, 24326093, 26927214, 29491765),  # 1906
+    (501085, 3049129, 5621225, 8232887, 10889615, 13584776, 16300750, 19013758, 21700922, 24346962, 26948177, 29512766),  # 1907
+    (522067, 3070033, 5642014, 8253586, 10910300, 13605543, 16321680, 19034802, 21721936, 24367851, 26968921, 29533417),  # 1908
+    (456313, 3004351, 5576447, 8188165, 10845050, 13540436, 16256637, 18969748, 21656795, 24302588, 26903583, 29468089),  # 1909
+    (477477, 3025642, 5597790, 8209375, 10865960, 13560980, 16276862, 18989828, 21676930, 24322865, 26924003, 29488613),  # 1910
+    (498052, 3046216, 5618330, 8229872, 10886418, 13581472, 16297495, 19010665, 21697996, 24344096, 26945220, 29509654),  # 1911
+    (518849, 3066811, 5638859, 8250495, 10907223, 13602449, 16318602, 19031830, 21719139, 24365202, 26966318, 29530733),  # 1912
+    (453474, 3001358, 5573338, 8184951, 10841679, 13536804, 16252732, 18965747, 21652944, 24299020, 26900262, 29464861),  # 1913
+    (474171, 3022156, 5594148, 8205710, 10862403, 13557596, 16273632, 18986711, 21673946, 24320087, 26921461, 29486225),  # 1914
+    (495616, 3043526, 5615296, 8226555, 10882964, 13578007, 16294065, 19007261, 21694625, 24340852, 26942258, 29507033),  # 1915
+    (516467, 3064438, 5636241, 8247469, 10903785, 13598739, 16314813, 19028095, 21715499, 24361671, 26962935, 29527569),  # 1916
+    (450567, 2998652, 5570688, 8182194, 10838742, 13533790, 16249813, 18963007, 21650361, 24296528, 26897814, 29462459),  # 1917
+    (471863, 3019985, 5592055, 8203512, 10859891, 13554657, 16270327, 18983244, 21670526, 24316817, 26918332, 29483189),  # 1918
+    (492688, 3040763, 5612729, 8224124, 10880520, 13575396, 16291230, 19004281, 21691657, 24338000, 26939490, 29504267),  # 1919
+    (513647, 3061586, 5633462, 8244894, 10901477, 13596622, 16312716, 19025894, 21713192, 24359348, 26960694, 29525416),  # 1920
+    (448420, 2996412, 5568309, 8179721, 10836257, 13531285, 16247194, 18960205, 21647379, 24293436, 26894730, 29459485),  # 1921
+    (469015, 3017184, 5589229, 8200680, 10857170, 13552215, 16268245, 18981428, 21668779, 24314965, 26916312, 29481038),  # 1922
+    (490440, 3038417, 5610266, 8221547, 10877894, 13572858, 16288931, 19002269, 21689829, 24336202, 26937620, 29502273),  # 1923
+    (511533, 3059372, 5631132, 8242387, 10898739, 13593691, 16309764, 19023134, 21710730, 24357129, 26958551, 29523179),  # 1924
+    (445994, 2993805, 5565590, 8176947, 10833471, 13528582, 16244694, 18958025, 21645601, 24292042, 26893573, 29458337),  # 1925
+    (467657, 3015496, 5587181, 8198297, 10854500, 13549297, 16265136, 18978252, 21665751, 24312291, 26914062, 29479119),  # 1926
+    (488677, 3036602, 5608216, 8219166, 10875184, 13569885, 16285795, 18999083, 21686725, 24333305, 26935014, 29499978),  # 1927
+    (509471, 3057382, 5629034, 8240071, 10896209, 13591029, 16307055, 19020450, 21708105, 24354591, 26956170, 29521036),  # 1928
+    (444121, 2992123, 5563917, 8175073, 10831220, 13525847, 16241498, 18954521, 21641974, 24288422, 26890047, 29454984),  # 1929
+    (464552, 3012667, 5584593, 8195842, 10852019, 13546682, 16262380, 18975418, 21662902, 24309448, 26911212, 29476237),  # 1930
+    (485735, 3033638, 5605326, 8216426, 10872575, 13567305, 16283134, 18996292, 21683835, 24330411, 26932191, 29497215),  # 1931
+    (506703, 3054560, 5626159, 8237179, 10893308, 13588063, 16303935, 19017108, 21704572, 24350978, 26952580, 29517502),  # 1932
+    (440600, 2988556, 5560284, 8171429, 10827705, 13522639, 16238657, 18951930, 21639446, 24285833, 26887378, 29452265),  # 1933
+    (461787, 3009817, 5581580, 8192619, 10848644, 13543281, 16259065, 18972218, 21659768, 24306299, 26908001, 29472991),  # 1934
+    (482539, 3030521, 5602210, 8213181, 10869122, 13563695, 16279532, 18992868, 21680644, 24327340, 26929051, 29493890),  # 1935
+    (503197, 3050956, 5622546, 8233604, 10889790, 13584640, 16300698, 19014190, 21702035, 24348745, 26950478, 29515333),  # 1936
+    (438224, 2985933, 5557464, 8168482, 10824635, 13519368, 16235155, 18948320, 21635963, 24282654, 26884515, 29449576),  # 1937
+    (459068, 3006898, 5578426, 8189319, 10845309, 13539997, 16255881, 18969161, 21656888, 24303684, 26905699, 29470918),  # 1938
+    (480471, 3028226, 5599571, 8210244, 10866062, 13560698, 16276700, 18990207, 21678121, 24324996, 26927010, 29492220),  # 1939
+    (501820, 3049652, 5621038, 8231674, 10887376, 13581842, 16297681, 19011089, 21698954, 24345743, 26947606, 29512671),  # 1940
+    (435834, 2983784, 5555404, 8166295, 10822190, 13516752, 16232584, 18945952, 21633828, 24280692, 26882643, 29447758),  # 1941
+    (457338, 3005314, 5576960, 8187830, 10843610, 13537951, 16253506, 18966618, 21654367, 24301302, 26903467, 29468807),  # 1942
+    (478490, 3026404, 5597910, 8208670, 10864401, 13558737, 16274330, 18987510, 21675308, 24322229, 26924323, 29489570),  # 1943
+    (499155, 3046975, 5618426, 8229238, 10885183, 13579853, 16295762, 19009131, 21696932, 24343723, 26945679, 29510858),  # 1944
+    (434066, 2981962, 5553479, 8164306, 10820195, 13514724, 16230406, 18943503, 21631087, 24277747, 26879651, 29444859),  # 1945
+    (454579, 3002633, 5574278, 8185112, 10840889, 13535322, 16251048, 18964295, 21652045, 24298847, 26900829, 29466011),  # 1946
+    (475580, 3023421, 5594876, 8205608, 10861377, 13555872, 16271748, 18985251, 21673263, 24320237, 26922262, 29487371),  # 1947
+    (496813, 3044520, 5615873, 8226560, 10882333, 13576819, 16292608, 19005977, 21693899, 24340816, 26942792, 29507857),  # 1948
+    (430868, 2978569, 5549956, 8160716, 10816594, 13511209, 16227095, 18940496, 21628449, 24275462, 26877586, 29442804),  # 1949
+    (452323, 3000046, 5571326, 8181867, 10837481, 13531860, 16247597, 18960911, 21648819, 24295899, 26898223, 29463700),  # 1950
+    (473422, 3021206, 5592400, 8202758, 10858155, 13552352, 16268031, 18981446, 21669490, 24316583, 26918796, 29484138),  # 1951
+    (493785, 3041574, 5612838, 8223302, 10878841, 13573218, 16289078, 19002657, 21690822, 24337945, 26940094, 29505333),  # 1952
+    (428522, 2976353, 5547746, 8158356, 10813938, 13508164, 16223694, 18936875, 21624763, 24271825, 26874057, 29439419),  # 1953
+    (449117, 2997041, 5568512, 8179150, 10834690, 13528849, 16244350, 18957544, 21645471, 24292638, 26895034, 29460509),  # 1954
+    (470152, 3017856, 5589057, 8199524, 10855078, 13549405, 16265152, 18978602, 21666706, 24313928, 26916309, 29481766),  # 1955
+    (491417, 3039115, 5610267, 8220669, 10876198, 13570547, 16286279, 18999612, 21687536, 24334553, 26936754, 29502126),  # 1956
+    (425425, 2973277, 5544607, 8155129, 10810702, 13505083, 16220889, 18934323, 21622331, 24269398, 26871601, 29436956),  # 1957
+    (446660, 2994551, 5565892, 8176341, 10831750, 13525931, 16241605, 18955030, 21643129, 24290348, 26892713, 29458175),  # 1958
+    (467898, 3015730, 5586995, 8197382, 10852722, 13546803, 16262392, 18975844, 21664074, 24311388, 26913723, 29479036),  # 1959
+    (488547, 3036189, 5607366, 8217813, 10873353, 13567714, 16283559, 18997184, 21685522, 24332919, 26935321, 29500664),  # 1960
+    (423756, 2971346, 5542479, 8152927, 10808476, 13502760, 16218395, 18931699, 21619752, 24267056, 26869571, 29435154),  # 1961
+    (444896, 2992640, 5563769, 8174054, 10829368, 13523475, 16239065, 18952420, 21640520, 24287873, 26890494, 29456199),  # 1962
+    (465986, 3013664, 5584629, 8194719, 10849917, 13544066, 16259857, 18973524, 21661910, 24309374, 26911939, 29477556),  # 1963
+    (487340, 3035095, 5606159, 8216300, 10871461, 13565503, 16281127, 18994569, 21682766, 24330090, 26932506, 29497983),  # 1964
+    (421317, 2969166, 5540438, 8150803, 10806092, 13500126, 16215682, 18929076, 21617270, 24264667, 26867192, 29432732),  # 1965
+    (442460, 2990268, 5561481, 8171789, 10827026, 13520977, 16236419, 18949736, 21637921, 24285403, 26888115, 29453865),  # 1966
+    (463699, 3011449, 5582513, 8192681, 10847846, 13541778, 16257199, 18970491, 21658662, 24306071, 26908643, 29474248),  # 1967
+    (483970, 3031643, 5602665, 8212853, 10868147, 13562345, 16278097, 18991631, 21679884, 24327263, 26929757, 29495295),  # 1968
+    (418608, 2966332, 5537434, 8147691, 10802987, 13497089, 16212691, 18926046, 21614125, 24261400, 26863880, 29429478),  # 1969
+    (439299, 2987142, 5558307, 8168504, 10823627, 13517533, 16233031, 18946446, 21634673, 24282092, 26884663, 29450239),  # 1970
+    (459906, 3007525, 5578484, 8188560, 10843688, 13537731, 16253467, 18967212, 21655812, 24303514, 26906197, 29471742),  # 1971
+    (481310, 3028813, 5599684, 8209730, 10864870, 13558919, 16274573, 18988109, 21676506, 24324105, 26926763, 29492322),  # 1972
+    (415519, 2963052, 5533956, 8144033, 10799183, 13493210, 16208841, 18922368, 21610764, 24258435, 26861258, 29427023),  # 1973
+    (436795, 2984405, 5555226, 8165100, 10820032, 13513899, 16229466, 18943030, 21631504, 24279279, 26882278, 29448277),  # 1974
+    (458250, 3005952, 5576747, 8186490, 10841231, 13534921, 16250364, 18963893, 21652397, 24300124, 26902956, 29468769),  # 1975
+    (478642, 3026368, 5597286, 8207187, 10862064, 13555873, 16271450, 18985101, 21673692, 24321483, 26924314, 29490056),  # 1976
+    (413463, 2961205, 5532249, 8142344, 10797360, 13491121, 16206472, 18919814, 21608141, 24255836, 26858749, 29424649),  # 1977
+    (434592, 2982417, 5553491, 8163560, 10818512, 13512185, 16227417, 18940660, 21628944, 24276654, 26879641, 29445601),  # 1978
+    (455493, 3003138, 5573978, 8183877, 10838830, 13532711, 16248277, 18961853, 21650385, 24298202, 26901167, 29467068),  # 1979
+    (476933, 3024568, 5595389, 8205282, 10860268, 13554224, 16269836, 18983310, 21671607, 24319154, 26921893, 29487675),  # 1980
+    (411158, 2958923, 5529907, 8139902, 10794887, 13488759, 16204312, 18917829, 21606193, 24253772, 26856509, 29422275),  # 1981
+    (432155, 2979928, 5550874, 8160761, 10815599, 13509353, 16224875, 18938505, 21627103, 24274929, 26877846, 29443685),  # 1982
+    (453522, 3001182, 5572032, 8181863, 10836651, 13530342, 16245793, 18959377, 21648003, 24295864, 26898732, 29464420),  # 1983
+    (474051, 3021524, 5592279, 8202140, 10857057, 13550917, 16266546, 18980273, 21668990, 24316955, 26919932, 29485683),  # 1984
+    (408905, 2956307, 5526981, 8136815, 10791752, 13485596, 16201115, 18914656, 21603181, 24251073, 26854169, 29420181),  # 1985
+    (430082, 2977662, 5548328, 8157967, 10812636, 13506263, 16221645, 18935136, 21623677, 24271605, 26874769, 29440856),  # 1986
+    (450780, 2998300, 5568817, 8178248, 10832735, 13526338, 16241919, 18955753, 21644647, 24292780, 26895940, 29461932),  # 1987
+    (471810, 3019369, 5589992, 8199544, 10854103, 13547693, 16263174, 18976815, 21665491, 24313470, 26916535, 29482468),  # 1988
+    (405955, 2953629, 5524448, 8134194, 10788835, 13482313, 16197565, 18911032, 21599633, 24247639, 26850812, 29416857),  # 1989
+    (426794, 2974440, 5545158, 8154776, 10809326, 13502778, 16218028, 18931532, 21620248, 24268429, 26871810, 29438050),  # 1990
+    (448087, 2995704, 5566335, 8175882, 10830413, 13523897, 16239179, 18952635, 21641241, 24289267, 26892470, 29458560),  # 1991
+    (468511, 3016097, 5586728, 8196308, 10850920, 13544539, 16260015, 18973644, 21662300, 24310289, 26913422, 29479452),  # 1992
+    (402991, 2950629, 5521352, 8131031, 10785703, 13479313, 16194722, 18908278, 21596867, 24244802, 26847933, 29414029),  # 1993
+    (424087, 2971856, 5542662, 8152308, 10806845, 13500292, 16215562, 18929062, 21617707, 24265745, 26868936, 29434973),  # 1994
+    (444845, 2992371, 5562964, 8172486, 10827003, 13520548, 16236060, 18949904, 21638914, 24287232, 26890535, 29456535),  # 1995
+    (466287, 3013674, 5584179, 8193721, 10848362, 13542047, 16257600, 18971329, 21660145, 24308322, 26911593, 29477640),  # 1996
+    (401068, 2948517, 5519047, 8128576, 10783166, 13476751, 16192163, 18905778, 21594529, 24242710, 26846078, 29412292),  # 1997
+    (422289, 2969812, 5540235, 8149497, 10803790, 13497202, 16212625, 18926390, 21615355, 24263745, 26867303, 29433695),  # 1998
+    (443829, 2991423, 5561862, 8171077, 10825260, 13518547, 16233899, 18947646, 21636599, 24284901, 26888271, 29454447),  # 1999
+    (464442, 3012024, 5582560, 8191918, 10846210, 13539514, 16254836, 18968579, 21657550, 24305893, 26909284, 29475422),  # 2000
+    (398956, 2946529, 5517148, 8126662, 10781090, 13474415, 16189602, 18903141, 21591971, 24240301, 26843812, 29410133),  # 2001
+    (420210, 2967845, 5538453, 8147897, 10802238, 13495486, 16210571, 18923958, 21612662, 24260958, 26864509, 29430854),  # 2002
+    (440863, 2988320, 5558692, 8167949, 10822229, 13515583, 16230939, 18944658, 21633614, 24282033, 26885591, 29451909),  # 2003
+    (461913, 3009373, 5579738, 8188999, 10843348, 13536826, 16252276, 18965976, 21654775, 24302958, 26906313, 29472537),  # 2004
+    (396179, 2943782, 5514310, 8123657, 10777970, 13471312, 16186594, 18900201, 21589000, 24237198, 26840546, 29406761),  # 2005
+    (416817, 2964436, 5534920, 8144131, 10798239, 13491419, 16206687, 18920447, 21609541, 24258083, 26861691, 29428009),  # 2006
+    (438010, 2985492, 5555879, 8165079, 10819224, 13512424, 16227704, 18941475, 21630569, 24279089, 26882641, 29448845),  # 2007
+    (458690, 3006024, 5576328, 8185552, 10839806, 13533104, 16248409, 18962170, 21651248, 24299798, 26903434, 29469738),  # 2008
+    (393248, 2940588, 5510851, 8120027, 10774250, 13467544, 16182809, 18896469, 21585457, 24234004, 26837776, 29404334),  # 2009
+    (414527, 2962071, 5532382, 8141430, 10795442, 13488564, 16203743, 18917347, 21606281, 24254789, 26858550, 29425103),  # 2010
+    (435277, 2982776, 5552999, 8161919, 10815793, 13508840, 16224120, 18938006, 21627254, 24275946, 26879696, 29446140),  # 2011
+    (456235, 3003744, 5574063, 8183137, 10837181, 13530354, 16245643, 18959433, 21648541, 24297103, 26900757, 29467136),  # 2012
+    (390818, 2938405, 5508891, 8118147, 10772290, 13465399, 16180476, 18894022, 21582976, 24231510, 26835233, 29401712),  # 2013
+    (411851, 2959396, 5529736, 8138800, 10792766, 13485782, 16200886, 18914548, 21603685, 24252450, 26856400, 29423045),  # 2014
+    (433232, 2980707, 5550940, 8159947, 10813956, 13507090, 16222335, 18936084, 21625174, 24273769, 26877517, 29444001),  # 2015
+    (454103, 3001563, 5571813, 8180851, 10834913, 13528110, 16243401, 18957181, 21646265, 24294803, 26898461, 29464867),  # 2016
+    (388545, 2936044, 5506363, 8115439, 10769462, 13462596, 16177842, 18891601, 21580718, 24229329, 26833069, 29399559),  # 2017
+    (409725, 2957310, 5527691, 8136767, 10790722, 13483749, 16198913, 18912640, 21601782, 24250483, 26854305, 29420755),  # 2018
+    (430738, 2978061, 5548186, 8157088, 10810968, 13503986, 16219233, 18933185, 21622614, 24271540, 26875464, 29441910),  # 2019
+    (451806, 2998999, 5569012, 8177889, 10831883, 13525106, 16240468, 18954371, 21643682, 24292516, 26896435, 29462970),  # 2020
+    (386606, 2933928, 5504022, 8112907, 10766831, 13459926, 16175129, 18888838, 21577976, 24226743, 26830727, 29397426),  # 2021
+    (407644, 2955047, 5525025, 8133614, 10787157, 13479949, 16195081, 18908948, 21598338, 24247348, 26851530, 29418376),  # 2022
+    (428691, 2976153, 5546174, 8154784, 10808326, 13501101, 16216241, 18930173, 21619603, 24268534, 26872535, 29439175),  # 2023
+    (449362, 2996827, 5566965, 8175737, 10829405, 13522194, 16237203, 18950956, 21640280, 24289197, 26893204, 29459823),  # 2024
+    (383567, 2931028, 5501238, 8110116, 10763833, 13456592, 16171499, 18885095, 21574317, 24223273, 26827444, 29394277),  # 2025
+    (404590, 2952128, 5522340, 8131200, 10784924, 13477701, 16192617, 18906163, 21595276, 24244157, 26848325, 29415152),  # 2026
+    (425398, 2972778, 5542773, 8151451, 10805112, 13497948, 16213023, 18926806, 21616108, 24265026, 26869115, 29435861),  # 2027
+    (446079, 2993473, 5563487, 8172186, 10825932, 13518960, 16234218, 18948071, 21637330, 24286111, 26890036, 29456681),  # 2028
+    (380515, 2928047, 5498257, 8107104, 10760866, 13453798, 16168943, 18882704, 21571914, 24220688, 26824606, 29391228),  # 2029
+    (401434, 2948908, 5518998, 8127661, 10781178, 13473870, 16188929, 18902840, 21592370, 24241517, 26845724, 29412457),  # 2030
+    (422589, 2969899, 5539863, 8148504, 10802112, 13494942, 16210131, 18924176, 21613811, 24262979, 26867140, 29433773),  # 2031
+    (443767, 2990939, 5560815, 8169456, 10823152, 13516079, 16231254, 18945164, 21634675, 24283825, 26888057, 29454800),  # 2032
+    (378487, 2925696, 5495542, 8104089, 10757627, 13450407, 16165497, 18879346, 21568822, 24218037, 26822465, 29389496),  # 2033
+    (399871, 2947270, 5517144, 8125575, 10778950, 13471601, 16186659, 18900547, 21590039, 24239227, 26843620, 29410609),  # 2034
+    (420943, 2968295, 5538099, 8146432, 10799697, 13492250, 16207271, 18921261, 21610950, 24260262, 26864632, 29431532),  # 2035
+    (441812, 2989197, 5559111, 8167577, 10820964, 13513621, 16228654, 18942537, 21632100, 24281340, 26885681, 29452563),  # 2036
+    (376445, 2923899, 5493973, 8102644, 10756169, 13448812, 16163709, 18877383, 21566735, 24215871, 26820246, 29387239),  # 2037
+    (397609, 2945028, 5514930, 8123369, 10776673, 13469139, 16183953, 18897680, 21587178, 24236496, 26841053, 29408184),  # 2038
+    (418601, 2965976, 5535784, 8144148, 10797491, 13490131, 16205171, 18919087, 21608644, 24257838, 26862175, 29429106),  # 2039
+    (439419, 2986796, 5556676, 8165133, 10818563, 13511284, 16226356, 18940205, 21629648, 24278734, 26882960, 29449805),  # 2040
+    (373690, 2921111, 5491072, 8099558, 10752873, 13445388, 16160311, 18874123, 21563616, 24212820, 26817188, 29384150),  # 2041
+    (394510, 2941973, 5511950, 8120441, 10773773, 13466295, 16181238, 18895130, 21584731, 24234037, 26838461, 29405356),  # 2042
+    (415523, 2962728, 5532468, 8140818, 10794127, 13486691, 16201673, 18915648, 21605413, 24254865, 26859352, 29426244),  # 2043
+    (436354, 2983461, 5553099, 8161389, 10814732, 13507444, 16222559, 18936520, 21626195, 24275602, 26880123, 29447116),  # 2044
+    (370955, 2918182, 5487906, 8096242, 10749575, 13442225, 16157288, 18871183, 21560731, 24210043, 26814595, 29381738),  # 2045
+    (392164, 2939469, 5509072, 8117103, 10770046, 13462339, 16177221, 18891204, 21581003, 24230550, 26835255, 29402482),  # 2046
+    (412947, 2960285, 5529922, 8137966, 10790917, 13483257, 16198234, 18912357, 21602295, 24251866, 26856445, 29423466),  # 2047
+    (433769, 2981084, 5550854, 8159124, 10812276, 13504704, 16219614, 18933538, 21623292, 24272810, 26877416, 29444455),  # 2048
+    (368328, 2915607, 5485381, 8093669, 10746764, 13439030, 16153735, 18867481, 21557138, 24206707, 26811510, 29378804),  # 2049
+    (389280, 2936634, 5506370, 8114601, 10767726, 13460097, 16174920, 18888757, 21578447, 24228017, 26832827, 29400114),  # 2050
+)
+
+FIRST_LUNAR_YEAR = 1899
+FIRST_LUNAR_NEW_YEAR = datetime.date(1899, 2, 10)
+# 每個農曆年一個整數：bit 0~3 閏月月份、bit 4 閏月為大月、bit 5 ~ 16 正月 ~ 腊月為大月
+LUNAR_YEAR_INFO = (
+    0x15aa0, 0x17a48, 0x0ea40, 0x1d4a0, 0x16545, 0x0c960, 0x15360, 0x154d4, 0x0ad40, 0x16b20,  # 1899
+    0x17542, 0x0ea40, 0x1b4a6, 0x164a0, 0x14960, 0x14975, 0x055a0, 0x0ad60, 0x0b6a2, 0x1b520,  # 1909
+    0x1d257, 0x1d240, 0x1a4a0, 0x1a5a5, 0x14ac0, 0x056c0, 0x15ab4, 0x0da80, 0x1d520, 0x1e942,  # 1919
+    0x1d240, 0x0d4c6, 0x0a560, 0x14ae0, 0x12ad5, 0x16b40, 0x0da80, 0x0ec33, 0x0e920, 0x16277,  # 1929
+    0x15260, 0x0a560, 0x0a376, 0x155a0, 0x0ad40, 0x1b4b4, 0x17480, 0x16920, 0x1a962, 0x152a0,  # 1939
+    0x155a7, 0x0a6c0, 0x155a0, 0x15955, 0x0b640, 0x1b4a0, 0x1d453, 0x1a940, 0x0b2a8, 0x152e0,  # 1949
+    0x0aac0, 0x0aea6, 0x15aa0, 0x0da40, 0x0eaa4, 0x1d4a0, 0x0c940, 0x0c9e3, 0x15360, 0x15b47,  # 1959
+    0x0ad40, 0x16d20, 0x17645, 0x16a40, 0x164a0, 0x16564, 0x14960, 0x15568, 0x055a0, 0x0ada0,  # 1969
+    0x0b536, 0x1b520, 0x1b240, 0x1d2a4, 0x1a4a0, 0x1c9aa, 0x14ac0, 0x056c0, 0x05ea6, 0x0daa0,  # 1979
+    0x1d520, 0x1ea45, 0x1d240, 0x1a4c0, 0x0a5c3, 0x14ae0, 0x15ac8, 0x06b40, 0x0daa0, 0x16d25,  # 1989
+    0x0e920, 0x0d260, 0x15364, 0x0a560, 0x14b60, 0x155c2, 0x0ad40, 0x1baa7, 0x17480, 0x16920,  # 1999
+    0x1aa65, 0x152a0, 0x0a5a0, 0x0aba4, 0x156a0, 0x17549, 0x0ba40, 0x1b4a0, 0x1d156, 0x1a940,  # 2009
+    0x192a0, 0x153c4, 0x0aac0, 0x156a0, 0x15b42, 0x0da40, 0x0eca6, 0x0e4a0, 0x0c960, 0x0cae5,  # 2019
+    0x19560, 0x0ab40, 0x0adc3, 0x16d20, 0x1ea4b, 0x16a40, 0x164a0, 0x1a176, 0x14960, 0x09560,  # 2029
+    0x05765, 0x0b5a0, 0x16d40, 0x1b542, 0x1b240, 0x1d4a7, 0x1a4a0, 0x14aa0, 0x149b5, 0x096c0,  # 2039
+    0x0b6a0, 0x0da53,  # 2049
+)
@@ -0,0 +1,56 @@
+# ==========================================
+# AliVerse 五行能量圖表 (pandas / Altair)
+# ==========================================
+"""
+「五行能量庫存」的圓餅圖與長條圖。
+"""
+import altair as alt
+import pandas as pd
+
+from bazi_engine import COLOR_MAP, WUXING_MAP
+
+
+def count_wuxing(pillars):
+    """ 統計四柱八字的五行數量；pillars 為 ((天干, 地支), ...) """
+    counts = {"金": 0, "木": 0, "水": 0, "火": 0, "土": 0}
+    for gan, zhi in pillars:
+        for char in (gan, zhi):
+            wx = WUXING_MAP.get(char)
+            if wx in counts: counts[wx] += 1
+    return counts
+
+def build_wuxing_charts(pillars):
+    """
+    return: (chart_pie, chart_bar)
+    """
+    counts = count_wuxing(pillars)
+    total_count = sum(counts.values())
+
+    data = []
+    for wx, count in counts.items():
+        percentage = count / total_count if total_count > 0 else 0
+        label_text = f"{wx} {percentage:.0%}"
+        data.append({"五行": wx, "數量": count, "標籤": label_text, "color": COLOR_MAP[wx]})
+    df = pd.DataFrame(data)
+
+    base = alt.Chart(df).encode(theta=alt.Theta("數量", stack=True).sort("descending"))
+    pie = base.mark_arc(outerRadius=80).encode(
+        color=alt.Color("color", scale=None),
+        order=alt.Order("數量", sort="descending"),
+        tooltip=["五行", "數量", "標籤"]
+    )
+    text = base.mark_text(radius=110).encode(
+        text="標籤",
+        order=alt.Order("數量", sort="descending"),
+        color=alt.value("white")
+    )
+    chart_pie = (pie + text).properties(title="能量佔比 (Pie)")
+
+    chart_bar = alt.Chart(df).mark_bar().encode(
+        x=alt.X('五行', axis=alt.Axis(labelAngle=0, title="")),
+        y=alt.Y('數量', axis=alt.Axis(title="數量", titleAngle=0, titleAlign="right", titleY=-10)),
+        color=alt.Color('color', scale=None),
+        tooltip=["五行", "數量"]
+    ).properties(title="數量統計 (Bar)")
+
+    return chart_pie, chart_bar
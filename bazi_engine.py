@@ -0,0 +1,595 @@
+# ==========================================
+# AliVerse 八字運算引擎 (無 Streamlit 相依)
+# ==========================================
+"""
+排盤、五行強弱評分、喜忌神判定與原廠車型推算。
+
+所有函式皆為純函式，可於 Streamlit 以外的環境 (批次、API、測試) 直接匯入使用。
+compute_chart() 以出生資料為鍵做有上限的 LRU 快取，同一位使用者的重跑只需一次字典查詢。
+"""
+import datetime
+import functools
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+import bazi_birthtime
+import bazi_calendar
+import bazi_iching
+
+# 快取上限：每筆約數 KB，4096 筆足以涵蓋熱門流量而不致佔用過多記憶體
+CHART_CACHE_SIZE = 4096
+
+# 預先排盤表 (由 `python bazi_table.py build` 產生)，檔案不存在時改用 lunar_python 即時換算
+CHART_TABLE_PATH = os.environ.get(
+    "ALIVERSE_CHART_TABLE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bazi_charts.bin")
+)
+
+# 啟動時辰選項 (與輸入區 selectbox 順序一致)
+HOUR_OPTIONS = (
+    "00:00 - 00:59 (早子)", "01:00 - 02:59 (丑)", "03:00 - 04:59 (寅)",
+    "05:00 - 06:59 (卯)", "07:00 - 08:59 (辰)", "09:00 - 10:59 (巳)",
+    "11:00 - 12:59 (午)", "13:00 - 14:59 (未)", "15:00 - 16:59 (申)",
+    "17:00 - 18:59 (酉)", "19:00 - 20:59 (戌)", "21:00 - 22:59 (亥)",
+    "23:00 - 23:59 (晚子)"
+)
+# 各時辰選項對應的排盤小時
+HOUR_SLOT_HOURS = (0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 22, 23)
+
+# 天干地支 (整數編碼即為字串索引)
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+
+PILLAR_TITLES = ("年柱 (根基)", "月柱 (事業)", "日柱 (本命)", "時柱 (晚年)")
+
+COLOR_MAP = {
+    "木": "#4CAF50", # 綠
+    "火": "#FF5252", # 紅
+    "土": "#FFC107", # 黃
+    "金": "#E0E0E0", # 白
+    "水": "#2196F3"  # 藍
+}
+
+WUXING_MAP = {
+    "甲": "木", "乙": "木", "丙": "火", "丁": "火", "戊": "土", "己": "土", "庚": "金", "辛": "金", "壬": "水", "癸": "水",
+    "子": "水", "丑": "土", "寅": "木", "卯": "木", "辰": "土", "巳": "火", "午": "火", "未": "土", "申": "金", "酉": "金", "戌": "土", "亥": "水"
+}
+PRODUCING_MAP = {"木": "火", "火": "土", "土": "金", "金": "水", "水": "木"}
+
+# 幸運燃料色名
+ELEMENT_COLOR_NAMES = {'木': '叢林綠', '火': '法拉利紅', '土': '大地棕', '金': '鈦金銀', '水': '深海藍'}
+
+ADVICE_2026_FIRE = "2026 丙午火年，對您來說是絕佳的「氮氣加速」機會！流年火氣正旺，剛好補足您的動力缺口。易經卦象建議：大膽超車，創業或投資皆有利。"
+ADVICE_2026_COOL = "2026 丙午火年，火氣過旺，容易導致引擎過熱（情緒急躁、發炎）。易經卦象建議：切換至「定速巡航」模式，多穿戴「水/金」能量（藍/白）來降溫平衡。"
+
+
+# ==========================================
+# 十神與藏干查表 (匯入時建表，單盤與批次共用)
+# ==========================================
+STEM_CODE = {c: i for i, c in enumerate(STEMS)}
+BRANCH_CODE = {c: i for i, c in enumerate(BRANCHES)}
+
+# 十神編碼 = 2 × (五行關係) + (陰陽相異)；五行關係依日主起算：同、生、剋、被剋、被生
+TEN_GODS = ("比肩", "劫財", "食神", "傷官", "偏財", "正財", "七殺", "正官", "偏印", "正印")
+# 天干五行序 (甲乙木、丙丁火、戊己土、庚辛金、壬癸水) 為 stem // 2
+TEN_GOD_CODES = np.array(
+    [[2 * ((t // 2 - d // 2) % 5) + (t % 2 != d % 2) for t in range(10)] for d in range(10)],
+    dtype=np.int8
+)
+TEN_GOD_NAMES = tuple(tuple(TEN_GODS[c] for c in row) for row in TEN_GOD_CODES.tolist())
+
+HIDDEN_STEMS = {
+    "子": ("癸",), "丑": ("己", "癸", "辛"), "寅": ("甲", "丙", "戊"), "卯": ("乙",),
+    "辰": ("戊", "乙", "癸"), "巳": ("丙", "庚", "戊"), "午": ("丁", "己"), "未": ("己", "丁", "乙"),
+    "申": ("庚", "壬", "戊"), "酉": ("辛",), "戌": ("戊", "辛", "丁"), "亥": ("壬", "甲")
+}
+# 藏干編碼表 (12 × 3)，不足三個以 -1 補齊
+HIDDEN_STEM_CODES = np.array(
+    [[STEM_CODE[s] for s in HIDDEN_STEMS[b]] + [-1] * (3 - len(HIDDEN_STEMS[b])) for b in BRANCHES],
+    dtype=np.int8
+)
+
+def get_ten_god(day_master, target_stem):
+    d, t = STEM_CODE.get(day_master), STEM_CODE.get(target_stem)
+    if d is None or t is None: return ""
+    return TEN_GOD_NAMES[d][t]
+
+def get_hidden_stems(branch):
+    return list(HIDDEN_STEMS.get(branch, ()))
+
+def ten_gods(day_stem, stems_array):
+    """
+    批次十神：day_stem 與 stems_array 皆為天干編碼 (可互相廣播的整數或 NumPy 陣列)。
+    回傳 TEN_GODS 編碼的 int8 陣列；stems_array 中的 -1 (如藏干補位) 對應結果亦為 -1。
+    """
+    day_stem = np.asarray(day_stem)
+    stems = np.asarray(stems_array)
+    codes = TEN_GOD_CODES[day_stem, np.where(stems < 0, 0, stems)]
+    return np.where(stems < 0, np.int8(-1), codes)
+
+def hidden_stems(branches_array):
+    """ 批次藏干：地支編碼陣列 → (..., 3) 天干編碼陣列，不足處為 -1 """
+    return HIDDEN_STEM_CODES[np.asarray(branches_array)]
+
+# ==========================================
+# [Logic] 全系統喜忌神同步判定邏輯 (含專家覆寫)
+# ==========================================
+def determine_fates_guide(day_master, month_idx):
+    """
+    根據日主與出生月，決定【喜用神】與【忌神】
+    expert_override: 針對特定格局 (如 Ali 的壬水酉月) 給予精準建議
+    return: (joyful_list, taboo_list, description)
+    """
+    joyful = []
+    taboo = []
+    reason = ""
+
+    # [Expert Override] 針對 Ali (壬水日主，秋天金旺)
+    if day_master == "水" and month_idx in [7, 8, 9, 10]:
+        joyful = ["火", "木"]
+        taboo = ["金", "水"]
+        reason = "格局金水過旺，能量急需釋放。喜用【火、木】，需要火來煉金成器（財星壞印），木來輸出才華（食傷洩秀）。忌【金、水】，引擎本體已過強，不需再加重負擔。"
+        return joyful, taboo, reason
+
+    if day_master == "水" and month_idx in [11, 12, 1]: # 冬天水
+        joyful = ["火", "木"]
+        taboo = ["水", "金"]
+        reason = "生於隆冬，水寒金冷。首重【火】來調候溫暖，喜【木】來順生。忌金水過旺導致結冰不動。"
+        return joyful, taboo, reason
+
+    # [General Fallback] 簡易季節判斷
+    if 2 <= month_idx <= 4: # 春
+        if day_master in ["木", "火"]: joyful = ["金", "土"]; taboo = ["木", "火"]
+        else: joyful = ["土", "金"]; taboo = ["木", "水"]
+    elif 5 <= month_idx <= 7: # 夏
+        if day_master in ["火", "土"]: joyful = ["水", "金"]; taboo = ["火", "木"]
+        else: joyful = ["木", "火"] if day_master!="水" else ["金","水"]; taboo = ["金","水"] if day_master!="水" else ["火","土"]
+    elif 8 <= month_idx <= 10: # 秋
+        if day_master in ["金", "水"]: joyful = ["火", "木"]; taboo = ["金", "土"]
+        else: joyful = ["土", "金"]; taboo = ["火", "木"]
+    else: # 冬
+        if day_master in ["水", "木"]: joyful = ["火", "土"]; taboo = ["水", "金"]
+        else: joyful = ["金", "水"]; taboo = ["火", "土"]
+
+    if not joyful: joyful = ["火", "木"]; taboo = ["金", "水"]; reason = "能量平衡建議：喜火木，忌金水。"
+
+    return joyful, taboo, reason
+
+
+# ==========================================
+# 五行強弱評分與格局 (權重與門檻皆為資料，單盤與批次共用)
+# ==========================================
+# 計分位置 (八字 8 字的索引)：年干 年支 月干 月支 日支 時干 時支 (日干為日主本身，不計分)
+SCORED_POSITIONS = (0, 1, 2, 3, 5, 6, 7)
+
+@dataclass(frozen=True)
+class StrengthScheme:
+    """
+    身強弱評分方案。
+    weights: 依 SCORED_POSITIONS 順序的權重
+    thresholds: 由高到低的 (門檻, 是否含等號)，分數達到第 i 個門檻即為格局代碼 i，皆未達到為最後一級
+    """
+    name: str
+    weights: tuple
+    thresholds: tuple
+
+    def base_code(self, score):
+        for code, (bound, inclusive) in enumerate(self.thresholds):
+            if score >= bound if inclusive else score > bound:
+                return code
+        return len(self.thresholds)
+
+DEFAULT_SCHEME = StrengthScheme("classic", weights=(5, 20, 5, 35, 20, 5, 10), thresholds=((85, True), (45, False), (15, True)))
+
+# 格局代碼 0~3：(strength_type 樣板, base_type, ascii_art, soul_message 樣板)
+STRENGTH_LEVELS = (
+    (
+        "從強格 (特殊) {score}%", "🛡️ 重裝坦克",
+        """   ░░░░░░░░░░░░░░░░░\n  ░░░░▄▄████▄▄░░░░░░\n  ░░░██████████░░░░░\n  ░▄▄████████████▄▄░\n  █  AliVerse Tank █\n  ▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀""",
+        "親愛的 {day_master_wx} 行坦克駕駛：世界是用來征服的。但最強的履帶也需要潤滑，偶爾示弱不是輸，而是為了走更遠的路。",
+    ),
+    (
+        "身強 (Strong) {score}%", "🚜 全地形越野車",
+        """      ____  \n     /  | \\_ \n    |___|___\\_\n    (o)----(o)\n   [ SUV-4WD ]""",
+        "親愛的 {day_master_wx} 行越野車駕駛：您的能量像座活火山，不給它出口（才華/事業），就會在內部爆炸。請大膽地去冒險，舒適圈是您的監獄。",
+    ),
+    (
+        "身弱 (Weak) {score}%", "🏎️ 經典跑車/房車",
+        """      ______\n     /  |   \\_\n    |___|_____\\__\n    (o)-----(o)\n    [  SEDAN  ]""",
+        "親愛的 {day_master_wx} 行跑車駕駛：別羨慕坦克的耐撞，您的價值在於精準與優雅。這世界太吵，您需要的是懂您的副駕駛（夥伴）和高品質的保養（學習）。",
+    ),
+    (
+        "從弱格 (特殊) {score}%", "🛸 未來概念車",
+        """      .---.\n    _/__~__\\_\n   (_________)\n    /       \\ \n   [   UFO   ]""",
+        "親愛的 {day_master_wx} 行概念車駕駛：您是變色龍。不要被世俗的「自我」框架綁住。當您與趨勢合而為一，您就是趨勢本身。",
+    ),
+)
+
+def score_strength(year_gan, year_zhi, month_gan, month_zhi, day_gan, day_zhi, time_gan, time_zhi, scheme=DEFAULT_SCHEME):
+    """
+    以日主同黨 (比劫 + 印星) 的加權比例計算身強弱指數 (預設方案為 0~100)。
+    """
+    eight = (year_gan, year_zhi, month_gan, month_zhi, day_gan, day_zhi, time_gan, time_zhi)
+    day_master_wx = WUXING_MAP.get(day_gan)
+    resource_wx = [k for k, v in PRODUCING_MAP.items() if v == day_master_wx][0]
+
+    score = 0
+    for pos, w in zip(SCORED_POSITIONS, scheme.weights):
+        char_wx = WUXING_MAP.get(eight[pos])
+        if char_wx == day_master_wx or char_wx == resource_wx:
+            score += w
+    return score
+
+def classify_strength(score, day_master_wx, scheme=DEFAULT_SCHEME):
+    """
+    依分數決定格局。
+    return: (strength_type, base_type, ascii_art, soul_message)
+    """
+    strength_type, base_type, ascii_art, soul_message = STRENGTH_LEVELS[scheme.base_code(score)]
+    return strength_type.format(score=score), base_type, ascii_art, soul_message.format(day_master_wx=day_master_wx)
+
+
+# --- 批次 (NumPy) 版本 ---
+# 五行代碼依相生順序 木0 火1 土2 金3 水4：X 的印星 (生我者) 為 (X - 1) % 5
+ELEMENTS = ("木", "火", "土", "金", "水")
+# 22 字 (10 天干 + 12 地支) → 五行代碼；地支以 10 + 地支編碼索引
+ELEMENT_CODE_TABLE = np.array([ELEMENTS.index(WUXING_MAP[c]) for c in STEMS + BRANCHES], dtype=np.int8)
+# 八字各欄 (干、支交錯) 轉為 22 字代碼的偏移量
+PILLAR_CODE_OFFSETS = np.array([0, 10, 0, 10, 0, 10, 0, 10], dtype=np.int8)
+
+def score_strength_array(codes, scheme=DEFAULT_SCHEME):
+    """
+    批次身強弱評分，結果與逐盤呼叫 score_strength() / classify_strength() 相同。
+    codes: (..., 8) 整數陣列，依年干 年支 月干 月支 日干 日支 時干 時支，天干 0~9、地支 0~11 (與 bazi_table 前 8 欄相同)
+    return: (scores, base_codes)；base_codes 為 STRENGTH_LEVELS 索引 (int8)
+    """
+    codes = np.asarray(codes)
+    elements = ELEMENT_CODE_TABLE[codes + PILLAR_CODE_OFFSETS]
+    day_master = elements[..., 4:5]
+    scored = elements[..., SCORED_POSITIONS]
+    same_party = (scored == day_master) | (scored == (day_master - 1) % 5)
+    weights = np.asarray(scheme.weights)
+    scores = same_party.astype(weights.dtype) @ weights
+
+    base_codes = np.full(scores.shape, len(scheme.thresholds), dtype=np.int8)
+    # 由最低門檻往上覆寫，最後留下的是分數達到的最高門檻
+    for code in range(len(scheme.thresholds) - 1, -1, -1):
+        bound, inclusive = scheme.thresholds[code]
+        base_codes[scores >= bound if inclusive else scores > bound] = code
+    return scores, base_codes
+
+
+# ==========================================
+# 原廠車型 (梅花易數起卦數)
+# ==========================================
+def get_hexagram_numbers(year, month, day, hour):
+    """
+    以西元年月日數與時辰數起上下卦 (1~8)。
+    """
+    upper_num = (year + month + day) % 8
+    if upper_num == 0: upper_num = 8
+    hour_num = (hour // 2) + 1
+    if hour == 23: hour_num = 1
+    lower_num = (year + month + day + hour_num) % 8
+    if lower_num == 0: lower_num = 8
+    return upper_num, lower_num
+
+def get_real_car_model(upper_num, lower_num):
+    if upper_num == 1: return "Bugatti Chiron" if lower_num==1 else "Rolls-Royce" if lower_num==3 else "Mercedes-Benz S-Class"
+    if upper_num == 8: return "Toyota Alphard" if lower_num==8 else "Range Rover" if lower_num==3 else "Land Cruiser"
+    if upper_num == 3: return "Ferrari F8" if lower_num==3 else "Porsche 911"
+    if upper_num == 6: return "Tesla Model S" if lower_num==6 else "BMW i7"
+    if upper_num == 4: return "Nissan GT-R"
+    if upper_num == 5: return "McLaren 720S"
+    if upper_num == 7: return "Mercedes-Benz G-Class"
+    if upper_num == 2: return "Mazda MX-5"
+    return "Lexus LC500"
+
+def get_car_quote(upper_num, lower_num):
+    if upper_num == 1: return "你的目標在雲端，不與凡車爭道。"
+    if upper_num == 8: return "厚德載物，能容納所有人的夢想。"
+    if upper_num == 3: return "你的存在就是為了燃燒與尖叫。"
+    if upper_num == 6: return "適應力強，科技感十足。"
+    return "獨特品味，融合了多種優點。"
+
+
+# ==========================================
+# 排盤結果 (不可變物件)
+# ==========================================
+@dataclass(frozen=True)
+class BaziChart:
+    """
+    單一出生時間的完整運算結果，可安全地在多個 session 間共用。
+    """
+    year: int
+    month: int
+    day: int
+    hour_slot: int
+    gender: str
+    hour: int
+    # 四柱
+    year_gan: str
+    year_zhi: str
+    month_gan: str
+    month_zhi: str
+    day_gan: str
+    day_zhi: str
+    time_gan: str
+    time_zhi: str
+    # 農曆
+    lunar_year: str
+    lunar_month_cn: str
+    lunar_day_cn: str
+    zodiac: str
+    # 格局
+    day_master_wx: str
+    score: int
+    strength_type: str
+    base_type: str
+    ascii_art: str
+    soul_message: str
+    # 喜忌神
+    joyful_gods: tuple
+    taboo_gods: tuple
+    god_reason: str
+    # 車型
+    upper_num: int
+    lower_num: int
+    real_car_model: str
+    car_quote: str
+    # 分鐘精度排盤 (compute_chart_exact) 才有的資訊
+    minute: int = 0
+    time_note: str = ""      # 夏令時間 / 真太陽時校正說明
+    warnings: tuple = ()     # 出生時間靠近柱的交界時的提醒
+
+    @property
+    def pillars(self):
+        """ 四柱 (天干, 地支)，依年、月、日、時排列 """
+        return (
+            (self.year_gan, self.year_zhi),
+            (self.month_gan, self.month_zhi),
+            (self.day_gan, self.day_zhi),
+            (self.time_gan, self.time_zhi),
+        )
+
+    @property
+    def lucky_colors(self):
+        return tuple(ELEMENT_COLOR_NAMES[wx] for wx in self.joyful_gods)
+
+    @property
+    def taboo_colors(self):
+        return tuple(ELEMENT_COLOR_NAMES[wx] for wx in self.taboo_gods)
+
+    @property
+    def advice_2026(self):
+        return ADVICE_2026_FIRE if "火" in self.joyful_gods else ADVICE_2026_COOL
+
+
+@functools.lru_cache(maxsize=1)
+def get_chart_table():
+    """
+    開啟預先排盤表 (唯讀 mmap，多個伺服器行程經由 page cache 共用)；不存在時回傳 None。
+    """
+    import bazi_table
+    try:
+        return bazi_table.ChartTable(CHART_TABLE_PATH)
+    except (OSError, ValueError):
+        return None
+
+def convert_lunar(year, month, day, hour):
+    """
+    以 lunar_python 換算四柱與農曆資訊。
+    return: (八字 8 字 tuple, lunar_year, lunar_month_cn, lunar_day_cn, zodiac)
+    """
+    from lunar_python import Solar
+    lunar = Solar.fromYmdHms(year, month, day, hour, 0, 0).getLunar()
+    bazi = lunar.getEightChar()
+    eight = (
+        str(bazi.getYearGan()), str(bazi.getYearZhi()), str(bazi.getMonthGan()), str(bazi.getMonthZhi()),
+        str(bazi.getDayGan()), str(bazi.getDayZhi()), str(bazi.getTimeGan()), str(bazi.getTimeZhi())
+    )
+    return eight, lunar.getYearInGanZhi(), lunar.getMonthInChinese(), lunar.getDayInChinese(), lunar.getYearShengXiao()
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def compute_chart(year, month, day, hour_slot, gender="男"):
+    """
+    依出生年月日與時辰選項 (HOUR_OPTIONS 的索引 0~12) 排盤並完成所有分析。
+    日期不合法時拋出 ValueError。
+    """
+    year, month, day, hour_slot = int(year), int(month), int(day), int(hour_slot)
+    if not 0 <= hour_slot < len(HOUR_SLOT_HOURS):
+        raise ValueError(f"hour_slot out of range: {hour_slot}")
+    hour = HOUR_SLOT_HOURS[hour_slot]
+    datetime.date(year, month, day)  # 日期不合法時拋出 ValueError
+
+    table = get_chart_table()
+    converted = table.lookup(year, month, day, hour_slot) if table is not None else None
+    if converted is None:
+        converted = bazi_calendar.convert(year, month, day, hour) or convert_lunar(year, month, day, hour)
+    return _assemble_chart(year, month, day, hour_slot, hour, gender, converted)
+
+def hour_to_slot(hour):
+    """ 0~23 時 → 時辰選項索引 (00:xx 為早子、23 時為晚子)；超出範圍時拋出 ValueError """
+    hour = int(hour)
+    if not 0 <= hour <= 23:
+        raise ValueError(f"hour out of range: {hour}")
+    return len(HOUR_SLOT_HOURS) - 1 if hour == 23 else (hour + 1) // 2
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def compute_chart_exact(year, month, day, hour, minute, gender="男", region=bazi_birthtime.DEFAULT_REGION, longitude=None):
+    """
+    分鐘精度排盤：依出生地扣除歷史夏令時間，可選以經度換算真太陽時 (見 bazi_birthtime)。
+    年柱、月柱以北京時間比對交節時刻，日柱、時柱用校正後的當地時間。
+    日期不合法、地區不明或超出曆法範圍時拋出 ValueError。
+    """
+    moment = bazi_birthtime.resolve(int(year), int(month), int(day), int(hour), int(minute), region, longitude)
+    local = moment.local
+    converted = bazi_calendar.convert(local.year, local.month, local.day, local.hour, local.minute, moment.term_offset)
+    if converted is None:
+        raise ValueError(f"date out of calendar range: {local:%Y-%m-%d}")
+    return _assemble_chart(
+        local.year, local.month, local.day, hour_to_slot(local.hour), local.hour, gender, converted,
+        minute=local.minute, time_note=moment.describe(), warnings=bazi_birthtime.boundary_warnings(moment),
+    )
+
+def _assemble_chart(year, month, day, hour_slot, hour, gender, converted, **extra):
+    """ 由換算結果 (convert_lunar 格式) 完成評分、喜忌與車型分析 """
+    eight, lunar_year, lunar_month_cn, lunar_day_cn, zodiac = converted
+    year_gan, year_zhi, month_gan, month_zhi, day_gan, day_zhi, time_gan, time_zhi = eight
+
+    day_master_wx = WUXING_MAP.get(day_gan)
+    score = score_strength(*eight)
+    strength_type, base_type, ascii_art, soul_message = classify_strength(score, day_master_wx)
+    joyful_gods, taboo_gods, god_reason = determine_fates_guide(day_master_wx, month)
+    # 起卦的時辰數依時辰選項 (精確時間 01:30 屬丑時，與選 02:00 的時辰相同)
+    upper_num, lower_num = get_hexagram_numbers(year, month, day, HOUR_SLOT_HOURS[hour_slot])
+
+    return BaziChart(
+        year=year, month=month, day=day, hour_slot=hour_slot, gender=gender, hour=hour,
+        year_gan=year_gan, year_zhi=year_zhi, month_gan=month_gan, month_zhi=month_zhi,
+        day_gan=day_gan, day_zhi=day_zhi, time_gan=time_gan, time_zhi=time_zhi,
+        lunar_year=lunar_year, lunar_month_cn=lunar_month_cn,
+        lunar_day_cn=lunar_day_cn, zodiac=zodiac,
+        day_master_wx=day_master_wx, score=score, strength_type=strength_type,
+        base_type=base_type, ascii_art=ascii_art, soul_message=soul_message,
+        joyful_gods=tuple(joyful_gods), taboo_gods=tuple(taboo_gods), god_reason=god_reason,
+        upper_num=upper_num, lower_num=lower_num,
+        real_car_model=get_real_car_model(upper_num, lower_num),
+        car_quote=get_car_quote(upper_num, lower_num),
+        **extra,
+    )
+
+
+# ==========================================
+# 不確定時辰 (13 個時辰一次排出)
+# ==========================================
+# 日柱、喜忌神只隨日期改變；13 個時辰的年月時柱 (交節日年柱、月柱也可能不同)、身強弱、車型與卦象
+# 以陣列一次算出，整張表依出生日期快取
+HOUR_VARIANT_CACHE_SIZE = 1024
+HOUR_SLOT_ARRAY = np.array(HOUR_SLOT_HOURS)
+HOUR_NUM_ARRAY = np.where(HOUR_SLOT_ARRAY == 23, 1, HOUR_SLOT_ARRAY // 2 + 1)
+
+@dataclass(frozen=True)
+class HourVariants:
+    """ 同一出生日期的 13 個時辰排盤；各 tuple 依 HOUR_OPTIONS 順序 """
+    year: int
+    month: int
+    day: int
+    day_pillar: str
+    day_master_wx: str
+    joyful_gods: tuple
+    taboo_gods: tuple
+    year_pillars: tuple
+    month_pillars: tuple
+    time_pillars: tuple
+    scores: tuple
+    strength_types: tuple
+    base_types: tuple
+    car_models: tuple
+    hexagrams: tuple     # 卦名 (上卦、下卦同 get_hexagram_numbers)
+
+    # (顯示名稱, 欄位)：比較 13 個時辰是否一致的項目
+    COMPARED = (
+        ("年柱", "year_pillars"), ("月柱", "month_pillars"), ("身強弱指數", "scores"),
+        ("引擎規格", "strength_types"), ("原廠格局", "base_types"), ("原廠車型", "car_models"), ("卦象", "hexagrams"),
+    )
+
+    def stability(self):
+        """ return: (不隨時辰改變的項目, 會隨時辰改變的項目) """
+        stable = tuple(label for label, field in self.COMPARED if len(set(getattr(self, field))) == 1)
+        return stable, tuple(label for label, _ in self.COMPARED if label not in stable)
+
+    def typical_slot(self):
+        """ 最多時辰共有的格局中，最早的時辰 (不確定時辰時預設顯示的完整解析) """
+        common = max(self.base_types, key=self.base_types.count)
+        return self.base_types.index(common)
+
+    def rows(self):
+        """ 每個時辰一列 (dict)，供表格顯示 """
+        return [
+            {"時辰": option, "時柱": self.time_pillars[i], "年柱": self.year_pillars[i], "月柱": self.month_pillars[i],
+             "指數": self.scores[i], "格局": self.base_types[i], "車型": self.car_models[i], "卦象": self.hexagrams[i]}
+            for i, option in enumerate(HOUR_OPTIONS)
+        ]
+
+@functools.lru_cache(maxsize=HOUR_VARIANT_CACHE_SIZE)
+def hour_variants(year, month, day):
+    """
+    不確定時辰：一次排出 13 個時辰的結果 (與逐一呼叫 compute_chart() 相同)。
+    日期不合法或超出曆法範圍時拋出 ValueError。
+    """
+    year, month, day = int(year), int(month), int(day)
+    year_gz, month_gz, day_gz, time_gz = bazi_calendar.pillar_index_arrays(year, month, day, HOUR_SLOT_ARRAY)
+    day_gz = np.full_like(time_gz, day_gz)
+    codes = np.stack([gz % m for gz in (year_gz, month_gz, day_gz, time_gz) for m in (10, 12)], axis=-1)
+    scores, base_codes = score_strength_array(codes)
+
+    day_gan = STEMS[day_gz[0] % 10]
+    day_master_wx = WUXING_MAP[day_gan]
+    joyful_gods, taboo_gods, _ = determine_fates_guide(day_master_wx, month)
+    upper_num = (year + month + day) % 8 or 8
+    lower_nums = (year + month + day + HOUR_NUM_ARRAY) % 8
+    lower_nums[lower_nums == 0] = 8
+    levels = [STRENGTH_LEVELS[code] for code in base_codes.tolist()]
+
+    return HourVariants(
+        year=year, month=month, day=day, day_pillar=bazi_calendar.ganzhi(int(day_gz[0])), day_master_wx=day_master_wx,
+        joyful_gods=tuple(joyful_gods), taboo_gods=tuple(taboo_gods),
+        year_pillars=tuple(bazi_calendar.ganzhi(i) for i in year_gz.tolist()),
+        month_pillars=tuple(bazi_calendar.ganzhi(i) for i in month_gz.tolist()),
+        time_pillars=tuple(bazi_calendar.ganzhi(i) for i in time_gz.tolist()),
+        scores=tuple(scores.tolist()),
+        strength_types=tuple(level[0].format(score=score) for level, score in zip(levels, scores.tolist())),
+        base_types=tuple(level[1] for level in levels),
+        car_models=tuple(get_real_car_model(upper_num, lower) for lower in lower_nums.tolist()),
+        hexagrams=tuple(bazi_iching.get_hexagram(upper_num, lower).name for lower in lower_nums.tolist()),
+    )
+
+
+# ==========================================
+# 時空卜卦 (意念字 + 占卜時間)
+# ==========================================
+# 占卜時間的干支與起卦數只隨日期與時辰改變：以 (年, 月, 日, 時) 為時間桶快取農曆換算，
+# 同一時辰內的大量卜卦共用一次換算
+DIVINATION_CACHE_SIZE = 256
+
+@functools.lru_cache(maxsize=DIVINATION_CACHE_SIZE)
+def divination_time(year, month, day, hour):
+    """
+    占卜時間換算 (依時間桶快取；曆法表範圍外改用 lunar_python)。
+    return: (占卜時間干支字串, (年支數, 農曆月, 農曆日, 時支數))
+    """
+    if bazi_calendar.in_range(year, month, day):
+        lunar_year, lunar_month, lunar_day = bazi_calendar.lunar_date(year, month, day)
+        time_zhi = (hour + 1) // 2 % 12
+        time_ganzhi = (
+            f"{bazi_calendar.ganzhi(lunar_year - 4)}年 {bazi_calendar.lunar_month_cn(lunar_month)}月 "
+            f"{bazi_calendar.LUNAR_DAY_CN[lunar_day]} {BRANCHES[time_zhi]}時"
+        )
+        return time_ganzhi, ((lunar_year - 4) % 12 + 1, abs(lunar_month), lunar_day, time_zhi + 1)
+    from lunar_python import Solar
+    lunar = Solar.fromYmdHms(year, month, day, hour, 0, 0).getLunar()
+    time_ganzhi = f"{lunar.getYearInGanZhi()}年 {lunar.getMonthInChinese()}月 {lunar.getDayInChinese()} {lunar.getTimeZhi()}時"
+    numbers = (
+        BRANCHES.index(lunar.getYearZhi()) + 1, abs(lunar.getMonth()), lunar.getDay(),
+        BRANCHES.index(lunar.getTimeZhi()) + 1,
+    )
+    return time_ganzhi, numbers
+
+def divine_reading(user_input_val, div_time):
+    """
+    時空卜卦 (梅花易數：意念字碼總和 + 占卜時間起卦)。
+    return: (占卜時間干支字串, bazi_iching.Reading)
+    """
+    time_ganzhi, numbers = divination_time(div_time.year, div_time.month, div_time.day, div_time.hour)
+    return time_ganzhi, bazi_iching.cast(sum(ord(c) for c in user_input_val), *numbers)
+
+def divine(user_input_val, div_time):
+    """
+    時空卜卦 (本卦摘要)。
+    return: (占卜時間干支字串, (卦名, 籤等, 卦辭, 易經指引))
+    """
+    time_ganzhi, reading = divine_reading(user_input_val, div_time)
+    main = reading.main
+    return time_ganzhi, (main.name, main.luck, main.judgment, main.advice)
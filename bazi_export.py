@@ -0,0 +1,352 @@
+# ==========================================
+# AliVerse 報告匯出 (PNG 分享圖卡 / PDF 報告 / ZIP 批次)
+# ==========================================
+"""
+在有上限的行程池中以 Pillow 繪製報告，不佔用 Streamlit 的腳本執行緒。
+
+    key = bazi_export.submit("png", payload)   # 立即回傳；同內容的工作共用結果
+    bazi_export.status(key)                    # "done" / "pending" / "error" / None
+    bazi_export.read(key)                      # 完成後的檔案內容
+
+成品以內容雜湊 (格式 + 版面版本 + payload) 命名存於 EXPORT_DIR，跨 session、跨行程共用；
+佇列已滿時 submit() 拋出 ExportBusy。iter_zip() 逐檔串流 ZIP，記憶體用量與檔案數無關。
+
+中文字型依序尋找 ALIVERSE_EXPORT_FONT 與常見系統字型 (部署時由 packages.txt 安裝 fonts-noto-cjk)。
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+
+from bazi_engine import CHART_TABLE_PATH, PILLAR_TITLES
+
+EXPORT_DIR = os.environ.get(
+    "ALIVERSE_EXPORT_DIR", os.path.join(os.path.dirname(os.path.abspath(CHART_TABLE_PATH)), "exports")
+)
+EXPORT_WORKERS = int(os.environ.get("ALIVERSE_EXPORT_WORKERS", "2"))
+MAX_PENDING = EXPORT_WORKERS * 8     # 行程池中排隊 + 執行中的工作上限
+CACHE_MAX_FILES = 2000               # 成品快取的檔案數上限 (超過時刪除最舊的)
+RENDER_VERSION = 1                   # 版面改動時遞增，舊快取自動失效
+
+FORMATS = {
+    "png": ("image/png", "分享圖卡"),
+    "pdf": ("application/pdf", "運勢報告"),
+    "txt": ("text/plain", "運勢報告"),
+}
+
+FONT_CANDIDATES = (
+    os.environ.get("ALIVERSE_EXPORT_FONT", ""),
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "C:/Windows/Fonts/msjh.ttc",
+)
+
+# 卡片配色 (與 aliverse.css 的深色主題一致)
+BG_TOP, BG_BOTTOM = (14, 17, 23), (38, 12, 8)
+GOLD, ORANGE, TEXT, MUTED = (255, 215, 0), (255, 69, 0), (235, 235, 235), (170, 170, 170)
+CARD_SIZE = (1080, 1350)   # IG 直式貼文
+PAGE_SIZE = (1240, 1754)   # A4 @ 150 dpi
+
+# 字型缺少的表情符號與變體選擇符，繪製前移除
+_EMOJI_RE = re.compile("[\U00010000-\U0010FFFF\u2600-\u27BF\uFE0F]")
+
+
+class ExportBusy(RuntimeError):
+    """ 匯出佇列已滿 """
+
+
+# ==========================================
+# 報告內容 (純文字，可序列化並雜湊)
+# ==========================================
+def report_payload(display_name, chart, matrix_data, time_ganzhi, user_input_val, gua, report_text):
+    """ 匯出所需的全部文字；gua: (卦名, 籤等, 卦辭, 易經指引) """
+    gua_name, gua_luck, gua_text, gua_advice = gua
+    return {
+        "name": display_name,
+        "car_model": chart.real_car_model,
+        "base_type": chart.base_type,
+        "strength": chart.strength_type,
+        "day_master": f"{chart.day_gan}{chart.day_master_wx}",
+        "pillars": [f"{title.split()[0]} {gan}{zhi}" for title, (gan, zhi) in zip(PILLAR_TITLES, chart.pillars)],
+        "hex_name": matrix_data["hex_name"],
+        "upper_desc": matrix_data["upper_desc"],
+        "lower_desc": matrix_data["lower_desc"],
+        "tuning_purpose": matrix_data["tuning_purpose"],
+        "lucky": "、".join(chart.lucky_colors),
+        "taboo": "、".join(chart.taboo_colors),
+        "time_ganzhi": time_ganzhi,
+        "user_input": user_input_val,
+        "gua_name": gua_name,
+        "gua_luck": gua_luck,
+        "gua_text": gua_text,
+        "gua_advice": gua_advice,
+        "report_text": report_text,
+    }
+
+def content_key(kind, payload):
+    """ 成品的內容雜湊 (亦為快取檔名) """
+    blob = json.dumps({"kind": kind, "version": RENDER_VERSION, "payload": payload}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+def file_name(kind, payload):
+    return f"AliVerse_2026_{payload['name']}_{FORMATS[kind][1]}.{kind}"
+
+
+# ==========================================
+# 繪製 (在行程池中執行，不相依 Streamlit)
+# ==========================================
+def _font_path():
+    for path in FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+def _font(size):
+    from PIL import ImageFont
+    path = _font_path()
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+
+def _wrap(text, font, width):
+    """ 依像素寬度逐字換行 (中文無空白可斷) """
+    lines = []
+    for paragraph in _EMOJI_RE.sub("", text).splitlines() or [""]:
+        line = ""
+        for ch in paragraph:
+            if line and font.getlength(line + ch) > width:
+                lines.append(line)
+                line = ""
+            line += ch
+        lines.append(line)
+    return lines
+
+def _draw_block(draw, xy, text, font, fill, width, spacing=1.4):
+    """ 繪製換行文字，回傳下一行的 y """
+    x, y = xy
+    for line in _wrap(text, font, width):
+        draw.text((x, y), line, font=font, fill=fill)
+        y += int(font.size * spacing)
+    return y
+
+def render_card(payload):
+    """ 分享圖卡：車型、車相矩陣與卜卦結果 """
+    from PIL import Image, ImageDraw
+
+    w, h = CARD_SIZE
+    img = Image.new("RGB", CARD_SIZE)
+    draw = ImageDraw.Draw(img)
+    for y in range(h):
+        t = y / h
+        draw.line([(0, y), (w, y)], fill=tuple(int(a + (b - a) * t) for a, b in zip(BG_TOP, BG_BOTTOM)))
+    draw.rounded_rectangle([30, 30, w - 30, h - 30], radius=36, outline=GOLD, width=3)
+
+    margin, inner = 80, w - 160
+    title, big, body, small = _font(60), _font(46), _font(32), _font(26)
+    y = _draw_block(draw, (margin, 80), "AliVerse 愛力宇宙", title, GOLD, inner)
+    y = _draw_block(draw, (margin, y), f"{payload['name']} 的 2026 專屬車相", body, MUTED, inner) + 30
+
+    y = _draw_block(draw, (margin, y), payload["car_model"], big, TEXT, inner)
+    y = _draw_block(draw, (margin, y), f"{payload['base_type']}・{payload['strength']}", body, ORANGE, inner)
+    y = _draw_block(draw, (margin, y), f"日主 {payload['day_master']}　" + "　".join(payload["pillars"]), small, MUTED, inner) + 30
+
+    draw.line([(margin, y), (w - margin, y)], fill=GOLD, width=2)
+    y += 30
+    y = _draw_block(draw, (margin, y), f"64卦車相矩陣：{payload['hex_name']}", big, GOLD, inner)
+    y = _draw_block(draw, (margin, y), f"{payload['upper_desc']} × {payload['lower_desc']}", small, MUTED, inner)
+    y = _draw_block(draw, (margin, y), payload["tuning_purpose"], body, TEXT, inner) + 30
+
+    draw.line([(margin, y), (w - margin, y)], fill=GOLD, width=2)
+    y += 30
+    y = _draw_block(draw, (margin, y), f"時空卜卦：{payload['gua_name']} ({payload['gua_luck']})", big, ORANGE, inner)
+    y = _draw_block(draw, (margin, y), payload["gua_text"], body, TEXT, inner)
+    y = _draw_block(draw, (margin, y), payload["gua_advice"], body, TEXT, inner)
+    _draw_block(draw, (margin, y + 10), f"幸運燃料：{payload['lucky']}　避凶：{payload['taboo']}", small, MUTED, inner)
+
+    _draw_block(draw, (margin, h - 110), "立即測算：https://aliverse-bazi.streamlit.app", small, GOLD, inner)
+    return img
+
+def render_pages(payload):
+    """ PDF 內頁：完整報告文字，自動分頁 """
+    from PIL import Image, ImageDraw
+
+    w, h = PAGE_SIZE
+    margin = 110
+    font = _font(30)
+    line_height = int(font.size * 1.6)
+    lines = _wrap(payload["report_text"].strip(), font, w - 2 * margin)
+    per_page = (h - 2 * margin) // line_height
+    pages = []
+    for start in range(0, len(lines), per_page):
+        page = Image.new("RGB", PAGE_SIZE, "white")
+        draw = ImageDraw.Draw(page)
+        for i, line in enumerate(lines[start:start + per_page]):
+            draw.text((margin, margin + i * line_height), line, font=font, fill=(30, 30, 30))
+        pages.append(page)
+    return pages
+
+def render(kind, payload):
+    """ 繪製成品並回傳 bytes """
+    if kind == "txt":
+        return payload["report_text"].encode("utf-8")
+    buf = io.BytesIO()
+    card = render_card(payload)
+    if kind == "png":
+        card.save(buf, "PNG")
+    elif kind == "pdf":
+        card.save(buf, "PDF", save_all=True, append_images=render_pages(payload), resolution=150)
+    else:
+        raise ValueError(f"unknown export format: {kind}")
+    return buf.getvalue()
+
+def render_to_file(kind, payload, path):
+    """ 行程池的工作單位：繪製後寫入暫存檔再原子替換 """
+    data = render(kind, payload)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+# ==========================================
+# 行程池與內容雜湊快取
+# ==========================================
+_lock = threading.Lock()
+_pool = None
+_jobs = {}  # key -> Future (執行中或失敗的工作)
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # spawn：伺服器行程有多個執行緒，fork 可能複製到被鎖住的狀態
+        _pool = ProcessPoolExecutor(EXPORT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def cache_path(key, kind):
+    return os.path.join(EXPORT_DIR, f"{key}.{kind}")
+
+def _find(key):
+    for kind in FORMATS:
+        path = cache_path(key, kind)
+        if os.path.exists(path):
+            return path
+    return None
+
+def prune_cache(max_files=CACHE_MAX_FILES):
+    """ 成品超過上限時刪除最舊的檔案 """
+    try:
+        entries = [e for e in os.scandir(EXPORT_DIR) if e.is_file() and not e.name.endswith(".tmp")]
+    except FileNotFoundError:
+        return
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - max_files]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+def _on_done(key, future):
+    global _pool
+    error = future.exception()
+    with _lock:
+        if error is None:
+            _jobs.pop(key, None)
+        elif isinstance(error, BrokenProcessPool):
+            # 工作行程異常結束 (如記憶體不足被終止)：下次送出時重建行程池
+            _pool = None
+    prune_cache()
+
+def submit(kind, payload):
+    """
+    送出匯出工作並立即回傳內容雜湊 key；已有成品或同內容的工作執行中時不重複繪製。
+    佇列已滿時拋出 ExportBusy。
+    """
+    global _pool
+    if kind not in FORMATS:
+        raise ValueError(f"unknown export format: {kind}")
+    key = content_key(kind, payload)
+    path = cache_path(key, kind)
+    if os.path.exists(path):
+        return key
+    with _lock:
+        future = _jobs.get(key)
+        if future is not None and not (future.done() and future.exception() is not None):
+            return key
+        if sum(not f.done() for f in _jobs.values()) >= MAX_PENDING:
+            raise ExportBusy("export queue is full")
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        try:
+            future = _get_pool().submit(render_to_file, kind, payload, path)
+        except BrokenProcessPool:
+            _pool = None
+            future = _get_pool().submit(render_to_file, kind, payload, path)
+        _jobs[key] = future
+    future.add_done_callback(lambda f: _on_done(key, f))
+    return key
+
+def status(key):
+    """ "done" / "pending" / "error"；未知的 key (或成品已被清除) 回傳 None """
+    with _lock:
+        future = _jobs.get(key)
+    if future is not None and future.done() and future.exception() is not None:
+        return "error"
+    if _find(key):
+        return "done"
+    return "pending" if future is not None else None
+
+def read(key):
+    """ 讀取成品內容；不存在時拋出 FileNotFoundError """
+    path = _find(key)
+    if path is None:
+        raise FileNotFoundError(key)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# ==========================================
+# ZIP 串流 (批次匯出)
+# ==========================================
+class _ChunkWriter(io.RawIOBase):
+    """ 不可 seek 的寫入端：zipfile 寫入的位元組暫存於此，由 iter_zip() 逐段取出 """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.chunks.append(bytes(b))
+        self.position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def iter_zip(entries):
+    """
+    entries: 可迭代的 (檔名, bytes)；逐檔產出 ZIP 位元組片段，同一時間只保留一個檔案的內容。
+    PNG / PDF 已壓縮，以 ZIP_STORED 存入；其餘以 ZIP_DEFLATED。
+    """
+    sink = _ChunkWriter()
+    with zipfile.ZipFile(sink, "w") as zf:
+        for name, data in entries:
+            compress = zipfile.ZIP_STORED if name.endswith((".png", ".pdf")) else zipfile.ZIP_DEFLATED
+            zf.writestr(zipfile.ZipInfo(name, date_time=(2026, 1, 1, 0, 0, 0)), data, compress_type=compress)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,118 @@
+# ==========================================
+# AliVerse 大運 / 流年導航
+# ==========================================
+"""
+以喜忌神 (determine_fates_guide) 為基準，對指定年份區間的大運與流年逐年評分。
+
+流年干支表與使用者無關，匯入後第一次使用時建一次，整個行程共用；
+每位使用者只需一次 lunar_python 呼叫取得起運年，其餘為對干支表的 NumPy 向量運算。
+"""
+import functools
+
+import numpy as np
+
+from bazi_engine import BRANCH_CODE, BRANCHES, ELEMENT_CODE_TABLE, ELEMENTS, STEM_CODE, STEMS
+
+GRID_FIRST_YEAR = 1900
+GRID_LAST_YEAR = 2100
+LUCK_PILLAR_COUNT = 10  # 大運步數 (每步十年)
+
+# 評分權重：干 40% / 支 60%；流年與大運各佔一半，總分落在 -100 ~ 100
+FORECAST_WEIGHTS = {"year_stem": 20, "year_branch": 30, "luck_stem": 20, "luck_branch": 30}
+# 由高到低的 (門檻, 路況)，皆未達到為最後一級
+FORECAST_RATINGS = (
+    (50, "🚀 順風加速"),
+    (10, "🛣️ 路況良好"),
+    (-10, "🚦 平穩巡航"),
+    (-50, "🌧️ 減速慢行"),
+)
+FORECAST_RATING_LOW = "⛔ 逆風檢修"
+
+
+@functools.lru_cache(maxsize=1)
+def year_grid():
+    """
+    流年干支表 (GRID_FIRST_YEAR ~ GRID_LAST_YEAR)。
+    return: (years, stem_codes, branch_codes)，皆為唯讀 NumPy 陣列
+    """
+    years = np.arange(GRID_FIRST_YEAR, GRID_LAST_YEAR + 1)
+    stems = ((years - 4) % 10).astype(np.int8)
+    branches = ((years - 4) % 12).astype(np.int8)
+    for arr in (years, stems, branches):
+        arr.flags.writeable = False
+    return years, stems, branches
+
+def is_luck_forward(year_stem, gender):
+    """ 陽年生男、陰年生女順行，其餘逆行 """
+    return (STEM_CODE[year_stem] % 2 == 0) == (gender == "男")
+
+@functools.lru_cache(maxsize=4096)
+def luck_start_year(year, month, day, hour, gender):
+    """ 起運年 (西元)：依出生到前 / 後一個節氣的天數換算，交由 lunar_python 計算 """
+    from lunar_python import Solar
+    eight_char = Solar.fromYmdHms(year, month, day, hour, 0, 0).getLunar().getEightChar()
+    return eight_char.getYun(1 if gender == "男" else 0).getStartSolar().getYear()
+
+def luck_pillars(chart, count=LUCK_PILLAR_COUNT):
+    """
+    大運：由月柱起，順行或逆行逐步推進六十甲子。
+    return: (start_years, stem_codes, branch_codes)，第 i 步大運涵蓋 start_years[i] ~ start_years[i] + 9
+    """
+    step = 1 if is_luck_forward(chart.year_gan, chart.gender) else -1
+    start = luck_start_year(chart.year, chart.month, chart.day, chart.hour, chart.gender)
+    offsets = step * np.arange(1, count + 1)
+    stems = ((STEM_CODE[chart.month_gan] + offsets) % 10).astype(np.int8)
+    branches = ((BRANCH_CODE[chart.month_zhi] + offsets) % 12).astype(np.int8)
+    return start + 10 * np.arange(count), stems, branches
+
+def element_values(joyful_gods, taboo_gods):
+    """ 五行代碼 → +1 (喜用) / -1 (忌神) / 0 """
+    values = np.zeros(len(ELEMENTS), dtype=np.int32)
+    values[[ELEMENTS.index(e) for e in joyful_gods]] = 1
+    values[[ELEMENTS.index(e) for e in taboo_gods]] = -1
+    return values
+
+def rate(score):
+    for bound, label in FORECAST_RATINGS:
+        if score >= bound:
+            return label
+    return FORECAST_RATING_LOW
+
+def forecast(chart, first_year=2026, last_year=2040):
+    """
+    大運流年逐年評分。
+    return: list of dict (year, year_pillar, luck_pillar, score, rating)；起運前的年份 luck_pillar 為空字串
+    """
+    if not GRID_FIRST_YEAR <= first_year <= last_year <= GRID_LAST_YEAR:
+        raise ValueError(f"forecast span must be within {GRID_FIRST_YEAR}~{GRID_LAST_YEAR}")
+    years, grid_stems, grid_branches = year_grid()
+    span = slice(first_year - GRID_FIRST_YEAR, last_year - GRID_FIRST_YEAR + 1)
+    years, stems, branches = years[span], grid_stems[span], grid_branches[span]
+
+    luck_starts, luck_stems, luck_branches = luck_pillars(chart)
+    luck_idx = np.searchsorted(luck_starts, years, side="right") - 1
+    has_luck = (luck_idx >= 0) & (luck_idx < len(luck_starts))
+    luck_idx = np.clip(luck_idx, 0, len(luck_starts) - 1)
+
+    values = element_values(chart.joyful_gods, chart.taboo_gods)
+    w = FORECAST_WEIGHTS
+    scores = (
+        w["year_stem"] * values[ELEMENT_CODE_TABLE[stems]]
+        + w["year_branch"] * values[ELEMENT_CODE_TABLE[10 + branches]]
+        + has_luck * (
+            w["luck_stem"] * values[ELEMENT_CODE_TABLE[luck_stems[luck_idx]]]
+            + w["luck_branch"] * values[ELEMENT_CODE_TABLE[10 + luck_branches[luck_idx]]]
+        )
+    )
+    return [
+        {
+            "year": year,
+            "year_pillar": STEMS[s] + BRANCHES[b],
+            "luck_pillar": STEMS[luck_stems[i]] + BRANCHES[luck_branches[i]] if ok else "",
+            "score": score,
+            "rating": rate(score),
+        }
+        for year, s, b, i, ok, score in zip(
+            years.tolist(), stems.tolist(), branches.tolist(), luck_idx.tolist(), has_luck.tolist(), scores.tolist()
+        )
+    ]
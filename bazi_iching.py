@@ -0,0 +1,310 @@
+# ==========================================
+# AliVerse 梅花易數 (64 卦表 + 起卦)
+# ==========================================
+"""
+六十四卦資料表 (文王卦序：卦名、籤等、卦辭、六爻爻辭、易經指引) 於匯入時建成查表，
+以 (上卦, 下卦) 或六爻陰陽直接取卦；起卦後再推出動爻、之卦 (變卦) 與互卦。
+
+    上卦 = (意念數 + 年支數 + 月數 + 日數) % 8
+    下卦 = (意念數 + 年支數 + 月數 + 日數 + 時支數) % 8
+    動爻 = (意念數 + 年支數 + 月數 + 日數 + 時支數) % 6      (餘 0 取 8 / 6)
+"""
+from dataclasses import dataclass
+
+# 先天八卦數 (乾一 兌二 離三 震四 巽五 坎六 艮七 坤八)
+TRIGRAM_NAMES = "乾兌離震巽坎艮坤"
+TRIGRAM_NATURES = "天澤火雷風水山地"
+TRIGRAM_SYMBOLS = "☰☱☲☳☴☵☶☷"
+# 各卦三爻陰陽 (由下而上，1 = 陽爻)
+TRIGRAM_LINES = ((1, 1, 1), (1, 1, 0), (1, 0, 1), (1, 0, 0), (0, 1, 1), (0, 1, 0), (0, 0, 1), (0, 0, 0))
+
+LUCK_GRADES = ("大吉", "吉", "中吉", "小吉", "平", "小凶", "凶")
+
+# (卦名, 籤等, 卦辭, (初爻 ~ 上爻爻辭), 易經指引)，依文王卦序排列
+GUA_DATA = (
+    ("乾為天", "大吉", "元亨利貞。",
+     ("潛龍勿用。", "見龍在田，利見大人。", "君子終日乾乾，夕惕若厲，無咎。", "或躍在淵，無咎。", "飛龍在天，利見大人。", "亢龍有悔。"),
+     "強勢突破，但需注意姿態。"),
+    ("坤為地", "吉", "元亨，利牝馬之貞。",
+     ("履霜，堅冰至。", "直方大，不習無不利。", "含章可貞，或從王事，無成有終。", "括囊，無咎無譽。", "黃裳，元吉。", "龍戰于野，其血玄黃。"),
+     "順勢而為，包容能成大事。"),
+    ("水雷屯", "平", "元亨利貞，勿用有攸往，利建侯。",
+     ("磐桓，利居貞，利建侯。", "屯如邅如，乘馬班如，匪寇婚媾。", "即鹿無虞，惟入于林中，君子幾不如舍。", "乘馬班如，求婚媾，往吉，無不利。", "屯其膏，小貞吉，大貞凶。", "乘馬班如，泣血漣如。"),
+     "起步艱難如冷車發動，先暖機、找對夥伴再上路。"),
+    ("山水蒙", "平", "亨。匪我求童蒙，童蒙求我。",
+     ("發蒙，利用刑人，用說桎梏。", "包蒙吉，納婦吉，子克家。", "勿用取女，見金夫，不有躬，無攸利。", "困蒙，吝。", "童蒙，吉。", "擊蒙，不利為寇，利禦寇。"),
+     "方向未明，虛心請教老司機，先學會看路再加速。"),
+    ("水天需", "中吉", "有孚，光亨，貞吉，利涉大川。",
+     ("需于郊，利用恆，無咎。", "需于沙，小有言，終吉。", "需于泥，致寇至。", "需于血，出自穴。", "需于酒食，貞吉。", "入于穴，有不速之客三人來，敬之終吉。"),
+     "時機未到，耐心等綠燈，養精蓄銳自然順行。"),
+    ("天水訟", "小凶", "有孚窒惕，中吉，終凶。利見大人，不利涉大川。",
+     ("不永所事，小有言，終吉。", "不克訟，歸而逋，其邑人三百戶無眚。", "食舊德，貞厲，終吉。", "不克訟，復即命渝，安貞吉。", "訟，元吉。", "或錫之鞶帶，終朝三褫之。"),
+     "易起爭執，別和人飆車鬥氣，退一步海闊天空。"),
+    ("地水師", "中吉", "貞，丈人吉，無咎。",
+     ("師出以律，否臧凶。", "在師中，吉無咎，王三錫命。", "師或輿尸，凶。", "師左次，無咎。", "田有禽，利執言，無咎。長子帥師，弟子輿尸，貞凶。", "大君有命，開國承家，小人勿用。"),
+     "團隊作戰，紀律與領導力是勝出關鍵。"),
+    ("水地比", "吉", "吉。原筮元永貞，無咎。不寧方來，後夫凶。",
+     ("有孚比之，無咎。", "比之自內，貞吉。", "比之匪人。", "外比之，貞吉。", "顯比，王用三驅，失前禽。", "比之無首，凶。"),
+     "親近志同道合的車友，結盟能讓路更好走。"),
+    ("風天小畜", "小吉", "亨。密雲不雨，自我西郊。",
+     ("復自道，何其咎，吉。", "牽復，吉。", "輿說輻，夫妻反目。", "有孚，血去惕出，無咎。", "有孚攣如，富以其鄰。", "既雨既處，尚德載，婦貞厲，月幾望，君子征凶。"),
+     "小有積蓄但力量未足，先累積里程，勿急著衝刺。"),
+    ("天澤履", "小吉", "履虎尾，不咥人，亨。",
+     ("素履，往無咎。", "履道坦坦，幽人貞吉。", "眇能視，跛能履，履虎尾，咥人，凶。", "履虎尾，愬愬終吉。", "夬履，貞厲。", "視履考祥，其旋元吉。"),
+     "如履薄冰，謹慎駕駛、守規矩，危機自然化解。"),
+    ("地天泰", "大吉", "小往大來，吉亨。",
+     ("拔茅茹，以其彙，征吉。", "包荒，用馮河，不遐遺，朋亡，得尚于中行。", "無平不陂，無往不復，艱貞無咎。", "翩翩不富，以其鄰，不戒以孚。", "帝乙歸妹，以祉元吉。", "城復于隍，勿用師，自邑告命，貞吝。"),
+     "天地交泰，順風順水，正是全速前進的好時機。"),
+    ("天地否", "凶", "否之匪人，不利君子貞，大往小來。",
+     ("拔茅茹，以其彙，貞吉亨。", "包承，小人吉，大人否亨。", "包羞。", "有命無咎，疇離祉。", "休否，大人吉。其亡其亡，繫于苞桑。", "傾否，先否後喜。"),
+     "上下不通、路況閉塞，宜低調守成，等待轉機。"),
+    ("天火同人", "吉", "同人于野，亨。利涉大川，利君子貞。",
+     ("同人于門，無咎。", "同人于宗，吝。", "伏戎于莽，升其高陵，三歲不興。", "乘其墉，弗克攻，吉。", "同人先號咷而後笑，大師克相遇。", "同人于郊，無悔。"),
+     "廣結善緣、開放合作，車隊同心其利斷金。"),
+    ("火天大有", "大吉", "元亨。",
+     ("無交害，匪咎，艱則無咎。", "大車以載，有攸往，無咎。", "公用亨于天子，小人弗克。", "匪其彭，無咎。", "厥孚交如，威如，吉。", "自天祐之，吉無不利。"),
+     "資源豐富，貴人顯現，適合大展鴻圖。"),
+    ("地山謙", "吉", "亨，君子有終。",
+     ("謙謙君子，用涉大川，吉。", "鳴謙，貞吉。", "勞謙君子，有終吉。", "無不利，撝謙。", "不富以其鄰，利用侵伐，無不利。", "鳴謙，利用行師，征邑國。"),
+     "低調謙虛，反而能獲得最大利益。"),
+    ("雷地豫", "中吉", "利建侯行師。",
+     ("鳴豫，凶。", "介于石，不終日，貞吉。", "盱豫，悔。遲有悔。", "由豫，大有得，勿疑，朋盍簪。", "貞疾，恆不死。", "冥豫，成有渝，無咎。"),
+     "心情愉悅、氣勢正旺，但別樂極忘了看路。"),
+    ("澤雷隨", "吉", "元亨利貞，無咎。",
+     ("官有渝，貞吉，出門交有功。", "係小子，失丈夫。", "係丈夫，失小子，隨有求得，利居貞。", "隨有獲，貞凶。有孚在道，以明，何咎。", "孚于嘉，吉。", "拘係之，乃從維之，王用亨于西山。"),
+     "順應潮流、跟對車隊，靈活變換車道。"),
+    ("山風蠱", "平", "元亨，利涉大川。先甲三日，後甲三日。",
+     ("幹父之蠱，有子，考無咎，厲終吉。", "幹母之蠱，不可貞。", "幹父之蠱，小有悔，無大咎。", "裕父之蠱，往見吝。", "幹父之蠱，用譽。", "不事王侯，高尚其事。"),
+     "舊問題該大保養了，除鏽整修後才能重新上路。"),
+    ("地澤臨", "吉", "元亨利貞，至于八月有凶。",
+     ("咸臨，貞吉。", "咸臨，吉無不利。", "甘臨，無攸利，既憂之，無咎。", "至臨，無咎。", "知臨，大君之宜，吉。", "敦臨，吉無咎。"),
+     "好運正在靠近，主動出擊、親自督導更見成效。"),
+    ("風地觀", "平", "盥而不薦，有孚顒若。",
+     ("童觀，小人無咎，君子吝。", "闚觀，利女貞。", "觀我生，進退。", "觀國之光，利用賓于王。", "觀我生，君子無咎。", "觀其生，君子無咎。"),
+     "先觀察路況與全局，看清楚再決定方向。"),
+    ("火雷噬嗑", "小吉", "亨，利用獄。",
+     ("屨校滅趾，無咎。", "噬膚滅鼻，無咎。", "噬腊肉，遇毒，小吝，無咎。", "噬乾胏，得金矢，利艱貞，吉。", "噬乾肉，得黃金，貞厲，無咎。", "何校滅耳，凶。"),
+     "有障礙卡在中間，果斷排除，路才會通。"),
+    ("山火賁", "小吉", "亨，小利有攸往。",
+     ("賁其趾，舍車而徒。", "賁其須。", "賁如濡如，永貞吉。", "賁如皤如，白馬翰如，匪寇婚媾。", "賁于丘園，束帛戔戔，吝，終吉。", "白賁，無咎。"),
+     "外觀包裝有加分，但內在引擎才是真本事。"),
+    ("山地剝", "凶", "不利有攸往。",
+     ("剝床以足，蔑貞凶。", "剝床以辨，蔑貞凶。", "剝之，無咎。", "剝床以膚，凶。", "貫魚，以宮人寵，無不利。", "碩果不食，君子得輿，小人剝廬。"),
+     "能量正在流失，減少消耗、保住核心零件。"),
+    ("地雷復", "吉", "亨。出入無疾，朋來無咎。反復其道，七日來復，利有攸往。",
+     ("不遠復，無祇悔，元吉。", "休復，吉。", "頻復，厲無咎。", "中行獨復。", "敦復，無悔。", "迷復，凶，有災眚。"),
+     "一陽來復，重新發動引擎，回到正軌就是好運。"),
+    ("天雷無妄", "平", "元亨利貞。其匪正有眚，不利有攸往。",
+     ("無妄，往吉。", "不耕穫，不菑畬，則利有攸往。", "無妄之災，或繫之牛，行人之得，邑人之災。", "可貞，無咎。", "無妄之疾，勿藥有喜。", "無妄，行有眚，無攸利。"),
+     "真誠行事、不投機取巧，意外自然繞道。"),
+    ("山天大畜", "吉", "利貞，不家食吉，利涉大川。",
+     ("有厲，利已。", "輿說輹。", "良馬逐，利艱貞，曰閑輿衛，利有攸往。", "童牛之牿，元吉。", "豶豕之牙，吉。", "何天之衢，亨。"),
+     "蓄積實力的階段，充飽電後必能馳騁大道。"),
+    ("山雷頤", "小吉", "貞吉。觀頤，自求口實。",
+     ("舍爾靈龜，觀我朵頤，凶。", "顛頤，拂經，于丘頤，征凶。", "拂頤，貞凶，十年勿用，無攸利。", "顛頤吉，虎視眈眈，其欲逐逐，無咎。", "拂經，居貞吉，不可涉大川。", "由頤，厲吉，利涉大川。"),
+     "注意保養與飲食作息，燃料品質決定續航力。"),
+    ("澤風大過", "小凶", "棟橈，利有攸往，亨。",
+     ("藉用白茅，無咎。", "枯楊生稊，老夫得其女妻，無不利。", "棟橈，凶。", "棟隆，吉，有它吝。", "枯楊生華，老婦得其士夫，無咎無譽。", "過涉滅頂，凶，無咎。"),
+     "負載過重，小心底盤吃不消，該卸貨減壓了。"),
+    ("坎為水", "凶", "習坎，有孚，維心亨，行有尚。",
+     ("習坎，入于坎窞，凶。", "坎有險，求小得。", "來之坎坎，險且枕，入于坎窞，勿用。", "樽酒簋貳，用缶，納約自牖，終無咎。", "坎不盈，祗既平，無咎。", "係用徽纆，寘于叢棘，三歲不得，凶。"),
+     "連續坑洞路段，放慢車速、保持信心即可脫困。"),
+    ("離為火", "中吉", "利貞，亨。畜牝牛，吉。",
+     ("履錯然，敬之無咎。", "黃離，元吉。", "日昃之離，不鼓缶而歌，則大耋之嗟，凶。", "突如其來如，焚如，死如，棄如。", "出涕沱若，戚嗟若，吉。", "王用出征，有嘉折首，獲匪其醜，無咎。"),
+     "光芒四射、引人注目，依附正道才能持續發光。"),
+    ("澤山咸", "吉", "亨，利貞，取女吉。",
+     ("咸其拇。", "咸其腓，凶，居吉。", "咸其股，執其隨，往吝。", "貞吉悔亡，憧憧往來，朋從爾思。", "咸其脢，無悔。", "咸其輔頰舌。"),
+     "感應力強、人緣極佳，真心交流能換來好感。"),
+    ("雷風恆", "中吉", "亨，無咎，利貞，利有攸往。",
+     ("浚恆，貞凶，無攸利。", "悔亡。", "不恆其德，或承之羞，貞吝。", "田無禽。", "恆其德，貞，婦人吉，夫子凶。", "振恆，凶。"),
+     "持之以恆、定速巡航，長跑比衝刺更重要。"),
+    ("天山遯", "平", "亨，小利貞。",
+     ("遯尾，厲，勿用有攸往。", "執之用黃牛之革，莫之勝說。", "係遯，有疾厲，畜臣妾吉。", "好遯，君子吉，小人否。", "嘉遯，貞吉。", "肥遯，無不利。"),
+     "適時退出是智慧，先避開擁擠車流再找新路線。"),
+    ("雷天大壯", "中吉", "利貞。",
+     ("壯于趾，征凶，有孚。", "貞吉。", "小人用壯，君子用罔，貞厲。羝羊觸藩，羸其角。", "貞吉悔亡，藩決不羸，壯于大輿之輹。", "喪羊于易，無悔。", "羝羊觸藩，不能退，不能遂，無攸利，艱則吉。"),
+     "馬力強大，但別硬闖紅燈，剛中帶柔才能走遠。"),
+    ("火地晉", "大吉", "康侯用錫馬蕃庶，晝日三接。",
+     ("晉如摧如，貞吉。罔孚，裕無咎。", "晉如愁如，貞吉。受茲介福，于其王母。", "眾允，悔亡。", "晉如鼫鼠，貞厲。", "悔亡，失得勿恤，往吉無不利。", "晉其角，維用伐邑，厲吉無咎，貞吝。"),
+     "旭日東升，步步晉升，正是展現實力的好時機。"),
+    ("地火明夷", "小凶", "利艱貞。",
+     ("明夷于飛，垂其翼。君子于行，三日不食。", "明夷，夷于左股，用拯馬壯，吉。", "明夷于南狩，得其大首，不可疾貞。", "入于左腹，獲明夷之心，于出門庭。", "箕子之明夷，利貞。", "不明晦，初登于天，後入于地。"),
+     "光明受阻，宜韜光養晦，關掉遠光燈低調前行。"),
+    ("風火家人", "吉", "利女貞。",
+     ("閑有家，悔亡。", "無攸遂，在中饋，貞吉。", "家人嗃嗃，悔厲吉；婦子嘻嘻，終吝。", "富家，大吉。", "王假有家，勿恤，吉。", "有孚威如，終吉。"),
+     "家庭與內部團隊是後盾，先顧好自家車庫。"),
+    ("火澤睽", "小凶", "小事吉。",
+     ("悔亡，喪馬勿逐，自復。見惡人，無咎。", "遇主于巷，無咎。", "見輿曳，其牛掣，其人天且劓，無初有終。", "睽孤，遇元夫，交孚，厲無咎。", "悔亡，厥宗噬膚，往何咎。", "睽孤，見豕負塗，載鬼一車，先張之弧，後說之弧。"),
+     "意見分歧、各開各的，求同存異才能會合。"),
+    ("水山蹇", "凶", "利西南，不利東北；利見大人，貞吉。",
+     ("往蹇來譽。", "王臣蹇蹇，匪躬之故。", "往蹇來反。", "往蹇來連。", "大蹇朋來。", "往蹇來碩，吉，利見大人。"),
+     "前方路況險阻，暫停反省、尋求援助再出發。"),
+    ("雷水解", "吉", "利西南，無所往，其來復吉。有攸往，夙吉。",
+     ("無咎。", "田獲三狐，得黃矢，貞吉。", "負且乘，致寇至，貞吝。", "解而拇，朋至斯孚。", "君子維有解，吉，有孚于小人。", "公用射隼于高墉之上，獲之，無不利。"),
+     "塞車終於解除，把握時機迅速脫困。"),
+    ("山澤損", "平", "有孚，元吉，無咎，可貞，利有攸往。",
+     ("已事遄往，無咎，酌損之。", "利貞，征凶，弗損益之。", "三人行則損一人，一人行則得其友。", "損其疾，使遄有喜，無咎。", "或益之十朋之龜，弗克違，元吉。", "弗損益之，無咎，貞吉，利有攸往，得臣無家。"),
+     "先捨後得，減掉多餘配備，車身更輕更快。"),
+    ("風雷益", "大吉", "利有攸往，利涉大川。",
+     ("利用為大作，元吉，無咎。", "或益之十朋之龜，弗克違，永貞吉。", "益之用凶事，無咎。有孚中行，告公用圭。", "中行告公從，利用為依遷國。", "有孚惠心，勿問元吉。", "莫益之，或擊之，立心勿恆，凶。"),
+     "貴人加持、資源湧入，正是擴張升級的時刻。"),
+    ("澤天夬", "中吉", "揚于王庭，孚號有厲。告自邑，不利即戎，利有攸往。",
+     ("壯于前趾，往不勝為咎。", "惕號，莫夜有戎，勿恤。", "壯于頄，有凶。君子夬夬，獨行遇雨，若濡有慍，無咎。", "臀無膚，其行次且。牽羊悔亡，聞言不信。", "莧陸夬夬，中行無咎。", "無號，終有凶。"),
+     "當機立斷，果決切換車道，但要記得打方向燈。"),
+    ("天風姤", "小凶", "女壯，勿用取女。",
+     ("繫于金柅，貞吉。有攸往，見凶，羸豕孚蹢躅。", "包有魚，無咎，不利賓。", "臀無膚，其行次且，厲，無大咎。", "包無魚，起凶。", "以杞包瓜，含章，有隕自天。", "姤其角，吝，無咎。"),
+     "不期而遇的誘惑多，看清來車再決定是否併行。"),
+    ("澤地萃", "吉", "亨。王假有廟，利見大人，亨，利貞。用大牲吉，利有攸往。",
+     ("有孚不終，乃亂乃萃，若號，一握為笑，勿恤，往無咎。", "引吉，無咎，孚乃利用禴。", "萃如嗟如，無攸利，往無咎，小吝。", "大吉，無咎。", "萃有位，無咎。匪孚，元永貞，悔亡。", "齎咨涕洟，無咎。"),
+     "人氣匯聚，適合舉辦聚會或組建車隊。"),
+    ("地風升", "大吉", "元亨，用見大人，勿恤，南征吉。",
+     ("允升，大吉。", "孚乃利用禴，無咎。", "升虛邑。", "王用亨于岐山，吉，無咎。", "貞吉，升階。", "冥升，利于不息之貞。"),
+     "穩步爬坡，一路升檔，努力終將被看見。"),
+    ("澤水困", "凶", "亨，貞，大人吉，無咎，有言不信。",
+     ("臀困于株木，入于幽谷，三歲不覿。", "困于酒食，朱紱方來，利用亨祀，征凶，無咎。", "困于石，據于蒺藜，入于其宮，不見其妻，凶。", "來徐徐，困于金車，吝，有終。", "劓刖，困于赤紱，乃徐有說，利用祭祀。", "困于葛藟，于臲卼，曰動悔，有悔，征吉。"),
+     "油將見底、受困其中，少說多做，守住信念等待救援。"),
+    ("水風井", "平", "改邑不改井，無喪無得，往來井井。",
+     ("井泥不食，舊井無禽。", "井谷射鮒，甕敝漏。", "井渫不食，為我心惻，可用汲，王明，並受其福。", "井甃，無咎。", "井洌，寒泉食。", "井收勿幕，有孚元吉。"),
+     "回歸本源、修好基本功，穩定的油源最可靠。"),
+    ("澤火革", "中吉", "己日乃孚，元亨利貞，悔亡。",
+     ("鞏用黃牛之革。", "己日乃革之，征吉，無咎。", "征凶，貞厲，革言三就，有孚。", "悔亡，有孚改命，吉。", "大人虎變，未占有孚。", "君子豹變，小人革面，征凶，居貞吉。"),
+     "改革換代的時機已到，大膽升級你的配備。"),
+    ("火風鼎", "大吉", "元吉，亨。",
+     ("鼎顛趾，利出否，得妾以其子，無咎。", "鼎有實，我仇有疾，不我能即，吉。", "鼎耳革，其行塞，雉膏不食，方雨虧悔，終吉。", "鼎折足，覆公餗，其形渥，凶。", "鼎黃耳金鉉，利貞。", "鼎玉鉉，大吉，無不利。"),
+     "除舊布新、地位穩固，適合開創新局。"),
+    ("震為雷", "小吉", "亨。震來虩虩，笑言啞啞。震驚百里，不喪匕鬯。",
+     ("震來虩虩，後笑言啞啞，吉。", "震來厲，億喪貝，躋于九陵，勿逐，七日得。", "震蘇蘇，震行無眚。", "震遂泥。", "震往來厲，億無喪，有事。", "震索索，視矍矍，征凶。震不于其躬，于其鄰，無咎。婚媾有言。"),
+     "突發震盪只是虛驚，沉著應對反而能成長。"),
+    ("艮為山", "平", "艮其背，不獲其身，行其庭，不見其人，無咎。",
+     ("艮其趾，無咎，利永貞。", "艮其腓，不拯其隨，其心不快。", "艮其限，列其夤，厲薰心。", "艮其身，無咎。", "艮其輔，言有序，悔亡。", "敦艮，吉。"),
+     "該停則停，靠邊休息、沉澱思緒再出發。"),
+    ("風山漸", "吉", "女歸吉，利貞。",
+     ("鴻漸于干，小子厲，有言，無咎。", "鴻漸于磐，飲食衎衎，吉。", "鴻漸于陸，夫征不復，婦孕不育，凶。利禦寇。", "鴻漸于木，或得其桷，無咎。", "鴻漸于陵，婦三歲不孕，終莫之勝，吉。", "鴻漸于陸，其羽可用為儀，吉。"),
+     "循序漸進、按部就班，慢慢加速最安全。"),
+    ("雷澤歸妹", "小凶", "征凶，無攸利。",
+     ("歸妹以娣，跛能履，征吉。", "眇能視，利幽人之貞。", "歸妹以須，反歸以娣。", "歸妹愆期，遲歸有時。", "帝乙歸妹，其君之袂，不如其娣之袂良，月幾望，吉。", "女承筐無實，士刲羊無血，無攸利。"),
+     "名不正則路不順，確認好位置與角色再上路。"),
+    ("雷火豐", "中吉", "亨，王假之，勿憂，宜日中。",
+     ("遇其配主，雖旬無咎，往有尚。", "豐其蔀，日中見斗，往得疑疾，有孚發若，吉。", "豐其沛，日中見沫，折其右肱，無咎。", "豐其蔀，日中見斗，遇其夷主，吉。", "來章，有慶譽，吉。", "豐其屋，蔀其家，闚其戶，闃其無人，三歲不覿，凶。"),
+     "盛況空前、收穫豐碩，趁日正當中好好把握。"),
+    ("火山旅", "小吉", "小亨，旅貞吉。",
+     ("旅瑣瑣，斯其所取災。", "旅即次，懷其資，得童僕貞。", "旅焚其次，喪其童僕，貞厲。", "旅于處，得其資斧，我心不快。", "射雉一矢亡，終以譽命。", "鳥焚其巢，旅人先笑後號咷，喪牛于易，凶。"),
+     "在外奔波的旅程，保持謙和、照顧好行李。"),
+    ("巽為風", "小吉", "小亨，利有攸往，利見大人。",
+     ("進退，利武人之貞。", "巽在床下，用史巫紛若，吉無咎。", "頻巽，吝。", "悔亡，田獲三品。", "貞吉悔亡，無不利。無初有終，先庚三日，後庚三日，吉。", "巽在床下，喪其資斧，貞凶。"),
+     "順風而行、柔性溝通，無孔不入地推進計畫。"),
+    ("兌為澤", "吉", "亨，利貞。",
+     ("和兌，吉。", "孚兌，吉，悔亡。", "來兌，凶。", "商兌未寧，介疾有喜。", "孚于剝，有厲。", "引兌。"),
+     "喜悅溝通、笑臉迎人，好心情帶來好人緣。"),
+    ("風水渙", "平", "亨。王假有廟，利涉大川，利貞。",
+     ("用拯馬壯，吉。", "渙奔其机，悔亡。", "渙其躬，無悔。", "渙其群，元吉。渙有丘，匪夷所思。", "渙汗其大號，渙王居，無咎。", "渙其血，去逖出，無咎。"),
+     "人心渙散時，重新凝聚目標，車隊才不會走散。"),
+    ("水澤節", "小吉", "亨。苦節不可貞。",
+     ("不出戶庭，無咎。", "不出門庭，凶。", "不節若，則嗟若，無咎。", "安節，亨。", "甘節，吉，往有尚。", "苦節，貞凶，悔亡。"),
+     "控制油門與開銷，有節制的駕駛最省油。"),
+    ("風澤中孚", "吉", "豚魚吉，利涉大川，利貞。",
+     ("虞吉，有它不燕。", "鳴鶴在陰，其子和之，我有好爵，吾與爾靡之。", "得敵，或鼓或罷，或泣或歌。", "月幾望，馬匹亡，無咎。", "有孚攣如，無咎。", "翰音登于天，貞凶。"),
+     "誠信是最好的通行證，真心待人必得回應。"),
+    ("雷山小過", "平", "亨，利貞，可小事，不可大事。飛鳥遺之音，不宜上宜下，大吉。",
+     ("飛鳥以凶。", "過其祖，遇其妣；不及其君，遇其臣，無咎。", "弗過防之，從或戕之，凶。", "無咎，弗過遇之，往厲必戒，勿用永貞。", "密雲不雨，自我西郊，公弋取彼在穴。", "弗遇過之，飛鳥離之，凶，是謂災眚。"),
+     "宜小不宜大，處理日常小事，別急著上高速。"),
+    ("水火既濟", "中吉", "亨小，利貞，初吉終亂。",
+     ("曳其輪，濡其尾，無咎。", "婦喪其茀，勿逐，七日得。", "高宗伐鬼方，三年克之，小人勿用。", "繻有衣袽，終日戒。", "東鄰殺牛，不如西鄰之禴祭，實受其福。", "濡其首，厲。"),
+     "目前狀態極佳，但要小心物極必反。"),
+    ("火水未濟", "吉", "亨，小狐汔濟，濡其尾，無攸利。",
+     ("濡其尾，吝。", "曳其輪，貞吉。", "未濟，征凶，利涉大川。", "貞吉悔亡，震用伐鬼方，三年有賞于大國。", "貞吉無悔，君子之光，有孚，吉。", "有孚于飲酒，無咎，濡其首，有孚失是。"),
+     "充滿無限可能，是將想法落地的好時機。"),
+)
+
+LINE_POSITIONS = ("初", "二", "三", "四", "五", "上")
+
+
+def line_label(position, yang):
+    """ 爻題：position 1~6 (由下而上)，例如 初九、六二、上六 """
+    number = "九" if yang else "六"
+    if position in (1, 6):
+        return LINE_POSITIONS[position - 1] + number
+    return number + LINE_POSITIONS[position - 1]
+
+
+@dataclass(frozen=True)
+class Hexagram:
+    number: int          # 文王卦序 1~64
+    name: str
+    upper: int           # 先天卦數 1~8
+    lower: int
+    lines: tuple         # 六爻陰陽 (由下而上，1 = 陽爻)
+    judgment: str
+    line_texts: tuple    # (爻題, 爻辭) × 6
+    luck: str
+    advice: str
+
+    @property
+    def symbol(self):
+        return TRIGRAM_SYMBOLS[self.upper - 1] + TRIGRAM_SYMBOLS[self.lower - 1]
+
+
+def _build_hexagrams():
+    """ 由 GUA_DATA 建立 (上卦, 下卦) 與六爻兩種索引 """
+    by_trigrams, by_lines = {}, {}
+    for number, (name, luck, judgment, texts, advice) in enumerate(GUA_DATA, 1):
+        if name[1] == "為":   # 八純卦：X為Y，上下卦皆為 Y
+            upper = lower = TRIGRAM_NATURES.index(name[2]) + 1
+        else:
+            upper, lower = TRIGRAM_NATURES.index(name[0]) + 1, TRIGRAM_NATURES.index(name[1]) + 1
+        lines = TRIGRAM_LINES[lower - 1] + TRIGRAM_LINES[upper - 1]
+        hexagram = Hexagram(
+            number=number, name=name, upper=upper, lower=lower, lines=lines, judgment=judgment,
+            line_texts=tuple((line_label(i, yang), text) for i, (yang, text) in enumerate(zip(lines, texts), 1)),
+            luck=luck, advice=advice,
+        )
+        by_trigrams[upper, lower] = hexagram
+        by_lines[lines] = hexagram
+    if len(by_trigrams) != 64:
+        raise ValueError(f"GUA_DATA covers {len(by_trigrams)} of 64 hexagrams")
+    return by_trigrams, by_lines
+
+HEXAGRAMS, HEXAGRAMS_BY_LINES = _build_hexagrams()
+
+
+def get_hexagram(upper, lower):
+    """ 以先天卦數 (1~8) 取卦 """
+    return HEXAGRAMS[upper, lower]
+
+def changed_hexagram(hexagram, moving):
+    """ 之卦：動爻 (1~6) 陰陽互換 """
+    lines = list(hexagram.lines)
+    lines[moving - 1] ^= 1
+    return HEXAGRAMS_BY_LINES[tuple(lines)]
+
+def mutual_hexagram(hexagram):
+    """ 互卦：二三四爻為下卦、三四五爻為上卦 """
+    lines = hexagram.lines
+    return HEXAGRAMS_BY_LINES[lines[1:4] + lines[2:5]]
+
+
+@dataclass(frozen=True)
+class Reading:
+    main: Hexagram       # 本卦
+    moving: int          # 動爻 1~6
+    changed: Hexagram    # 之卦
+    mutual: Hexagram     # 互卦
+
+    @property
+    def moving_line(self):
+        """ (爻題, 爻辭) """
+        return self.main.line_texts[self.moving - 1]
+
+
+def cast(input_number, year_num, month_num, day_num, hour_num):
+    """
+    梅花易數起卦。
+    input_number: 意念數 (意念字的字碼總和)
+    year_num / hour_num: 年支、時支數 (子 = 1 ... 亥 = 12)；month_num / day_num: 農曆月、日
+    """
+    base = input_number + year_num + month_num + day_num
+    upper = base % 8 or 8
+    lower = (base + hour_num) % 8 or 8
+    moving = (base + hour_num) % 6 or 6
+    main = HEXAGRAMS[upper, lower]
+    return Reading(main=main, moving=moving, changed=changed_hexagram(main, moving), mutual=mutual_hexagram(main))
@@ -0,0 +1,283 @@
+# ==========================================
+# AliVerse 命盤反查 (倒排索引)
+# ==========================================
+"""
+由預先排盤表 (bazi_table) 建立「屬性值 → 出生時段 ID」的倒排索引，
+回答「哪些生日是壬水日主且為從強格」「哪些生日的車相是火水卦」這類問題，不必逐盤掃描。
+
+時段 ID 即排盤表的列索引：(日期序數 - 1900/01/01) × 13 + 時辰選項索引。
+每個屬性值的 ID 清單以較省空間的方式壓縮：連續區段 (起點, 長度) 或差值 (最小整數型別)。
+
+查詢條件：
+    {"day_gan": "壬", "base_type": "🛡️ 重裝坦克"}          不同屬性之間為 AND
+    {"hexagram": ["火水卦", "山地卦"]}                     同一屬性的多個值為 OR
+    {"score": (80, 100)}                                   分數區間 (含兩端)
+    [{...}, {...}]                                         多組條件之間為 OR
+
+    python bazi_index.py query day_gan=壬 "base_type=🛡️ 重裝坦克" score=80-100 [or hexagram=火水卦 ...] [--limit 20]
+    python bazi_index.py values
+"""
+import argparse
+import datetime
+import functools
+import sys
+import time
+
+import numpy as np
+
+from bazi_engine import (
+    BRANCHES, ELEMENT_CODE_TABLE, ELEMENTS, HOUR_OPTIONS, STEMS, STRENGTH_LEVELS, WUXING_MAP, determine_fates_guide,
+    get_chart_table, get_real_car_model, score_strength_array
+)
+from bazi_render import get_aliverse_car_matrix
+from bazi_table import COL, FIRST_DATE, N_ROWS, N_SLOTS
+
+PILLAR_ATTRIBUTES = ("year_gan", "year_zhi", "month_gan", "month_zhi", "day_gan", "day_zhi", "time_gan", "time_zhi")
+ATTRIBUTES = PILLAR_ATTRIBUTES + ("day_master", "score", "base_type", "car_model", "joyful_gods", "hexagram")
+SCORE_VALUES = tuple(range(101))
+
+
+def _smallest_uint(max_value):
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+class PostingList:
+    """
+    壓縮後的已排序 ID 清單。依資料型態選擇較小的編碼：
+        runs: 連續區段的起點 (uint32) 與長度 (年柱、月柱等大段連續的屬性)
+        gaps: 第一個 ID 與相鄰差值 (時柱等等距分散的屬性)
+    """
+    __slots__ = ("count", "kind", "head", "body")
+
+    def __init__(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        self.count = len(ids)
+        if not self.count:
+            self.kind, self.head, self.body = "gaps", np.empty(0, np.uint32), np.empty(0, np.uint8)
+            return
+        breaks = np.flatnonzero(np.diff(ids) != 1) + 1
+        starts = ids[np.r_[0, breaks]].astype(np.uint32)
+        lengths = np.diff(np.r_[0, breaks, self.count])
+        lengths = lengths.astype(_smallest_uint(lengths.max()))
+        gaps = np.diff(ids)
+        gaps = gaps.astype(_smallest_uint(gaps.max() if len(gaps) else 0))
+        if starts.nbytes + lengths.nbytes <= 4 + gaps.nbytes:
+            self.kind, self.head, self.body = "runs", starts, lengths
+        else:
+            self.kind, self.head, self.body = "gaps", ids[:1].astype(np.uint32), gaps
+
+    @property
+    def nbytes(self):
+        return self.head.nbytes + self.body.nbytes
+
+    def decode(self):
+        """ 還原為已排序的 int64 ID 陣列 """
+        if self.kind == "runs":
+            lengths = self.body.astype(np.int64)
+            offsets = np.cumsum(lengths) - lengths
+            return np.arange(self.count, dtype=np.int64) + np.repeat(self.head.astype(np.int64) - offsets, lengths)
+        ids = np.empty(self.count, dtype=np.int64)
+        if self.count:
+            ids[0] = self.head[0]
+            np.cumsum(self.body, dtype=np.int64, out=ids[1:])
+            ids[1:] += ids[0]
+        return ids
+
+
+def _label_codes(keys, labels, label_of):
+    """ 小型組合表 → 標籤代碼查表陣列；labels 依第一次出現的順序收集 """
+    table = np.empty(keys, dtype=np.int16)
+    for idx in np.ndindex(*keys):
+        label = label_of(*idx)
+        if label is None:
+            table[idx] = -1
+            continue
+        if label not in labels:
+            labels.append(label)
+        table[idx] = labels.index(label)
+    return table
+
+def attribute_codes(rows, first_row=0):
+    """
+    排盤表的列 (可為從 first_row 起的一段) → {屬性: (labels, 每列的標籤代碼陣列)}。
+    車型、喜用神與車相由小型組合表 (上下卦數、日主 × 出生月) 向量化查得，不必逐盤呼叫。
+    """
+    rows = np.asarray(rows)
+    codes = {}
+    for i, attr in enumerate(PILLAR_ATTRIBUTES):
+        codes[attr] = (tuple(STEMS if i % 2 == 0 else BRANCHES), rows[:, i])
+    codes["day_master"] = (ELEMENTS, ELEMENT_CODE_TABLE[rows[:, COL["day_gan"]]])
+    codes["score"] = (SCORE_VALUES, rows[:, COL["score"]])
+    _, base_codes = score_strength_array(rows[:, :8])
+    codes["base_type"] = (tuple(level[1] for level in STRENGTH_LEVELS), base_codes)
+
+    car_labels = []
+    car_table = _label_codes((9, 9), car_labels, lambda u, l: get_real_car_model(u, l) if u and l else None)
+    codes["car_model"] = (tuple(car_labels), car_table[rows[:, COL["upper_num"]], rows[:, COL["lower_num"]]])
+
+    # 喜用神依國曆出生月判定 (compute_chart 傳入的是國曆月份)
+    months = birth_months(first_row, len(rows))
+    day_gans = rows[:, COL["day_gan"]]
+    joyful_labels = []
+    joyful_table = _label_codes(
+        (10, 13), joyful_labels,
+        lambda g, m: "、".join(determine_fates_guide(WUXING_MAP[STEMS[g]], m)[0]) if m else None
+    )
+    codes["joyful_gods"] = (tuple(joyful_labels), joyful_table[day_gans, months])
+    hex_labels = []
+    hex_table = _label_codes(
+        (10, 13), hex_labels,
+        lambda g, m: get_aliverse_car_matrix(STEMS[g], determine_fates_guide(WUXING_MAP[STEMS[g]], m)[0][0])["hex_name"] if m else None
+    )
+    codes["hexagram"] = (tuple(hex_labels), hex_table[day_gans, months])
+    return codes
+
+def birth_months(first_row, n_rows):
+    """ 時段 ID 區間 → 國曆出生月 (1~12) 陣列 """
+    ids = np.arange(first_row, first_row + n_rows)
+    days = np.datetime64(FIRST_DATE) + (ids // N_SLOTS).astype("timedelta64[D]")
+    return days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+
+class PatternIndex:
+    """ 屬性值 → PostingList 的倒排索引 """
+
+    def __init__(self, table):
+        self.labels = {}
+        self.postings = {}
+        for attr, (labels, values) in attribute_codes(table.rows).items():
+            values = np.asarray(values, dtype=np.int64)
+            order = np.argsort(values, kind="stable")
+            counts = np.bincount(values, minlength=len(labels))
+            self.labels[attr] = labels
+            self.postings[attr] = [PostingList(ids) for ids in np.split(order, np.cumsum(counts)[:-1])]
+
+    @property
+    def nbytes(self):
+        return sum(p.nbytes for lists in self.postings.values() for p in lists)
+
+    def counts(self, attr):
+        """ {屬性值: 時段數} """
+        return {label: p.count for label, p in zip(self.labels[attr], self.postings[attr])}
+
+    def _lists(self, attr, value):
+        """ 單一屬性條件 → 要 OR 起來的 PostingList；值不合法時拋出 ValueError """
+        if attr not in self.postings:
+            raise ValueError(f"unknown attribute: {attr} (expected one of {', '.join(ATTRIBUTES)})")
+        labels = self.labels[attr]
+        if attr == "score" and isinstance(value, tuple) and len(value) == 2:
+            lo, hi = max(int(value[0]), 0), min(int(value[1]), len(labels) - 1)
+            return self.postings[attr][lo:hi + 1]
+        values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        lists = []
+        for v in values:
+            v = int(v) if attr == "score" else v
+            if v not in labels:
+                raise ValueError(f"unknown {attr} value: {v}")
+            lists.append(self.postings[attr][labels.index(v)])
+        return lists
+
+    def _match_clause(self, clause):
+        terms = sorted((self._lists(attr, value) for attr, value in clause.items()), key=lambda ls: sum(p.count for p in ls))
+        if not terms:
+            return np.arange(N_ROWS, dtype=np.int64)
+        # 由最短的條件起步，其餘條件以遮罩篩選候選 ID
+        ids = np.sort(np.concatenate([p.decode() for p in terms[0]])) if len(terms[0]) > 1 else (
+            terms[0][0].decode() if terms[0] else np.empty(0, np.int64)
+        )
+        mask = np.zeros(N_ROWS, dtype=bool)
+        for lists in terms[1:]:
+            if not len(ids):
+                break
+            mask[:] = False
+            for p in lists:
+                mask[p.decode()] = True
+            ids = ids[mask[ids]]
+        return ids
+
+    def query(self, where):
+        """
+        where: 條件 dict，或 dict 的 list (之間為 OR)。
+        return: 已排序的時段 ID 陣列
+        """
+        clauses = [where] if isinstance(where, dict) else list(where)
+        if len(clauses) == 1:
+            return self._match_clause(clauses[0])
+        return np.unique(np.concatenate([self._match_clause(c) for c in clauses]))
+
+
+def describe(ids, table=None):
+    """ 時段 ID → list of dict (date, hour_slot, hour_option, 四柱) """
+    table = table or get_chart_table()
+    out = []
+    for idx in np.asarray(ids).tolist():
+        r = table.rows[idx].tolist()
+        out.append({
+            "date": FIRST_DATE + datetime.timedelta(days=idx // N_SLOTS),
+            "hour_slot": idx % N_SLOTS,
+            "hour_option": HOUR_OPTIONS[idx % N_SLOTS],
+            "pillars": " ".join(STEMS[r[i]] + BRANCHES[r[i + 1]] for i in range(0, 8, 2)),
+        })
+    return out
+
+@functools.lru_cache(maxsize=1)
+def get_pattern_index():
+    """ 由預先排盤表建立索引 (行程內共用)；排盤表不存在時拋出 FileNotFoundError """
+    table = get_chart_table()
+    if table is None:
+        raise FileNotFoundError("chart table not found; run `python bazi_table.py build` first")
+    return PatternIndex(table)
+
+
+def parse_condition(text):
+    """ 命令列條件 attr=v1,v2 或 score=lo-hi → (attr, value) """
+    attr, _, value = text.partition("=")
+    if attr == "score" and "-" in value:
+        lo, hi = value.split("-", 1)
+        return attr, (int(lo), int(hi))
+    values = value.split(",")
+    return attr, values if len(values) > 1 else values[0]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AliVerse 命盤反查")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_query = sub.add_parser("query", help="依條件反查出生時段")
+    p_query.add_argument("conditions", nargs="+", help="attr=value[,value...]；score=lo-hi；以 'or' 分隔多組條件")
+    p_query.add_argument("--limit", type=int, default=20)
+    sub.add_parser("values", help="列出各屬性的值與時段數")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = get_pattern_index()
+    built = time.perf_counter() - start
+    if args.command == "values":
+        for attr in ATTRIBUTES:
+            print(f"{attr}: " + "  ".join(f"{v}({n})" for v, n in index.counts(attr).items() if n))
+        print(f"index {index.nbytes / 1e6:.1f} MB, built in {built:.2f}s")
+        return 0
+
+    clauses, clause = [], {}
+    for token in args.conditions:
+        if token == "or":
+            clauses.append(clause)
+            clause = {}
+        else:
+            attr, value = parse_condition(token)
+            clause[attr] = value
+    clauses.append(clause)
+    start = time.perf_counter()
+    try:
+        ids = index.query(clauses)
+    except ValueError as e:
+        sys.exit(str(e))
+    elapsed = time.perf_counter() - start
+    for row in describe(ids[:args.limit]):
+        print(row["date"], row["hour_option"], row["pillars"])
+    print(f"{len(ids)} matches ({elapsed * 1e3:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# ==========================================
+# AliVerse 雙人相容性 (正副駕駛配對) 與名單排名
+# ==========================================
+"""
+以日主五行、喜忌神與車相矩陣上下卦評估兩人的相容性 (0 ~ 100)：
+
+    喜忌互補 40 分：對方日主五行落在我的喜用 (+) / 忌神 (-)，雙向計算
+    日主關係 30 分：相生 > 比和 > 相剋
+    車相互補 30 分：我的上卦 (開運形象 = 第一喜用神) 正是對方的下卦 (原始靈魂 = 日主五行)，雙向各 15 分
+
+每人的特徵只由 (日主天干, 喜用神, 忌神) 決定，名單依此分組建索引；
+N × M 排名只需對「查詢 × 組別」做一次向量運算，再依分數展開組內成員。
+"""
+import functools
+
+import numpy as np
+
+from bazi_engine import ELEMENTS, compute_chart
+from bazi_forecast import element_values
+from bazi_render import get_aliverse_car_matrix
+
+# 特徵欄位 (int8)：日主五行、五行喜忌值 ×5 (+1 / -1 / 0)、上卦五行、下卦五行
+FEATURE_COLUMNS = ("day_master", "v_wood", "v_fire", "v_earth", "v_metal", "v_water", "upper", "lower")
+N_FEATURES = len(FEATURE_COLUMNS)
+
+SUPPORT_POINTS = 10    # 喜忌互補：(雙向喜忌值總和 + 2) × 10 → 0 ~ 40
+# 日主關係 (對方五行 - 我的五行) % 5：比和、我生、我剋、剋我、生我
+RELATION_POINTS = np.array([20, 30, 5, 5, 30], dtype=np.int16)
+RELATION_LABELS = ("比和 (同路並行)", "相生 (你為對方加油)", "相剋 (你主導方向)", "相剋 (對方主導方向)", "相生 (對方為你加油)")
+TRIGRAM_POINTS = 15
+
+COMPAT_RATINGS = (
+    (80, "🏁 天作之合：默契滿分的冠軍車隊"),
+    (60, "🚗 良好搭檔：互補順暢，適合長途旅行"),
+    (40, "🔧 需要磨合：多溝通路線，才不會各開各的"),
+)
+COMPAT_RATING_LOW = "⚠️ 高風險組合：建議先試駕再上路"
+
+
+def chart_features(chart):
+    """ 單人特徵向量 (N_FEATURES,) int8 """
+    dm = ELEMENTS.index(chart.day_master_wx)
+    values = element_values(chart.joyful_gods, chart.taboo_gods)
+    # 車相上卦五行即第一喜用神、下卦五行即日主五行 (見 bazi_render.build_aliverse_car_matrix 的映射)
+    upper = ELEMENTS.index(chart.joyful_gods[0])
+    return np.array([dm, *values, upper, dm], dtype=np.int8)
+
+def compatibility_scores(features_a, features_b):
+    """
+    向量化相容性：features_a (M, N_FEATURES)、features_b (N, N_FEATURES) → (M, N) int16 分數矩陣。
+    """
+    a = np.asarray(features_a, dtype=np.int16)[:, None, :]
+    b = np.asarray(features_b, dtype=np.int16)[None, :, :]
+    dm_a, dm_b = a[..., 0], b[..., 0]
+    values_a, values_b = a[..., 1:6], b[..., 1:6]
+    support = (
+        np.take_along_axis(values_a, dm_b[..., None], axis=-1)[..., 0]
+        + np.take_along_axis(values_b, dm_a[..., None], axis=-1)[..., 0]
+    )
+    relation = RELATION_POINTS[(dm_b - dm_a) % 5]
+    trigram = TRIGRAM_POINTS * ((a[..., 6] == b[..., 7]).astype(np.int16) + (b[..., 6] == a[..., 7]))
+    return (support + 2) * SUPPORT_POINTS + relation + trigram
+
+def rate(score):
+    for bound, label in COMPAT_RATINGS:
+        if score >= bound:
+            return label
+    return COMPAT_RATING_LOW
+
+@functools.lru_cache(maxsize=4096)
+def compatibility(chart_a, chart_b):
+    """
+    兩人相容性報告。
+    return: dict (score, rating, support, relation, relation_label, trigram, hex_a, hex_b)
+    """
+    fa, fb = chart_features(chart_a), chart_features(chart_b)
+    score = int(compatibility_scores(fa[None], fb[None])[0, 0])
+    rel = (int(fb[0]) - int(fa[0])) % 5
+    support = (int(fa[1 + fb[0]]) + int(fb[1 + fa[0]]) + 2) * SUPPORT_POINTS
+    trigram = TRIGRAM_POINTS * (int(fa[6] == fb[7]) + int(fb[6] == fa[7]))
+    return {
+        "score": score,
+        "rating": rate(score),
+        "support": support,
+        "relation": int(RELATION_POINTS[rel]),
+        "relation_label": RELATION_LABELS[rel],
+        "trigram": trigram,
+        "hex_a": get_aliverse_car_matrix(chart_a.day_gan, chart_a.joyful_gods[0])["hex_name"],
+        "hex_b": get_aliverse_car_matrix(chart_b.day_gan, chart_b.joyful_gods[0])["hex_name"],
+    }
+
+
+def feature_key(chart):
+    """ 索引鍵：(日主天干, 喜用神, 忌神)，特徵完全由此決定 """
+    return chart.day_gan, chart.joyful_gods, chart.taboo_gods
+
+class RosterIndex:
+    """
+    名單索引：依 feature_key 分組，組別特徵預先算好。
+    rank() 對查詢 × 組別做一次向量運算，成員數再多也只影響展開名次的成本。
+    """
+
+    def __init__(self, charts, names=None):
+        groups = {}
+        for i, chart in enumerate(charts):
+            key = feature_key(chart)
+            if key not in groups:
+                groups[key] = (chart, [])
+            groups[key][1].append(i)
+        self.size = len(charts)
+        self.names = list(names) if names is not None else [str(i) for i in range(self.size)]
+        self.keys = list(groups)
+        self.members = [np.array(m, dtype=np.int64) for _, m in groups.values()]
+        self.features = np.stack([chart_features(c) for c, _ in groups.values()]) if groups else np.empty((0, N_FEATURES), np.int8)
+
+    @classmethod
+    def from_profiles(cls, profiles, names=None):
+        """ profiles: 可迭代的 (year, month, day, hour_slot, gender) """
+        return cls([compute_chart(*p) for p in profiles], names)
+
+    def group_scores(self, query_charts):
+        """ (M 位查詢者, G 組) 分數矩陣 """
+        queries = np.stack([chart_features(c) for c in query_charts])
+        return compatibility_scores(queries, self.features)
+
+    def rank(self, query_charts, top_k=10, exclude=None):
+        """
+        為每位查詢者列出分數最高的 top_k 位名單成員。
+        exclude: 與 query_charts 等長的名單索引 (查詢者本人也在名單中時排除自己)，可為 None
+        return: 每位查詢者一個 list of (名單索引, 姓名, 分數)；同分依名單順序
+        """
+        results = []
+        for q, scores in enumerate(self.group_scores(query_charts)):
+            skip = exclude[q] if exclude is not None else None
+            picked = []
+            for g in np.argsort(-scores, kind="stable"):
+                for idx in self.members[g].tolist():
+                    if idx == skip:
+                        continue
+                    picked.append((idx, self.names[idx], int(scores[g])))
+                    if len(picked) == top_k:
+                        break
+                if len(picked) == top_k:
+                    break
+            results.append(picked)
+        return results
+
+    def all_scores(self, query_charts):
+        """ 完整 (M, N) 分數矩陣 (由組別分數展開，供匯出或統計) """
+        group_scores = self.group_scores(query_charts)
+        full = np.empty((group_scores.shape[0], self.size), dtype=group_scores.dtype)
+        for g, members in enumerate(self.members):
+            full[:, members] = group_scores[:, g:g + 1]
+        return full
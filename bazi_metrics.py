@@ -0,0 +1,113 @@
+# ==========================================
+# AliVerse 分段計時 (選用，預設關閉)
+# ==========================================
+"""
+記錄頁面各邏輯階段的耗時到行程內直方圖，供運維查看 p50 / p95 / p99。
+
+    ALIVERSE_METRICS=1        啟用計時 (未設定時 start() 回傳共用的空計時器，幾乎零成本)
+    ALIVERSE_ADMIN_TOKEN=...  開啟隱藏的運維頁面：?ops=<token>
+
+用法：
+    timer = bazi_metrics.start("chart_compute")
+    ...
+    timer.stop()
+"""
+import bisect
+import json
+import math
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("ALIVERSE_METRICS") == "1"
+ADMIN_TOKEN = os.environ.get("ALIVERSE_ADMIN_TOKEN", "")
+
+# 對數刻度的桶界 (秒)：10µs ~ 60s，每桶約 +10%，百分位誤差 < 10%
+BUCKET_BOUNDS = tuple(1e-5 * 1.1 ** i for i in range(int(math.log(60 / 1e-5, 1.1)) + 2))
+
+
+class Histogram:
+    """ 固定桶界的耗時直方圖，記憶體用量與樣本數無關 """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """ 回傳第 q 百分位所在桶的上界 (秒)；最後一桶以觀測最大值代替 """
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * q / 100)
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BUCKET_BOUNDS[i], self.max) if i < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        ms = 1e3
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * ms, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * ms, 3),
+            "p95_ms": round(self.percentile(95) * ms, 3),
+            "p99_ms": round(self.percentile(99) * ms, 3),
+            "max_ms": round(self.max * ms, 3),
+        }
+
+
+_lock = threading.Lock()
+_histograms = {}
+
+def record(name, seconds):
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(seconds)
+
+
+class _Timer:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+        self.t0 = time.perf_counter()
+
+    def stop(self):
+        record(self.name, time.perf_counter() - self.t0)
+
+class _NullTimer:
+    __slots__ = ()
+
+    def stop(self):
+        pass
+
+_NULL_TIMER = _NullTimer()
+
+def start(name):
+    """ 開始計時一個階段；未啟用時回傳共用的空計時器 """
+    return _Timer(name) if ENABLED else _NULL_TIMER
+
+
+def snapshot():
+    """ 各階段摘要 {階段: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} """
+    with _lock:
+        return {name: hist.summary() for name, hist in sorted(_histograms.items())}
+
+def dump_json():
+    return json.dumps({"enabled": ENABLED, "pid": os.getpid(), "stages": snapshot()}, ensure_ascii=False, indent=2)
+
+def reset():
+    with _lock:
+        _histograms.clear()
@@ -0,0 +1,158 @@
+# ==========================================
+# AliVerse 分享連結 (簽章的出生資料短碼 + 行程內結果快取)
+# ==========================================
+"""
+結果頁的網址帶有一段短碼 ?r=<token>，朋友開啟連結即直接看到同一份原廠規格，不必重新輸入：
+
+    token = base64url(出生資料 8 ~ 12 bytes [+ 卜卦種子] + HMAC-SHA256 前 8 bytes)
+
+簽章防止改動網址內容去觸發任意排盤；同一個 token 的排盤結果存在行程內的 LRU 快取
+(load)，一個被大量轉傳的連結只排盤一次，之後全是快取命中。
+
+    ALIVERSE_PERMALINK_SECRET=...   簽章金鑰 (所有伺服器行程、每次部署都要相同，舊連結才不會失效)
+
+未設定金鑰時停用分享連結 (ENABLED = False，啟動時記錄警告)：網址不帶 token、也不接受 token，
+表單送出的結果仍經由同一個快取。
+"""
+import base64
+import binascii
+import datetime
+import functools
+import hashlib
+import hmac
+import logging
+import os
+import struct
+from dataclasses import dataclass
+
+from bazi_birthtime import DEFAULT_REGION, REGION_NAMES
+from bazi_engine import compute_chart, compute_chart_exact, hour_variants
+
+SECRET = os.environ.get("ALIVERSE_PERMALINK_SECRET", "").encode()
+ENABLED = bool(SECRET)
+if not ENABLED:
+    logging.getLogger(__name__).warning("ALIVERSE_PERMALINK_SECRET is not set; shareable result links are disabled")
+APP_URL = "https://aliverse-bazi.streamlit.app"
+QUERY_KEY = "r"
+PERMALINK_CACHE_SIZE = 2048
+
+VERSION = 1
+SIGNATURE_BYTES = 8
+EPOCH = datetime.datetime(1900, 1, 1)
+DAY_MINUTES = 24 * 60
+# 版本, 出生日 (自 1900-01-01 起的天數), 時間 (當日分鐘數；不確定時辰為 1440 + 時辰選項), 旗標
+HEADER = struct.Struct(">BHHB")
+LONGITUDE = struct.Struct(">h")     # 經度 × 100
+DIVINATION = struct.Struct(">IB")   # 占卜時間 (自 1900-01-01 起的分鐘數), 意念字 UTF-8 長度
+FLAG_FEMALE = 0x01
+FLAG_LONGITUDE = 0x10
+FLAG_DIVINATION = 0x20
+REGION_SHIFT, REGION_MASK = 1, 0x07
+
+
+@dataclass(frozen=True)
+class Permalink:
+    """ 還原一份結果所需的輸入；hour 為 None 表示不確定時辰 (以 hour_slot 顯示完整解析) """
+    birth_date: datetime.date
+    hour: int = None
+    minute: int = 0
+    gender: str = "男"
+    region: str = DEFAULT_REGION
+    longitude: float = None
+    hour_slot: int = 0
+    div_input: str = ""               # 空字串 = 尚未卜卦
+    div_time: datetime.datetime = None
+
+    @property
+    def url(self):
+        return f"{APP_URL}/?{QUERY_KEY}={encode(self)}"
+
+
+def _sign(payload):
+    return hmac.new(SECRET, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+def encode(link):
+    """ Permalink → token。卜卦意念字超過 255 bytes 或含控制字元時拋出 ValueError """
+    flags = (FLAG_FEMALE if link.gender == "女" else 0) | REGION_NAMES.index(link.region) << REGION_SHIFT
+    time_code = DAY_MINUTES + link.hour_slot if link.hour is None else link.hour * 60 + link.minute
+    extra = b""
+    if link.longitude is not None:
+        flags |= FLAG_LONGITUDE
+        extra += LONGITUDE.pack(round(link.longitude * 100))
+    if link.div_input:
+        raw = link.div_input.encode("utf-8")
+        if len(raw) > 255 or not link.div_input.isprintable():
+            raise ValueError("divination input cannot be stored in a permalink")
+        flags |= FLAG_DIVINATION
+        extra += DIVINATION.pack(int((link.div_time - EPOCH).total_seconds()) // 60, len(raw)) + raw
+    payload = HEADER.pack(VERSION, (link.birth_date - EPOCH.date()).days, time_code, flags) + extra
+    return base64.urlsafe_b64encode(payload + _sign(payload)).rstrip(b"=").decode("ascii")
+
+def decode(token):
+    """ token → Permalink。分享連結停用、格式錯誤、簽章不符或版本不同時拋出 ValueError """
+    if not ENABLED:
+        raise ValueError("permalinks are disabled (ALIVERSE_PERMALINK_SECRET is not set)")
+    return _decode(token)
+
+def _decode(token):
+    """ decode() 的本體 (load 以表單送出的 token 查快取時，不論是否啟用分享連結都要用到) """
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        raise ValueError("malformed permalink") from None
+    payload, signature = data[:-SIGNATURE_BYTES], data[-SIGNATURE_BYTES:]
+    if len(payload) < HEADER.size or not hmac.compare_digest(signature, _sign(payload)):
+        raise ValueError("bad permalink signature")
+    version, days, time_code, flags = HEADER.unpack_from(payload)
+    if version != VERSION:
+        raise ValueError(f"unsupported permalink version: {version}")
+
+    fields = dict(birth_date=EPOCH.date() + datetime.timedelta(days=days), gender="女" if flags & FLAG_FEMALE else "男")
+    region = flags >> REGION_SHIFT & REGION_MASK
+    if region >= len(REGION_NAMES) or time_code > DAY_MINUTES + 12:
+        raise ValueError("permalink field out of range")
+    fields["region"] = REGION_NAMES[region]
+    if time_code >= DAY_MINUTES:
+        fields["hour_slot"] = time_code - DAY_MINUTES
+    else:
+        fields["hour"], fields["minute"] = divmod(time_code, 60)
+    offset = HEADER.size
+    if flags & FLAG_LONGITUDE:
+        fields["longitude"] = LONGITUDE.unpack_from(payload, offset)[0] / 100
+        offset += LONGITUDE.size
+    if flags & FLAG_DIVINATION:
+        minutes, length = DIVINATION.unpack_from(payload, offset)
+        offset += DIVINATION.size
+        fields["div_input"] = payload[offset:offset + length].decode("utf-8")
+        if not fields["div_input"].isprintable():  # 輸入框打不出換行等控制字元
+            raise ValueError("permalink field out of range")
+        fields["div_time"] = EPOCH + datetime.timedelta(minutes=minutes)
+        offset += length
+    if offset != len(payload):
+        raise ValueError("malformed permalink")
+    return Permalink(**fields)
+
+
+@dataclass(frozen=True)
+class SharedResult:
+    link: Permalink
+    chart: object        # BaziChart
+    variants: object     # HourVariants (僅不確定時辰)
+
+@functools.lru_cache(maxsize=PERMALINK_CACHE_SIZE)
+def load(token):
+    """
+    驗證 token 並排盤，結果依 token 快取 (行程內共用，LRU 淘汰)。
+    無效的 token 拋出 ValueError，不會佔用快取。
+    """
+    link = _decode(token)
+    if encode(link) != token:
+        raise ValueError("non-canonical permalink")
+    d = link.birth_date
+    if link.hour is None:
+        variants = hour_variants(d.year, d.month, d.day)
+        chart = compute_chart(d.year, d.month, d.day, link.hour_slot, link.gender)
+    else:
+        variants = None
+        chart = compute_chart_exact(d.year, d.month, d.day, link.hour, link.minute, link.gender, link.region, link.longitude)
+    return SharedResult(link=link, chart=chart, variants=variants)
@@ -0,0 +1,372 @@
+# ==========================================
+# AliVerse 文案著色 (無 Streamlit 相依)
+# ==========================================
+"""
+文案中的五行、顏色、材質關鍵字高亮、64卦車相矩陣卡片，以及全螢幕動畫的 HTML。
+
+    python bazi_render.py check-matrix      (比對 50 張車相矩陣卡片與固定預期輸出)
+"""
+import argparse
+import functools
+import hashlib
+import json
+import random
+import re
+import sys
+from types import MappingProxyType
+
+from bazi_engine import COLOR_MAP, STEMS
+
+# [V50.0 New] 智能關鍵字著色字典
+KEYWORD_COLORS = {
+    # 五行 (「金」見金屬色)
+    "木": "#4CAF50", "火": "#FF5252", "土": "#FFC107", "水": "#2196F3",
+    # 顏色 (Wood)
+    "綠": "#4CAF50", "青": "#4CAF50", "藍綠": "#20B2AA",
+    # 顏色 (Fire)
+    "紅": "#FF5252", "紫": "#E040FB", "粉": "#FF80AB", "橘": "#FF6E40", "亮橘": "#FF6E40",
+    # 顏色 (Earth)
+    "黃": "#FFD700", "棕": "#8D6E63", "咖啡": "#8D6E63", "米": "#FFE082", "卡其": "#FFE082",
+    # 顏色 (Metal)
+    "白": "#FFFFFF", "銀": "#E0E0E0", "金": "#FFD700", "灰": "#9E9E9E",
+    # 顏色 (Water)
+    "黑": "#90A4AE", "藍": "#2196F3", "深藍": "#1565C0",
+    # 特殊材質
+    "碳纖維": "#B0BEC5", "麂皮": "#FF8A65", "實木": "#D7CCC8"
+}
+
+# 單次掃描的比對器：既有的 <span>…</span> 與其他 HTML 標籤原樣保留，
+# 其餘文字以最長關鍵字優先比對 (「深藍」優先於「藍」)
+_KEYWORD_PATTERN = re.compile(
+    r"(<span\b[^>]*>[^<]*</span>|<[^>]*>)|("
+    + "|".join(re.escape(kw) for kw in sorted(KEYWORD_COLORS, key=len, reverse=True))
+    + ")"
+)
+_KEYWORD_SPANS = {kw: f"<span style='color:{color}; font-weight:bold;'>{kw}</span>" for kw, color in KEYWORD_COLORS.items()}
+
+def _replace_keyword(match):
+    return match.group(1) or _KEYWORD_SPANS[match.group(2)]
+
+@functools.lru_cache(maxsize=2048)
+def highlight_keywords(text):
+    """
+    自動偵測文案中的五行、顏色等關鍵字，並套用對應的 HTML 顏色樣式。
+    已著色的片段與 HTML 標籤不會被重複處理，對同一段文字多次呼叫結果不變。
+    """
+    return _KEYWORD_PATTERN.sub(_replace_keyword, text)
+
+def get_colored_text(elements_list):
+    html_str = ""
+    for el in elements_list:
+        color = COLOR_MAP.get(el, "#FFF")
+        html_str += f"<span style='color:{color}; font-weight:bold; margin-right:3px;'>{el}</span>"
+    return html_str
+
+# 舊的簡易上色函式 (保留相容性)
+def highlight_text_elements(text):
+    for char, color in COLOR_MAP.items():
+        text = text.replace(char, f"<span style='color:{color}; font-weight:bold;'>{char}</span>")
+    return text
+
+
+# ==========================================
+# [V50.0] AliVerse 64卦車相矩陣核心引擎 (含目的性文案)
+# ==========================================
+def build_aliverse_car_matrix(day_master, lucky_element):
+    """ 依日主天干與第一喜用神組出車相矩陣文案 (未查表的原始運算) """
+    # 1. 八卦定義資料庫
+    trigrams = {
+        '乾': {'name': '乾', 'nature': '天', 'symbol': '☰', 'style': '旗艦豪華轎車 / 超跑', 'color': '金屬銀、珍珠白、香檳金', 'engine': 'V8/V12 大排量自然進氣', 'vibe': '尊貴、領袖氣場、經典', 'part': '金'},
+        '兌': {'name': '兌', 'nature': '澤', 'symbol': '☱', 'style': '雙門 Coupe / 敞篷車', 'color': '白色、杏色、淺灰', 'engine': '精緻小排量 / 油電混合', 'vibe': '享樂、時尚、拉風', 'part': '金'},
+        '離': {'name': '離', 'nature': '火', 'symbol': '☲', 'style': '流線性能跑車', 'color': '法拉利紅、亮紫、亮橘', 'engine': '高轉速 NA / 電子輔助強', 'vibe': '熱情、吸睛、速度', 'part': '火'},
+        '震': {'name': '震', 'nature': '雷', 'symbol': '☳', 'style': '重改裝車 / 美式肌肉車', 'color': '賽車綠、青色、賽車塗裝', 'engine': '大渦輪增壓 (Turbo)', 'vibe': '爆發力、貼背感、震撼', 'part': '木'},
+        '巽': {'name': '巽', 'nature': '風', 'symbol': '☴', 'style': '流線旅行車 / 掀背鋼砲', 'color': '消光黑、藍綠、變色龍', 'engine': '雙渦輪 / 空氣力學優化', 'vibe': '操控、靈活、高速', 'part': '木'},
+        '坎': {'name': '坎', 'nature': '水', 'symbol': '☵', 'style': '黑頭車 / 豪華房車', 'color': '深邃黑、午夜藍', 'engine': '水冷強化 / 智能駕駛系統', 'vibe': '深沉、智謀、流動', 'part': '水'},
+        '艮': {'name': '艮', 'nature': '山', 'symbol': '☶', 'style': '大型 SUV / G-Car / 皮卡', 'color': '土黃、咖啡、軍綠、水泥灰', 'engine': '柴油動力 / 大扭力四驅', 'vibe': '穩重、防禦、靠山', 'part': '土'},
+        '坤': {'name': '坤', 'nature': '地', 'symbol': '☷', 'style': '豪華 MPV / 保母車', 'color': '黃色、大地色、消光', 'engine': '平順動力 / 氣壓懸吊', 'vibe': '包容、承載、舒適', 'part': '土'}
+    }
+
+    # 2. 映射邏輯
+    dm_map = {'甲': '震', '乙': '巽', '丙': '離', '丁': '離', '戊': '艮', '己': '坤', '庚': '乾', '辛': '兌', '壬': '坎', '癸': '坎'}
+    lucky_map = {'木': '巽', '火': '離', '土': '艮', '金': '乾', '水': '坎'}
+
+    lower_key = dm_map.get(day_master, '乾')
+    upper_key = lucky_map.get(lucky_element, '離')
+    
+    lower = trigrams[lower_key]
+    upper = trigrams[upper_key]
+
+    # 3. 文案生成 (加入目的導向)
+    hexagram_name = f"{upper['nature']}{lower['nature']}卦"
+    
+    look_text = f"上卦為【{upper['name']} ({upper['nature']})】，這是能為您帶來平衡的「開運形象」。"
+    look_text += f" 由於您的本命磁場需要{upper['part']}來調和，建議外觀選擇 **{upper['style']}** 風格。"
+    look_text += f" 車色首選 **{upper['color']}**，**目的是轉化您原本的氣場，對外展現「{upper['vibe']}」的強大吸引力，吸引貴人目光**。"
+    
+    soul_text = f"下卦為【{lower['name']} ({lower['nature']})】，這代表您身為駕駛者的「原始靈魂」。"
+    soul_text += f" 您的日主為「{day_master}」，本質上具備 **{lower['engine']}** 的特性。"
+    soul_text += f" 雖然外表{upper['vibe']}，但您內在追求的是「{lower['vibe']}」的真實感受。"
+
+    tuning_text = ""
+    tuning_purpose = "" # 用於最後整合分析
+    
+    # 特殊判斷：Ali 的強金水喜火格局 (外火內水)
+    if (upper['nature'] == '火' and lower['nature'] == '水') or (upper['nature'] == '水' and lower['nature'] == '火'):
+         tuning_text = "這是一個「水火既濟」的完美平衡。您的本命金水過旺（容易給人冷冽、掉漆的感覺），因此**絕不能再選黑、白、銀色車**。"
+         tuning_text += " 建議透過**「火」**的能量來煉金：內裝大膽採用**紅色縫線、紅色安全帶或 Alcantara 麂皮**。改裝重點在於**排氣聲浪**（聲名大噪），**目的是用熱情的火來溫暖原本冰冷的金水引擎，防止運勢故障，並在事業彎道上展現「霸氣超車」的決心**。"
+         tuning_purpose = "透過火系改裝（紅色、聲浪）來「暖局煉金」，達成彎道超車與突破現狀的目的。"
+    
+    elif upper['part'] == lower['part']:
+        tuning_text = "上下卦五行氣場相同，能量極為純粹。**不建議過度改裝外觀**，應維持原廠的設計語彙。重點放在車內清潔與「氣味」管理，**目的是保持能量流通，讓思緒如光纖般清晰**。"
+        tuning_purpose = "維持原廠純粹能量，透過氣場管理來提升決策清晰度。"
+    
+    elif (upper['part'] == '火' and lower['part'] == '金') or (upper['part'] == '金' and lower['part'] == '木'):
+        tuning_text = "此卦象帶有「火煉金」或「金剋木」的張力，代表這台車能激發您的戰鬥力。建議升級**煞車系統 (Brembo 等)** 與 **抓地力強的輪胎**，**目的是強化您的「控制力」，讓您在高速衝刺事業時，依然能穩穩抓住機會**。"
+        tuning_purpose = "強化制動與抓地力，提升對局勢的掌控權。"
+    
+    else:
+        extra_material = "真皮" if lower['part'] == '土' else "碳纖維飾板"
+        tuning_text = f"這是一個相生的組合。因您的喜用神為{lucky_element}，建議在車身細節（如輪框蓋、後照鏡）點綴 **{upper['color']}**。內裝部分，建議多用{extra_material}，**目的是最大化五行相生的運勢，讓財運與貴人運源源不絕**。"
+        tuning_purpose = f"透過五行相生改裝，增強貴人運與財運的流動。"
+
+    verdict_text = f"經由 AliVerse 運算，您的專屬車相為【外{upper['nature']}內{lower['nature']}】。這台車是您「改運」的法器。"
+    verdict_text += f" 它利用 **{upper['nature']} ({upper['vibe']})** 的外在形象，來平衡您內在 **{lower['nature']} ({lower['vibe']})** 的過強能量，達到真正的陰陽調和。"
+
+    # 套用關鍵字上色
+    look_text = highlight_keywords(look_text)
+    soul_text = highlight_keywords(soul_text)
+    tuning_text = highlight_keywords(tuning_text)
+    verdict_text = highlight_keywords(verdict_text)
+
+    return {
+        "hex_name": hexagram_name,
+        "symbol_upper": upper['symbol'],
+        "symbol_lower": lower['symbol'],
+        "upper_desc": f"外觀(喜用)：{upper['name']} ({upper['nature']})",
+        "lower_desc": f"動力(本命)：{lower['name']} ({lower['nature']})",
+        "look_text": look_text,
+        "look_tags": [upper['style'], upper['color']],
+        "soul_text": soul_text,
+        "soul_tags": [lower['engine'], lower['vibe']],
+        "tuning_text": tuning_text,
+        "tuning_purpose": tuning_purpose, # 傳出目的，供最後整合使用
+        "verdict_text": verdict_text
+    }
+
+def render_car_matrix_html(matrix_data):
+    """
+    車相矩陣的三段 HTML。
+    return: (title_html, symbol_html, box_html)
+    """
+    title_html = f"<h3 style='text-align: center; color: #ffd700; margin-bottom: 20px;'>AliVerse 64卦車相矩陣：{matrix_data['hex_name']}</h3>"
+    symbol_html = f"""
+            <div style="text-align: center; background: rgba(0,0,0,0.3); padding: 15px; border-radius: 15px;">
+                <div class="hex-symbol">{matrix_data['symbol_upper']}<br>{matrix_data['symbol_lower']}</div>
+                <div style="color: #aaa; font-size: 0.9em; letter-spacing: 1px;">
+                    {matrix_data['upper_desc']} <span style="color:#ff4757; margin:0 5px;">×</span> {matrix_data['lower_desc']}
+                </div>
+            </div>
+            """
+    box_html = f"""
+        <div class="matrix-box">
+            <div class="matrix-item">
+                <h4><i class="fas fa-car"></i> 經典車型畫像 (The Look)</h4>
+                <p>{matrix_data['look_text']}</p>
+                <div class="matrix-tags"><span>{matrix_data['look_tags'][0]}</span><span>{matrix_data['look_tags'][1]}</span></div>
+            </div>
+            <div class="matrix-item">
+                <h4><i class="fas fa-cogs"></i> 引擎與性能靈魂 (The Soul)</h4>
+                <p>{matrix_data['soul_text']}</p>
+                <div class="matrix-tags"><span>{matrix_data['soul_tags'][0]}</span><span>{matrix_data['soul_tags'][1]}</span></div>
+            </div>
+            <div class="matrix-item">
+                <h4><i class="fas fa-wrench"></i> AliVerse 改裝特調 (The Tuning)</h4>
+                <p style="color: #ffd700;">{matrix_data['tuning_text']}</p>
+            </div>
+            <div class="matrix-item" style="border-left-color: #ff4757; background: rgba(255, 71, 87, 0.08);">
+                <h4><i class="fas fa-bolt"></i> 運勢總評 (The Verdict)</h4>
+                <p>{matrix_data['verdict_text']}</p>
+            </div>
+        </div>
+        """
+    return title_html, symbol_html, box_html
+
+def _build_car_matrix_card(day_master, lucky_element):
+    data = build_aliverse_car_matrix(day_master, lucky_element)
+    data["title_html"], data["symbol_html"], data["box_html"] = render_car_matrix_html(data)
+    data["look_tags"], data["soul_tags"] = tuple(data["look_tags"]), tuple(data["soul_tags"])
+    return MappingProxyType(data)
+
+# 10 日主 × 5 喜用神 = 50 張卡片，匯入時一次產生 (唯讀，可跨 session 共用)
+CAR_MATRIX_TABLE = {
+    (dm, el): _build_car_matrix_card(dm, el) for dm in STEMS for el in ("木", "火", "土", "金", "水")
+}
+
+def get_aliverse_car_matrix(day_master, lucky_element):
+    """
+    查表取得車相矩陣 (含已渲染的 title_html / symbol_html / box_html)；
+    不在表內的組合 (理論上不會發生) 才即時運算。
+    """
+    card = CAR_MATRIX_TABLE.get((day_master, lucky_element))
+    return card if card is not None else _build_car_matrix_card(day_master, lucky_element)
+
+# 車相矩陣的固定預期輸出 (改動文案、八卦對應或著色規則時需刻意更新)：
+# 每個改裝分支各一張卡片的 (卦名, 改裝目的)，以及全部 50 張卡片內容的 SHA-256
+CAR_MATRIX_PINNED = {
+    ("壬", "火"): ("火水卦", "透過火系改裝（紅色、聲浪）來「暖局煉金」，達成彎道超車與突破現狀的目的。"),
+    ("甲", "木"): ("風雷卦", "維持原廠純粹能量，透過氣場管理來提升決策清晰度。"),
+    ("庚", "火"): ("火天卦", "強化制動與抓地力，提升對局勢的掌控權。"),
+    ("戊", "金"): ("天山卦", "透過五行相生改裝，增強貴人運與財運的流動。"),
+}
+CAR_MATRIX_DIGEST = "fecc95bfa94774341fbec43800ce71dcfe90e5ea5afc1313246f45ad979c7d2c"
+
+def car_matrix_digest(table=CAR_MATRIX_TABLE):
+    """ 全部卡片內容 (依 (日主, 喜用神) 排序) 的 SHA-256 """
+    blob = json.dumps([[dm, el, dict(card)] for (dm, el), card in sorted(table.items())], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def check_car_matrix_table():
+    """ 比對車相矩陣與固定預期輸出，回傳不一致的項目說明清單 (空清單 = 通過) """
+    problems = [
+        f"{dm}{el}: {(CAR_MATRIX_TABLE[dm, el]['hex_name'], CAR_MATRIX_TABLE[dm, el]['tuning_purpose'])} != {expected}"
+        for (dm, el), expected in CAR_MATRIX_PINNED.items()
+        if (CAR_MATRIX_TABLE[dm, el]["hex_name"], CAR_MATRIX_TABLE[dm, el]["tuning_purpose"]) != expected
+    ]
+    if len(CAR_MATRIX_TABLE) != 50:
+        problems.append(f"{len(CAR_MATRIX_TABLE)} cards, expected 50")
+    digest = car_matrix_digest()
+    if digest != CAR_MATRIX_DIGEST:
+        problems.append(f"digest {digest} != pinned {CAR_MATRIX_DIGEST}")
+    return problems
+
+# ==========================================
+# [V50.0] 2026 專屬導航與報告文字
+# ==========================================
+def build_final_advice_html(chart, matrix_data, gua_name):
+    """ 綜合療癒運勢解析 (整合改裝建議)，已套用關鍵字著色 """
+    lucky_html = get_colored_text(chart.joyful_gods)
+    taboo_html = get_colored_text(chart.taboo_gods)
+    final_advice = f"""
+        嘿，<b>{chart.real_car_model}</b> 的車主！<br><br>
+        今年是<b>丙午火馬年</b>，對於你這台 <b>{chart.base_type}</b> 來說，路況是「火力全開」的賽道。<br>
+        因為你的引擎（日主 {get_colored_text([chart.day_master_wx])}）{('喜火，這簡直是你的主場，油門踩到底就對了！') if '火' in chart.joyful_gods else ('忌火，這代表引擎容易過熱，請務必安裝「水冷系統」（冷靜/休息）。')}<br><br>
+        
+        <b>🛡️ 改裝戰略整合：</b><br>
+        {matrix_data['tuning_purpose']}<br><br>
+        
+        加上你剛剛抽到的<b>「{gua_name}」</b>卦象，顯示你潛意識中渴望<b>{('突破與展現') if '火' in gua_name or '天' in gua_name else ('穩定與積累')}</b>。<br><br>
+        👉 <b>全方位能量補給建議：</b><br>
+        建議您在 <b>食衣住行育樂</b> 中，多<b>補充和添加</b>您的幸運燃料：<b>{lucky_html}</b>。<br>
+        同時要刻意避開 <b>{taboo_html}</b> 能量，以免產生不必要的 {highlight_keywords('能量壓力')} 與 {highlight_keywords('精神內耗')}。<br><br>
+        祝你在 2026 的賽道上，不僅跑得快，還能帥氣過彎，安全抵達終點！🚗💨
+        """
+    # 應用高亮 (確保最終輸出也有顏色)
+    return highlight_keywords(final_advice)
+
+def build_full_report_text(display_name, chart, matrix_data, time_ganzhi, user_input_val, gua, reading=None):
+    """
+    下載用的完整運勢報告 (純文字)。
+    gua: (卦名, 籤等, 卦辭, 易經指引)；reading: bazi_iching.Reading (附上動爻、之卦、互卦)，可為 None
+    """
+    gua_name, gua_luck, gua_text, gua_advice = gua
+    reading_text = ""
+    if reading is not None:
+        line_title, line_text = reading.moving_line
+        reading_text = f"\n動爻：{line_title}　{line_text}\n之卦：{reading.changed.name} ({reading.changed.luck})\n互卦：{reading.mutual.name}"
+    return f"""
+【AliVerse 2026 運勢完整報告】
+================================
+駕駛員：{display_name}
+日主本命：{chart.day_gan}{chart.day_master_wx}
+原廠車型：{chart.real_car_model} ({chart.base_type})
+能量規格：{chart.strength_type} (指數 {chart.score}%)
+專屬車相：{matrix_data['hex_name']} (外{matrix_data['upper_desc'].split('：')[1]} 內{matrix_data['lower_desc'].split('：')[1]})
+================================
+【時空占卜紀錄】
+占卜時間：{time_ganzhi}
+靈動意念：{user_input_val}
+得卦：{gua_name} ({gua_luck})
+卦辭：{gua_text}{reading_text}
+================================
+【2026 火馬年路況】
+{chart.advice_2026}
+================================
+【易經指引】
+{gua_advice}
+================================
+【幸運改裝方案】
+幸運燃料：{'、'.join(chart.lucky_colors)}
+避凶警示：{'、'.join(chart.taboo_colors)}
+改裝戰略：{matrix_data['tuning_purpose']}
+================================
+AliVerse 愛力宇宙 - 科技命理
+立即測算：https://aliverse-bazi.streamlit.app
+"""
+
+def build_share_text(chart, matrix_data, url="https://aliverse-bazi.streamlit.app"):
+    """ 分享到 IG / LINE 的短文；url 可換成結果的分享連結 """
+    return f"🏎️ 我剛剛在 AliVerse 測出來，我是 {chart.real_car_model}！\n車相矩陣顯示是「{matrix_data['hex_name']}」！\n易經卜卦說我 2026 年要{'火力全開' if '火' in chart.joyful_gods else '注意過熱'}！\n你也來測測看你是什麼車？\n👉 {url}"
+
+# ==========================================
+# 全螢幕動畫 (純 CSS，一次送出後由瀏覽器自行播放並淡出)
+# ==========================================
+# 動畫長度與格數定義在樣式表 (.anim-hud / .anim-matrix / .anim-divination)
+MATRIX_FRAMES = 15
+
+def hud_animation_html():
+    """ 啟動引擎時的時速表 HUD：0 → 280 km/h，三段狀態文字與顏色 """
+    return """
+    <div class="hud-overlay anim-hud">
+        <div class="hud-grid"></div>
+        <div class="speed-container">
+            <div class="speed-val hud-speed-anim"></div>
+            <div class="speed-unit">km/h</div>
+            <div class="rpm-bar"><div class="rpm-fill hud-rpm-anim"></div></div>
+        </div>
+        <div class="hud-status">
+            <span class="hud-phase hud-phase-1">系統暖機程序啟動...</span>
+            <span class="hud-phase hud-phase-2">十神系統連線中...</span>
+            <span class="hud-phase hud-phase-3">動力極限輸出！⚠️</span>
+        </div>
+    </div>
+    """
+
+def matrix_animation_html():
+    """ 解鎖時的矩陣解碼畫面：預先產生數行亂碼，由 CSS 逐格切換 """
+    codes = "<br>".join("".join(random.choice("01XYZΩ") for _ in range(30)) for _ in range(MATRIX_FRAMES))
+    return f"""
+    <div class="fullscreen-overlay anim-matrix">
+        <div class="matrix-text">
+            <div class="matrix-reel"><div>{codes}</div></div>
+            SYSTEM DECODING...
+        </div>
+    </div>
+    """
+
+def divination_animation_html():
+    """ 卜卦時的天地交感畫面 """
+    return """
+    <div class="fullscreen-overlay anim-divination">
+        <div class="cosmic-text">
+            ✦ 天地交感中 ✦<br>
+            <span style="font-size:0.5em; color:#fff;">正在連結宇宙資料庫...</span>
+        </div>
+    </div>
+    """
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AliVerse 文案與車相矩陣")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("check-matrix", help="比對車相矩陣與固定預期輸出")
+    parser.parse_args(argv)
+
+    problems = check_car_matrix_table()
+    print(f"{len(CAR_MATRIX_TABLE)} cards, {len(problems)} problems")
+    for problem in problems:
+        print("  ", problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# ==========================================
+# AliVerse 族群統計 (全出生時段分布，預先彙總)
+# ==========================================
+"""
+將 1900 ~ 2026 每個 (日期, 時辰選項) 的排盤結果依「出生年 × 出生月 × 屬性值」彙總成次數表，
+寫入壓縮的欄式快取 (每個屬性一個 (年, 月, 值) uint16 陣列)；儀表板只讀快取，瀏覽時不再運算。
+
+    python bazi_stats.py build [--output PATH] [--workers N]    (需先有 bazi_table 排盤表)
+    python bazi_stats.py show [--dimension base_type]
+"""
+import argparse
+import functools
+import os
+import sys
+import time
+
+import numpy as np
+
+from bazi_engine import CHART_TABLE_PATH, get_chart_table
+from bazi_table import FIRST_YEAR, LAST_YEAR, N_SLOTS, row_index
+
+STATS_CACHE_PATH = os.environ.get(
+    "ALIVERSE_STATS_CACHE", os.path.join(os.path.dirname(os.path.abspath(CHART_TABLE_PATH)), "bazi_stats.npz")
+)
+DIMENSIONS = ("score", "base_type", "car_model", "joyful_gods", "hexagram")
+YEARS = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+N_MONTHS = 12
+
+
+def aggregate_year(year):
+    """
+    單一出生年的次數表 (多行程彙總的工作單位)。
+    return: (year, {屬性: (labels, (12, len(labels)) uint16 次數)})
+    """
+    import bazi_index
+    table = get_chart_table()
+    first, stop = row_index(year, 1, 1, 0), row_index(year, 12, 31, N_SLOTS - 1) + 1
+    codes = bazi_index.attribute_codes(table.rows[first:stop], first)
+    months = bazi_index.birth_months(first, stop - first) - 1
+    out = {}
+    for dim in DIMENSIONS:
+        labels, values = codes[dim]
+        counts = np.bincount(months * len(labels) + values, minlength=N_MONTHS * len(labels))
+        out[dim] = (labels, counts.reshape(N_MONTHS, len(labels)).astype(np.uint16))
+    return year, out
+
+def build(path=STATS_CACHE_PATH, workers=None):
+    """
+    以行程池逐年彙總，合併後寫入 npz 快取 (先寫暫存檔再原子替換)。
+    """
+    from multiprocessing import Pool
+
+    if get_chart_table() is None:
+        raise FileNotFoundError("chart table not found; run `python bazi_table.py build` first")
+    start = time.time()
+    labels, counts = {}, {}
+    with Pool(workers) as pool:
+        for year, result in pool.imap_unordered(aggregate_year, YEARS.tolist()):
+            for dim, (dim_labels, dim_counts) in result.items():
+                labels.setdefault(dim, dim_labels)
+                if dim not in counts:
+                    counts[dim] = np.zeros((len(YEARS), N_MONTHS, len(dim_labels)), dtype=np.uint16)
+                counts[dim][year - FIRST_YEAR] = dim_counts
+    arrays = {"years": YEARS}
+    for dim in DIMENSIONS:
+        arrays[f"{dim}.labels"] = np.array([str(v) for v in labels[dim]])
+        arrays[f"{dim}.counts"] = counts[dim]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+    print(f"{len(YEARS)} years -> {path} ({os.path.getsize(path) / 1e3:.0f} KB, {time.time() - start:.1f}s)", file=sys.stderr)
+
+
+class PopulationStats:
+    """ 讀取統計快取；counts(dim, years, months) 回傳選取範圍內各值的次數 """
+
+    def __init__(self, path=STATS_CACHE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            if not np.array_equal(data["years"], YEARS):
+                raise ValueError(f"stats cache year range mismatch: {path}")
+            self.labels = {dim: tuple(data[f"{dim}.labels"].tolist()) for dim in DIMENSIONS}
+            self.tables = {dim: data[f"{dim}.counts"] for dim in DIMENSIONS}
+
+    def counts(self, dim, first_year=FIRST_YEAR, last_year=LAST_YEAR, months=None):
+        """ {值: 次數}；months 為 1~12 的清單，None 代表全年 """
+        table = self.tables[dim][first_year - FIRST_YEAR:last_year - FIRST_YEAR + 1]
+        if months:
+            table = table[:, [m - 1 for m in months]]
+        return dict(zip(self.labels[dim], table.sum(axis=(0, 1), dtype=np.int64).tolist()))
+
+    def by_year(self, dim, first_year=FIRST_YEAR, last_year=LAST_YEAR, months=None):
+        """ (年數, 值數) 次數矩陣，供趨勢圖使用 """
+        table = self.tables[dim][first_year - FIRST_YEAR:last_year - FIRST_YEAR + 1]
+        if months:
+            table = table[:, [m - 1 for m in months]]
+        return table.sum(axis=1, dtype=np.int64)
+
+@functools.lru_cache(maxsize=1)
+def get_population_stats():
+    """ 開啟統計快取 (行程內共用)；快取不存在時拋出 FileNotFoundError """
+    return PopulationStats(STATS_CACHE_PATH)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AliVerse 族群統計")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="彙總全出生時段並寫入快取")
+    p_build.add_argument("--output", default=STATS_CACHE_PATH)
+    p_build.add_argument("--workers", type=int, default=None)
+    p_show = sub.add_parser("show", help="顯示某屬性的整體分布")
+    p_show.add_argument("--path", default=STATS_CACHE_PATH)
+    p_show.add_argument("--dimension", choices=DIMENSIONS, default="base_type")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        try:
+            build(args.output, args.workers)
+        except FileNotFoundError as e:
+            sys.exit(str(e))
+        return 0
+    stats = PopulationStats(args.path)
+    counts = stats.counts(args.dimension)
+    total = sum(counts.values())
+    for value, n in sorted(counts.items(), key=lambda kv: -kv[1]):
+        print(f"{value}\t{n}\t{n / total:.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+# ==========================================
+# AliVerse 預先排盤表 (1900 ~ 2026 全時辰)
+# ==========================================
+"""
+將輸入區允許的每一個 (日期, 時辰選項) 先排盤一次 (bazi_calendar 整數運算)，
+以 int8 欄位打包成唯讀檔案，執行期以 mmap 依偏移量直接查表。
+
+檔案格式：16 bytes 檔頭 + N_ROWS × N_COLS 個 int8 (列優先)。
+    列索引 = (日期序數 - FIRST_DATE 序數) × 13 + 時辰選項索引
+
+產生方式：
+    python bazi_table.py build [--output PATH] [--workers N]
+    python bazi_table.py verify [--samples N]
+    python bazi_table.py verify-scores      (全表比對 NumPy 批次評分與逐盤評分)
+    python bazi_table.py verify-exact [--samples N]   (精確時間、時辰選項與 13 時辰一覽三種排盤互相比對)
+"""
+import argparse
+import datetime
+import os
+import random
+import struct
+import sys
+import time
+
+import numpy as np
+
+import bazi_calendar
+import bazi_iching
+from bazi_calendar import LUNAR_DAY_CN, LUNAR_MONTH_CN, ZODIAC
+from bazi_engine import (
+    BRANCHES, CHART_TABLE_PATH, DEFAULT_SCHEME, HOUR_SLOT_HOURS, STEMS, compute_chart, compute_chart_exact, convert_lunar,
+    get_hexagram_numbers, hour_to_slot, hour_variants, score_strength, score_strength_array
+)
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2026
+FIRST_DATE = datetime.date(FIRST_YEAR, 1, 1)
+N_SLOTS = len(HOUR_SLOT_HOURS)
+N_DAYS = (datetime.date(LAST_YEAR, 12, 31) - FIRST_DATE).days + 1
+N_ROWS = N_DAYS * N_SLOTS
+
+MAGIC = b"ALIBAZI1"
+HEADER = struct.Struct("<8sHHHH")  # magic, first_year, last_year, n_slots, n_cols
+
+# 欄位 (皆為 int8)
+COLUMNS = (
+    "year_gan", "year_zhi", "month_gan", "month_zhi",
+    "day_gan", "day_zhi", "time_gan", "time_zhi",
+    "lunar_month",   # 農曆月 (閏月為負值，與 lunar_python 一致)
+    "lunar_day",     # 農曆日 1~30
+    "lunar_year_gz", # 農曆年干支序 0~59
+    "zodiac",        # 生肖 0~11 (子鼠起)
+    "score",         # 身強弱指數 0~100
+    "upper_num",     # 上卦數 1~8
+    "lower_num",     # 下卦數 1~8
+)
+N_COLS = len(COLUMNS)
+COL = {name: i for i, name in enumerate(COLUMNS)}
+
+
+def row_index(year, month, day, hour_slot):
+    """ 出生資料對應的列索引；超出表格範圍時回傳 None """
+    if not FIRST_YEAR <= year <= LAST_YEAR or not 0 <= hour_slot < N_SLOTS:
+        return None
+    return (datetime.date(year, month, day) - FIRST_DATE).days * N_SLOTS + hour_slot
+
+def ganzhi_index(gan, zhi):
+    """ 干支在六十甲子中的序號 (甲子 = 0) """
+    g, z = STEMS.index(gan), BRANCHES.index(zhi)
+    return (6 * g - 5 * z) % 60
+
+def encode_slot(year, month, day, hour_slot):
+    """ 以干支曆法核心排盤並編碼為一列 int8 值 (與 lunar_python 逐時辰一致，見 bazi_calendar verify) """
+    hour = HOUR_SLOT_HOURS[hour_slot]
+    eight, lunar_year, month_cn, day_cn, zodiac = bazi_calendar.convert(year, month, day, hour)
+    lunar_month = LUNAR_MONTH_CN.index(month_cn.lstrip("闰"))
+    if month_cn.startswith("闰"):
+        lunar_month = -lunar_month
+    upper_num, lower_num = get_hexagram_numbers(year, month, day, hour)
+    codes = [STEMS.index(c) if i % 2 == 0 else BRANCHES.index(c) for i, c in enumerate(eight)]
+    return codes + [
+        lunar_month,
+        LUNAR_DAY_CN.index(day_cn),
+        ganzhi_index(lunar_year[0], lunar_year[1]),
+        ZODIAC.index(zodiac),
+        score_strength(*eight),
+        upper_num,
+        lower_num,
+    ]
+
+def encode_year(year):
+    """ 編碼一整年的所有時辰 (多行程建表的工作單位) """
+    start = datetime.date(year, 1, 1)
+    n_days = (datetime.date(year, 12, 31) - start).days + 1
+    out = np.empty((n_days * N_SLOTS, N_COLS), dtype=np.int8)
+    for d in range(n_days):
+        date = start + datetime.timedelta(days=d)
+        for slot in range(N_SLOTS):
+            out[d * N_SLOTS + slot] = encode_slot(date.year, date.month, date.day, slot)
+    return year, out.tobytes()
+
+
+class ChartTable:
+    """
+    唯讀 mmap 排盤表。開啟時檢查檔頭與檔案大小，不符時拋出 ValueError。
+    """
+
+    def __init__(self, path=CHART_TABLE_PATH):
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"chart table header truncated: {path}")
+        magic, first_year, last_year, n_slots, n_cols = HEADER.unpack(header)
+        if (magic, first_year, last_year, n_slots, n_cols) != (MAGIC, FIRST_YEAR, LAST_YEAR, N_SLOTS, N_COLS):
+            raise ValueError(f"chart table layout mismatch: {path}")
+        if os.path.getsize(path) != HEADER.size + N_ROWS * N_COLS:
+            raise ValueError(f"chart table size mismatch: {path}")
+        self.path = path
+        self.rows = np.memmap(path, dtype=np.int8, mode="r", offset=HEADER.size, shape=(N_ROWS, N_COLS))
+
+    def column(self, name):
+        """ 取得整欄 (唯讀 view)，供批次統計使用 """
+        return self.rows[:, COL[name]]
+
+    def lookup(self, year, month, day, hour_slot):
+        """
+        查表取得四柱與農曆資訊，格式與 bazi_engine.convert_lunar() 相同；超出範圍回傳 None。
+        """
+        idx = row_index(year, month, day, hour_slot)
+        if idx is None:
+            return None
+        r = self.rows[idx].tolist()
+        eight = tuple(STEMS[c] if i % 2 == 0 else BRANCHES[c] for i, c in enumerate(r[:8]))
+        lunar_month = r[COL["lunar_month"]]
+        month_cn = ("闰" if lunar_month < 0 else "") + LUNAR_MONTH_CN[abs(lunar_month)]
+        gz = r[COL["lunar_year_gz"]]
+        lunar_year = STEMS[gz % 10] + BRANCHES[gz % 12]
+        return eight, lunar_year, month_cn, LUNAR_DAY_CN[r[COL["lunar_day"]]], ZODIAC[r[COL["zodiac"]]]
+
+
+def build(path=CHART_TABLE_PATH, workers=None):
+    """
+    產生完整排盤表。先寫入暫存檔再原子替換，執行中的伺服器不會讀到半成品。
+    """
+    from multiprocessing import Pool
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    years = list(range(FIRST_YEAR, LAST_YEAR + 1))
+    start = time.time()
+    with open(tmp_path, "wb") as f, Pool(workers) as pool:
+        f.write(HEADER.pack(MAGIC, FIRST_YEAR, LAST_YEAR, N_SLOTS, N_COLS))
+        # imap 保持年份順序，輸出即為連續列
+        for year, data in pool.imap(encode_year, years):
+            f.write(data)
+            print(f"\r{year} ({time.time() - start:.0f}s)", end="", file=sys.stderr, flush=True)
+    os.replace(tmp_path, path)
+    print(f"\n{N_ROWS} rows -> {path}", file=sys.stderr)
+
+def verify(path=CHART_TABLE_PATH, samples=2000, seed=0):
+    """
+    隨機抽樣比對排盤表與 lunar_python 即時換算；回傳不一致的 (年, 月, 日, 時辰) 清單。
+    """
+    table = ChartTable(path)
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(samples):
+        date = FIRST_DATE + datetime.timedelta(days=rng.randrange(N_DAYS))
+        slot = rng.randrange(N_SLOTS)
+        key = (date.year, date.month, date.day, slot)
+        expected = convert_lunar(date.year, date.month, date.day, HOUR_SLOT_HOURS[slot])
+        row = table.rows[row_index(*key)].tolist()
+        if table.lookup(*key) != expected or row != encode_slot(*key):
+            mismatches.append(key)
+    return mismatches
+
+
+def verify_scores(path=CHART_TABLE_PATH, scheme=DEFAULT_SCHEME):
+    """
+    全表 (1900 ~ 2026 每個日期與時辰) 比對 score_strength_array() 與逐盤 score_strength() / scheme.base_code()。
+    逐盤評分只需對不重複的八字組合各算一次。回傳不一致的列索引陣列。
+    """
+    table = ChartTable(path)
+    codes = np.asarray(table.rows[:, :8])
+    scores, base_codes = score_strength_array(codes, scheme)
+
+    unique, inverse = np.unique(codes, axis=0, return_inverse=True)
+    expected_scores = np.empty(len(unique), dtype=scores.dtype)
+    expected_codes = np.empty(len(unique), dtype=np.int8)
+    for i, row in enumerate(unique.tolist()):
+        eight = [STEMS[c] if j % 2 == 0 else BRANCHES[c] for j, c in enumerate(row)]
+        expected_scores[i] = score_strength(*eight, scheme=scheme)
+        expected_codes[i] = scheme.base_code(expected_scores[i])
+    inverse = inverse.reshape(-1)
+    bad = (scores != expected_scores[inverse]) | (base_codes != expected_codes[inverse])
+    if scheme == DEFAULT_SCHEME:
+        bad |= scores != table.column("score")
+    return np.flatnonzero(bad)
+
+
+# 精確時間與時辰選項的排盤只在這些欄位不同
+EXACT_ONLY_FIELDS = ("hour", "minute", "time_note", "warnings")
+
+def verify_exact(samples=300, seed=0, minutes=(0, 30, 59)):
+    """
+    隨機日期的每一個整點 (各取數個分鐘) 比對 compute_chart_exact() 與同時辰的 compute_chart()，
+    並比對 hour_variants() 的同一時辰。只取台灣無夏令時間、且前後 2 小時內不交節的時刻 (其餘情況本來就可能換柱)。
+    回傳不一致的 (日期, 時, 分, 欄位) 清單。
+    """
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(samples):
+        date = FIRST_DATE + datetime.timedelta(days=rng.randrange(N_DAYS))
+        variants = hour_variants(date.year, date.month, date.day)
+        for hour in range(24):
+            slot = hour_to_slot(hour)
+            _, _, delta = bazi_calendar.nearest_jie(date.year, date.month, date.day, hour)
+            if abs(delta) <= 120:
+                continue
+            expected = compute_chart(date.year, date.month, date.day, slot)
+            for minute in minutes:
+                chart = compute_chart_exact(date.year, date.month, date.day, hour, minute)
+                if chart.time_note:  # 夏令時間
+                    break
+                for field in expected.__dataclass_fields__:
+                    if field not in EXACT_ONLY_FIELDS and getattr(chart, field) != getattr(expected, field):
+                        mismatches.append((date, hour, minute, field))
+            got = (
+                variants.scores[slot], variants.base_types[slot], variants.car_models[slot], variants.hexagrams[slot],
+                variants.time_pillars[slot],
+            )
+            want = (
+                expected.score, expected.base_type, expected.real_car_model,
+                bazi_iching.get_hexagram(expected.upper_num, expected.lower_num).name, expected.time_gan + expected.time_zhi,
+            )
+            if got != want:
+                mismatches.append((date, hour, None, "hour_variants"))
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AliVerse 預先排盤表")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="產生排盤表")
+    p_build.add_argument("--output", default=CHART_TABLE_PATH)
+    p_build.add_argument("--workers", type=int, default=None)
+    p_verify = sub.add_parser("verify", help="抽樣比對 lunar_python")
+    p_verify.add_argument("--path", default=CHART_TABLE_PATH)
+    p_verify.add_argument("--samples", type=int, default=2000)
+    p_scores = sub.add_parser("verify-scores", help="全表比對批次評分與逐盤評分")
+    p_scores.add_argument("--path", default=CHART_TABLE_PATH)
+    p_exact = sub.add_parser("verify-exact", help="比對精確時間、時辰選項與 13 時辰一覽的排盤")
+    p_exact.add_argument("--samples", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build(args.output, args.workers)
+        return 0
+    if args.command == "verify-scores":
+        start = time.time()
+        bad = verify_scores(args.path)
+        print(f"{N_ROWS} charts, {len(bad)} mismatches ({time.time() - start:.1f}s)")
+        for idx in bad[:20].tolist():
+            print("  ", FIRST_DATE + datetime.timedelta(days=idx // N_SLOTS), idx % N_SLOTS)
+        return 1 if len(bad) else 0
+    if args.command == "verify-exact":
+        mismatches = verify_exact(args.samples)
+        print(f"{args.samples} dates, {len(mismatches)} mismatches")
+        for key in mismatches[:20]:
+            print("  ", key)
+        return 1 if mismatches else 0
+    mismatches = verify(args.path, args.samples)
+    print(f"{args.samples} samples, {len(mismatches)} mismatches")
+    for key in mismatches[:20]:
+        print("  ", key)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# ==========================================
+# AliVerse 出生地歷史時區資料 (由 `python bazi_birthtime.py generate` 自 IANA tzdata 產生，請勿手動修改)
+# ==========================================
+# 時區：((1900 年初的 UTC 偏移秒數, 夏令秒數), ((轉換 UTC 時刻 (自 1900-01-01 起的秒數), UTC 偏移秒數, 夏令秒數), ...))
+TIMEZONES = {
+    'Asia/Taipei': ((28800, 0), (
+        (1191168000, 32400, 0),  # 1937-09-30 16:00:00 UTC
+        (1442764800, 28800, 0),  # 1945-09-20 16:00:00 UTC
+        (1463155200, 32400, 3600),  # 1946-05-14 16:00:00 UTC
+        (1475161200, 28800, 0),  # 1946-09-30 15:00:00 UTC
+        (1492099200, 32400, 3600),  # 1947-04-14 16:00:00 UTC
+        (1509375600, 28800, 0),  # 1947-10-31 15:00:00 UTC
+        (1525104000, 32400, 3600),  # 1948-04-30 16:00:00 UTC
+        (1538319600, 28800, 0),  # 1948-09-30 15:00:00 UTC
+        (1556640000, 32400, 3600),  # 1949-04-30 16:00:00 UTC
+        (1569855600, 28800, 0),  # 1949-09-30 15:00:00 UTC
+        (1588176000, 32400, 3600),  # 1950-04-30 16:00:00 UTC
+        (1601391600, 28800, 0),  # 1950-09-30 15:00:00 UTC
+        (1619712000, 32400, 3600),  # 1951-04-30 16:00:00 UTC
+        (1632927600, 28800, 0),  # 1951-09-30 15:00:00 UTC
+        (1646064000, 32400, 3600),  # 1952-02-29 16:00:00 UTC
+        (1667228400, 28800, 0),  # 1952-10-31 15:00:00 UTC
+        (1680278400, 32400, 3600),  # 1953-03-31 16:00:00 UTC
+        (1698764400, 28800, 0),  # 1953-10-31 15:00:00 UTC
+        (1711814400, 32400, 3600),  # 1954-03-31 16:00:00 UTC
+        (1730300400, 28800, 0),  # 1954-10-31 15:00:00 UTC
+        (1743350400, 32400, 3600),  # 1955-03-31 16:00:00 UTC
+        (1759158000, 28800, 0),  # 1955-09-30 15:00:00 UTC
+        (1774972800, 32400, 3600),  # 1956-03-31 16:00:00 UTC
+        (1790780400, 28800, 0),  # 1956-09-30 15:00:00 UTC
+        (1806508800, 32400, 3600),  # 1957-03-31 16:00:00 UTC
+        (1822316400, 28800, 0),  # 1957-09-30 15:00:00 UTC
+        (1838044800, 32400, 3600),  # 1958-03-31 16:00:00 UTC
+        (1853852400, 28800, 0),  # 1958-09-30 15:00:00 UTC
+        (1869580800, 32400, 3600),  # 1959-03-31 16:00:00 UTC
+        (1885388400, 28800, 0),  # 1959-09-30 15:00:00 UTC
+        (1906473600, 32400, 3600),  # 1960-05-31 16:00:00 UTC
+        (1917010800, 28800, 0),  # 1960-09-30 15:00:00 UTC
+        (1938009600, 32400, 3600),  # 1961-05-31 16:00:00 UTC
+        (1948546800, 28800, 0),  # 1961-09-30 15:00:00 UTC
+        (2342966400, 32400, 3600),  # 1974-03-31 16:00:00 UTC
+        (2358774000, 28800, 0),  # 1974-09-30 15:00:00 UTC
+        (2374502400, 32400, 3600),  # 1975-03-31 16:00:00 UTC
+        (2390310000, 28800, 0),  # 1975-09-30 15:00:00 UTC
+        (2508595200, 32400, 3600),  # 1979-06-30 16:00:00 UTC
+        (2516540400, 28800, 0),  # 1979-09-30 15:00:00 UTC
+    )),
+    'Asia/Shanghai': ((29143, 0), (
+        (31506857, 28800, 0),  # 1900-12-31 15:54:17 UTC
+        (608313600, 32400, 3600),  # 1919-04-12 16:00:00 UTC
+        (623084400, 28800, 0),  # 1919-09-30 15:00:00 UTC
+        (1275321600, 32400, 3600),  # 1940-05-31 16:00:00 UTC
+        (1286895600, 28800, 0),  # 1940-10-12 15:00:00 UTC
+        (1300118400, 32400, 3600),  # 1941-03-14 16:00:00 UTC
+        (1320159600, 28800, 0),  # 1941-11-01 15:00:00 UTC
+        (1327939200, 32400, 3600),  # 1942-01-30 16:00:00 UTC
+        (1441119600, 28800, 0),  # 1945-09-01 15:00:00 UTC
+        (1463155200, 32400, 3600),  # 1946-05-14 16:00:00 UTC
+        (1475161200, 28800, 0),  # 1946-09-30 15:00:00 UTC
+        (1492099200, 32400, 3600),  # 1947-04-14 16:00:00 UTC
+        (1509375600, 28800, 0),  # 1947-10-31 15:00:00 UTC
+        (1525104000, 32400, 3600),  # 1948-04-30 16:00:00 UTC
+        (1538319600, 28800, 0),  # 1948-09-30 15:00:00 UTC
+        (1556640000, 32400, 3600),  # 1949-04-30 16:00:00 UTC
+        (1558969200, 28800, 0),  # 1949-05-27 15:00:00 UTC
+        (2724516000, 32400, 3600),  # 1986-05-03 18:00:00 UTC
+        (2736003600, 28800, 0),  # 1986-09-13 17:00:00 UTC
+        (2754151200, 32400, 3600),  # 1987-04-11 18:00:00 UTC
+        (2767453200, 28800, 0),  # 1987-09-12 17:00:00 UTC
+        (2786205600, 32400, 3600),  # 1988-04-16 18:00:00 UTC
+        (2798902800, 28800, 0),  # 1988-09-10 17:00:00 UTC
+        (2817655200, 32400, 3600),  # 1989-04-15 18:00:00 UTC
+        (2830957200, 28800, 0),  # 1989-09-16 17:00:00 UTC
+        (2849104800, 32400, 3600),  # 1990-04-14 18:00:00 UTC
+        (2862406800, 28800, 0),  # 1990-09-15 17:00:00 UTC
+        (2880554400, 32400, 3600),  # 1991-04-13 18:00:00 UTC
+        (2893856400, 28800, 0),  # 1991-09-14 17:00:00 UTC
+    )),
+    'Asia/Hong_Kong': ((27402, 0), (
+        (152298000, 28800, 0),  # 1904-10-29 17:00:00 UTC
+        (1308078000, 32400, 3600),  # 1941-06-14 19:00:00 UTC
+        (1317409200, 30600, -1800),  # 1941-09-30 19:00:00 UTC
+        (1324740600, 32400, 0),  # 1941-12-24 15:30:00 UTC
+        (1447779600, 28800, 0),  # 1945-11-17 17:00:00 UTC
+        (1461081600, 32400, 3600),  # 1946-04-20 16:00:00 UTC
+        (1480447800, 28800, 0),  # 1946-11-30 19:30:00 UTC
+        (1491939000, 32400, 3600),  # 1947-04-12 19:30:00 UTC
+        (1511897400, 28800, 0),  # 1947-11-29 19:30:00 UTC
+        (1525203000, 32400, 3600),  # 1948-05-01 19:30:00 UTC
+        (1540927800, 28800, 0),  # 1948-10-30 19:30:00 UTC
+        (1554233400, 32400, 3600),  # 1949-04-02 19:30:00 UTC
+        (1572377400, 28800, 0),  # 1949-10-29 19:30:00 UTC
+        (1585683000, 32400, 3600),  # 1950-04-01 19:30:00 UTC
+        (1603827000, 28800, 0),  # 1950-10-28 19:30:00 UTC
+        (1617132600, 32400, 3600),  # 1951-03-31 19:30:00 UTC
+        (1635276600, 28800, 0),  # 1951-10-27 19:30:00 UTC
+        (1649187000, 32400, 3600),  # 1952-04-05 19:30:00 UTC
+        (1667331000, 28800, 0),  # 1952-11-01 19:30:00 UTC
+        (1680636600, 32400, 3600),  # 1953-04-04 19:30:00 UTC
+        (1698777000, 28800, 0),  # 1953-10-31 18:30:00 UTC
+        (1710876600, 32400, 3600),  # 1954-03-20 19:30:00 UTC
+        (1730226600, 28800, 0),  # 1954-10-30 18:30:00 UTC
+        (1742326200, 32400, 3600),  # 1955-03-19 19:30:00 UTC
+        (1762281000, 28800, 0),  # 1955-11-05 18:30:00 UTC
+        (1773775800, 32400, 3600),  # 1956-03-17 19:30:00 UTC
+        (1793730600, 28800, 0),  # 1956-11-03 18:30:00 UTC
+        (1805830200, 32400, 3600),  # 1957-03-23 19:30:00 UTC
+        (1825180200, 28800, 0),  # 1957-11-02 18:30:00 UTC
+        (1837279800, 32400, 3600),  # 1958-03-22 19:30:00 UTC
+        (1856629800, 28800, 0),  # 1958-11-01 18:30:00 UTC
+        (1868729400, 32400, 3600),  # 1959-03-21 19:30:00 UTC
+        (1888079400, 28800, 0),  # 1959-10-31 18:30:00 UTC
+        (1900179000, 32400, 3600),  # 1960-03-19 19:30:00 UTC
+        (1920133800, 28800, 0),  # 1960-11-05 18:30:00 UTC
+        (1931628600, 32400, 3600),  # 1961-03-18 19:30:00 UTC
+        (1951583400, 28800, 0),  # 1961-11-04 18:30:00 UTC
+        (1963078200, 32400, 3600),  # 1962-03-17 19:30:00 UTC
+        (1983033000, 28800, 0),  # 1962-11-03 18:30:00 UTC
+        (1995132600, 32400, 3600),  # 1963-03-23 19:30:00 UTC
+        (2014482600, 28800, 0),  # 1963-11-02 18:30:00 UTC
+        (2026582200, 32400, 3600),  # 1964-03-21 19:30:00 UTC
+        (2045932200, 28800, 0),  # 1964-10-31 18:30:00 UTC
+        (2060451000, 32400, 3600),  # 1965-04-17 19:30:00 UTC
+        (2076172200, 28800, 0),  # 1965-10-16 18:30:00 UTC
+        (2091900600, 32400, 3600),  # 1966-04-16 19:30:00 UTC
+        (2107621800, 28800, 0),  # 1966-10-15 18:30:00 UTC
+        (2123350200, 32400, 3600),  # 1967-04-15 19:30:00 UTC
+        (2139676200, 28800, 0),  # 1967-10-21 18:30:00 UTC
+        (2155404600, 32400, 3600),  # 1968-04-20 19:30:00 UTC
+        (2171125800, 28800, 0),  # 1968-10-19 18:30:00 UTC
+        (2186854200, 32400, 3600),  # 1969-04-19 19:30:00 UTC
+        (2202575400, 28800, 0),  # 1969-10-18 18:30:00 UTC
+        (2218303800, 32400, 3600),  # 1970-04-18 19:30:00 UTC
+        (2234025000, 28800, 0),  # 1970-10-17 18:30:00 UTC
+        (2249753400, 32400, 3600),  # 1971-04-17 19:30:00 UTC
+        (2265474600, 28800, 0),  # 1971-10-16 18:30:00 UTC
+        (2281203000, 32400, 3600),  # 1972-04-15 19:30:00 UTC
+        (2297529000, 28800, 0),  # 1972-10-21 18:30:00 UTC
+        (2313257400, 32400, 3600),  # 1973-04-21 19:30:00 UTC
+        (2328978600, 28800, 0),  # 1973-10-20 18:30:00 UTC
+        (2335030200, 32400, 3600),  # 1973-12-29 19:30:00 UTC
+        (2360428200, 28800, 0),  # 1974-10-19 18:30:00 UTC
+        (2376156600, 32400, 3600),  # 1975-04-19 19:30:00 UTC
+        (2391877800, 28800, 0),  # 1975-10-18 18:30:00 UTC
+        (2407606200, 32400, 3600),  # 1976-04-17 19:30:00 UTC
+        (2423327400, 28800, 0),  # 1976-10-16 18:30:00 UTC
+        (2504374200, 32400, 3600),  # 1979-05-12 19:30:00 UTC
+        (2518281000, 28800, 0),  # 1979-10-20 18:30:00 UTC
+    )),
+    'Asia/Macau': ((27250, 0), (
+        (152295950, 28800, 0),  # 1904-10-29 16:25:50 UTC
+        (1324479600, 32400, 0),  # 1941-12-21 15:00:00 UTC
+        (1335708000, 36000, 3600),  # 1942-04-30 14:00:00 UTC
+        (1353070800, 32400, 0),  # 1942-11-17 13:00:00 UTC
+        (1367244000, 36000, 3600),  # 1943-04-30 14:00:00 UTC
+        (1380459600, 32400, 0),  # 1943-09-30 13:00:00 UTC
+        (1443625200, 28800, 0),  # 1945-09-30 15:00:00 UTC
+        (1461942000, 32400, 3600),  # 1946-04-30 15:00:00 UTC
+        (1475161200, 28800, 0),  # 1946-09-30 15:00:00 UTC
+        (1492527600, 32400, 3600),  # 1947-04-19 15:00:00 UTC
+        (1511967600, 28800, 0),  # 1947-11-30 15:00:00 UTC
+        (1525273200, 32400, 3600),  # 1948-05-02 15:00:00 UTC
+        (1540998000, 28800, 0),  # 1948-10-31 15:00:00 UTC
+        (1554217200, 32400, 3600),  # 1949-04-02 15:00:00 UTC
+        (1572361200, 28800, 0),  # 1949-10-29 15:00:00 UTC
+        (1585666800, 32400, 3600),  # 1950-04-01 15:00:00 UTC
+        (1603810800, 28800, 0),  # 1950-10-28 15:00:00 UTC
+        (1617116400, 32400, 3600),  # 1951-03-31 15:00:00 UTC
+        (1635346800, 28800, 0),  # 1951-10-28 15:00:00 UTC
+        (1649170800, 32400, 3600),  # 1952-04-05 15:00:00 UTC
+        (1667314800, 28800, 0),  # 1952-11-01 15:00:00 UTC
+        (1680620400, 32400, 3600),  # 1953-04-04 15:00:00 UTC
+        (1698764400, 28800, 0),  # 1953-10-31 15:00:00 UTC
+        (1710860400, 32400, 3600),  # 1954-03-20 15:00:00 UTC
+        (1730214000, 28800, 0),  # 1954-10-30 15:00:00 UTC
+        (1742310000, 32400, 3600),  # 1955-03-19 15:00:00 UTC
+        (1762268400, 28800, 0),  # 1955-11-05 15:00:00 UTC
+        (1773759600, 32400, 3600),  # 1956-03-17 15:00:00 UTC
+        (1793730600, 28800, 0),  # 1956-11-03 18:30:00 UTC
+        (1805830200, 32400, 3600),  # 1957-03-23 19:30:00 UTC
+        (1825180200, 28800, 0),  # 1957-11-02 18:30:00 UTC
+        (1837279800, 32400, 3600),  # 1958-03-22 19:30:00 UTC
+        (1856629800, 28800, 0),  # 1958-11-01 18:30:00 UTC
+        (1868729400, 32400, 3600),  # 1959-03-21 19:30:00 UTC
+        (1888079400, 28800, 0),  # 1959-10-31 18:30:00 UTC
+        (1900179000, 32400, 3600),  # 1960-03-19 19:30:00 UTC
+        (1920133800, 28800, 0),  # 1960-11-05 18:30:00 UTC
+        (1931628600, 32400, 3600),  # 1961-03-18 19:30:00 UTC
+        (1951583400, 28800, 0),  # 1961-11-04 18:30:00 UTC
+        (1963078200, 32400, 3600),  # 1962-03-17 19:30:00 UTC
+        (1983033000, 28800, 0),  # 1962-11-03 18:30:00 UTC
+        (1995132600, 32400, 3600),  # 1963-03-23 19:30:00 UTC
+        (2014482600, 28800, 0),  # 1963-11-02 18:30:00 UTC
+        (2026582200, 32400, 3600),  # 1964-03-21 19:30:00 UTC
+        (2045932200, 28800, 0),  # 1964-10-31 18:30:00 UTC
+        (2060451000, 32400, 3600),  # 1965-04-17 19:30:00 UTC
+        (2076168600, 28800, 0),  # 1965-10-16 17:30:00 UTC
+        (2091900600, 32400, 3600),  # 1966-04-16 19:30:00 UTC
+        (2107618200, 28800, 0),  # 1966-10-15 17:30:00 UTC
+        (2123350200, 32400, 3600),  # 1967-04-15 19:30:00 UTC
+        (2139676200, 28800, 0),  # 1967-10-21 18:30:00 UTC
+        (2155404600, 32400, 3600),  # 1968-04-20 19:30:00 UTC
+        (2171125800, 28800, 0),  # 1968-10-19 18:30:00 UTC
+        (2186854200, 32400, 3600),  # 1969-04-19 19:30:00 UTC
+        (2202575400, 28800, 0),  # 1969-10-18 18:30:00 UTC
+        (2218303800, 32400, 3600),  # 1970-04-18 19:30:00 UTC
+        (2234025000, 28800, 0),  # 1970-10-17 18:30:00 UTC
+        (2249753400, 32400, 3600),  # 1971-04-17 19:30:00 UTC
+        (2265474600, 28800, 0),  # 1971-10-16 18:30:00 UTC
+        (2281203000, 32400, 3600),  # 1972-04-15 19:30:00 UTC
+        (2297529000, 28800, 0),  # 1972-10-21 18:30:00 UTC
+        (2313257400, 32400, 3600),  # 1973-04-21 19:30:00 UTC
+        (2328978600, 28800, 0),  # 1973-10-20 18:30:00 UTC
+        (2335030200, 32400, 3600),  # 1973-12-29 19:30:00 UTC
+        (2360428200, 28800, 0),  # 1974-10-19 18:30:00 UTC
+        (2376156600, 32400, 3600),  # 1975-04-19 19:30:00 UTC
+        (2391877800, 28800, 0),  # 1975-10-18 18:30:00 UTC
+        (2407606200, 32400, 3600),  # 1976-04-17 19:30:00 UTC
+        (2423327400, 28800, 0),  # 1976-10-16 18:30:00 UTC
+        (2504374200, 32400, 3600),  # 1979-05-12 19:30:00 UTC
+        (2518281000, 28800, 0),  # 1979-10-20 18:30:00 UTC
+    )),
+    'Asia/Singapore': ((24925, 0), (
+        (170787875, 25200, 0),  # 1905-05-31 17:04:35 UTC
+        (1041354000, 26400, 1200),  # 1932-12-31 17:00:00 UTC
+        (1135960800, 26400, 0),  # 1935-12-31 16:40:00 UTC
+        (1314808800, 27000, 0),  # 1941-08-31 16:40:00 UTC
+        (1329323400, 32400, 0),  # 1942-02-15 16:30:00 UTC
+        (1441983600, 27000, 0),  # 1945-09-11 15:00:00 UTC
+        (2587651200, 28800, 0),  # 1981-12-31 16:00:00 UTC
+    )),
+    'Asia/Kuala_Lumpur': ((24406, 0), (
+        (31511594, 24925, 0),  # 1900-12-31 17:13:14 UTC
+        (170787875, 25200, 0),  # 1905-05-31 17:04:35 UTC
+        (1041354000, 26400, 1200),  # 1932-12-31 17:00:00 UTC
+        (1135960800, 26400, 0),  # 1935-12-31 16:40:00 UTC
+        (1314808800, 27000, 0),  # 1941-08-31 16:40:00 UTC
+        (1329323400, 32400, 0),  # 1942-02-15 16:30:00 UTC
+        (1441983600, 27000, 0),  # 1945-09-11 15:00:00 UTC
+        (2587651200, 28800, 0),  # 1981-12-31 16:00:00 UTC
+    )),
+}